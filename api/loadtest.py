@@ -0,0 +1,80 @@
+"""
+JSON API 부하 테스트
+검색/상세/가격 이력/통계 엔드포인트를 동시에 호출해 초당 요청 수와 지연 시간 분위수(p50/p99)를 보고합니다.
+
+    python -m api.loadtest --url http://127.0.0.1:8000 --requests 5000 --concurrency 50
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import numpy as np
+from tornado.httpclient import AsyncHTTPClient, HTTPClientError
+
+
+def build_paths(game_ids, queries):
+    return (
+        ["/api/stats", "/api/version"]
+        + [f"/api/games?q={q}" for q in queries]
+        + [f"/api/games/{i}" for i in game_ids]
+        + [f"/api/games/{i}/history" for i in game_ids]
+    )
+
+
+async def run(base_url, total, concurrency, use_etag, seed=0):
+    AsyncHTTPClient.configure(None, max_clients=concurrency)
+    client = AsyncHTTPClient()
+    rng = random.Random(seed)
+
+    version = await client.fetch(f"{base_url}/api/version")
+    games = int(json.loads(version.body)["games"])
+    paths = build_paths(rng.sample(range(games), min(games, 200)), ["a", "the", "war", "dead", "space"])
+
+    latencies, statuses = [], {}
+    etags = {}
+    queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(rng.choice(paths))
+
+    async def worker():
+        while not queue.empty():
+            path = queue.get_nowait()
+            headers = {"Accept-Encoding": "gzip"}
+            if use_etag and path in etags:
+                headers["If-None-Match"] = etags[path]
+            start = time.perf_counter()
+            try:
+                response = await client.fetch(base_url + path, headers=headers, raise_error=False)
+                code = response.code
+                if response.headers.get("ETag"):
+                    etags[path] = response.headers["ETag"]
+            except HTTPClientError as e:
+                code = e.code
+            latencies.append(time.perf_counter() - start)
+            statuses[code] = statuses.get(code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    ms = np.array(latencies) * 1000
+    print(f"요청 {total}개, 동시성 {concurrency}, {elapsed:.2f}s")
+    print(f"  처리량: {total / elapsed:,.1f} req/s")
+    print(f"  지연: p50 {np.percentile(ms, 50):.1f}ms / p95 {np.percentile(ms, 95):.1f}ms / p99 {np.percentile(ms, 99):.1f}ms")
+    print(f"  상태 코드: {dict(sorted(statuses.items()))}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON API 부하 테스트")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--etag", action="store_true", help="이전 응답의 ETag로 조건부 요청 (304 경로 측정)")
+    args = parser.parse_args()
+    asyncio.run(run(args.url.rstrip("/"), args.requests, args.concurrency, args.etag))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+게임 목록 읽기 전용 JSON API
+앱과 같은 데이터 계층(catalog.Catalog)을 한 번 불러와 검색/상세/가격 이력/통계를 제공합니다.
+데이터 파일이 바뀌면 백그라운드에서 새 데이터로 교체되며, 응답은 데이터셋 버전별로 메모리에 캐시되고, ETag는 데이터셋 버전에 묶여 있으며 gzip으로 압축됩니다.
+
+    python -m api.server --port 8000
+"""
+import argparse
+import hashlib
+import json
+from collections import OrderedDict
+
+import tornado.ioloop
+import tornado.web
+
+from catalog import CatalogStore, shared_dir
+from filter.facets import SORTS
+from filter.thumbnails import thumbnail_dir
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class ResponseCache:
+    """(데이터셋 버전, 요청 URI) → 직렬화된 응답 본문을 보관하는 LRU 캐시"""
+
+    def __init__(self, max_entries=2048):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        body = self._entries.get(key)
+        if body is not None:
+            self._entries.move_to_end(key)
+        return body
+
+    def put(self, key, body):
+        self._entries[key] = body
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class CatalogHandler(tornado.web.RequestHandler):
+    def initialize(self, store, cache):
+        # 요청마다 현재 데이터를 한 번 잡아 두므로, 처리 중에 교체되어도 응답은 한 버전으로 일관됩니다.
+        self.catalog = store.current()
+        self.cache = cache
+
+    def compute_etag(self):
+        # 본문 해시 대신 데이터셋 버전 기반 ETag를 직접 설정합니다.
+        return None
+
+    def build(self, *args):
+        """응답 데이터(dict/list)를 반환합니다. 없으면 None → 404."""
+        raise NotImplementedError
+
+    def get(self, *args):
+        version = self.catalog.version
+        etag = '"%s-%s"' % (version, hashlib.sha1(self.request.uri.encode()).hexdigest()[:10])
+        self.set_header("ETag", etag)
+        self.set_header("Cache-Control", "public, max-age=60")
+
+        if etag in self.request.headers.get("If-None-Match", ""):
+            self.set_status(304)
+            return
+
+        key = (version, self.request.uri)
+        body = self.cache.get(key)
+        if body is None:
+            data = self.build(*args)
+            if data is None:
+                raise tornado.web.HTTPError(404)
+            body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+            self.cache.put(key, body)
+
+        self.set_header("Content-Type", "application/json; charset=UTF-8")
+        self.write(body)
+
+    def write_error(self, status_code, **kwargs):
+        self.set_header("Content-Type", "application/json; charset=UTF-8")
+        self.finish(json.dumps({"error": self._reason, "status": status_code}))
+
+
+class VersionHandler(CatalogHandler):
+    def build(self):
+        return {"version": self.catalog.version, "games": len(self.catalog.df)}
+
+
+class SearchHandler(CatalogHandler):
+    def build(self):
+        query = self.get_argument("q", None)
+        platforms = self.get_arguments("platform")
+        genres = self.get_arguments("genre")
+        try:
+            page = max(int(self.get_argument("page", 1)), 1)
+            size = min(max(int(self.get_argument("size", DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+        except ValueError:
+            raise tornado.web.HTTPError(400, reason="page/size는 정수여야 합니다.")
+
+        sort = self.get_argument("sort", "default")
+        if sort not in SORTS:
+            raise tornado.web.HTTPError(400, reason=f"sort는 {', '.join(SORTS)} 중 하나여야 합니다.")
+
+        result = self.catalog.query(query, platforms, genres, sort, offset=(page - 1) * size, limit=size)
+        return {
+            "total": result.total,
+            "page": page,
+            "size": size,
+            "sort": sort,
+            "items": [self.catalog.summary(pos) for pos in result.positions],
+            "facets": {"platform": result.platform_counts, "genre": result.genre_counts},
+        }
+
+
+class GameHandler(CatalogHandler):
+    def build(self, game_id):
+        return self.catalog.detail(int(game_id))
+
+
+class HistoryHandler(CatalogHandler):
+    def build(self, game_id):
+        history = self.catalog.history(int(game_id))
+        return None if history is None else {"id": int(game_id), "history": history}
+
+
+class StatsHandler(CatalogHandler):
+    def build(self):
+        return self.catalog.stats()
+
+
+class ThumbnailHandler(tornado.web.StaticFileHandler):
+    """내용 해시 이름의 썸네일 파일. 내용이 바뀌면 주소도 바뀌므로 1년간 캐시해도 안전합니다."""
+
+    def get_cache_time(self, path, modified, mime_type):
+        return 365 * 24 * 3600
+
+    def set_extra_headers(self, path):
+        self.set_header("Cache-Control", "public, max-age=31536000, immutable")
+
+
+def make_app(store, cache=None):
+    context = {"store": store, "cache": cache or ResponseCache()}
+    return tornado.web.Application(
+        [
+            (r"/api/version", VersionHandler, context),
+            (r"/api/games", SearchHandler, context),
+            (r"/api/games/(\d+)", GameHandler, context),
+            (r"/api/games/(\d+)/history", HistoryHandler, context),
+            (r"/api/stats", StatsHandler, context),
+            (r"/thumbs/(.*)", ThumbnailHandler, {"path": thumbnail_dir}),
+        ],
+        compress_response=True,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="게임 목록 JSON API 서버")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--address", default="127.0.0.1")
+    parser.add_argument("--reload-interval", type=int, default=30, help="데이터 파일 변경 확인 주기(초)")
+    parser.add_argument("--shared", action="store_true", help="다른 프로세스와 공유 스냅샷(메모리 맵)으로 데이터 공유")
+    args = parser.parse_args()
+
+    store = CatalogStore(interval=args.reload_interval, shared_dir=shared_dir if args.shared else None)
+    make_app(store).listen(args.port, address=args.address)
+    catalog = store.current()
+    print(f"[API] {len(catalog.df)}개 게임 (버전 {catalog.version}) → http://{args.address}:{args.port}/api/games")
+    tornado.ioloop.IOLoop.current().start()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,16 @@ import re
 import plotly.express as px
 import plotly.graph_objects as go
 
+import page_assets
+import request_metrics
+from catalog import CatalogStore, shared_dir
+from filter.encoding import GENRE_CODE_COLUMN, genre_counts
+from filter.facets import SORTS
+from filter.leaderboards import BOARDS
+from filter.recommend import BUY_NOW
+from filter.stores import STORE_LOGOS, STORES
+from filter.thumbnails import thumbnail_file, thumbnail_url
+
 
 # --- HTML 태그 제거 함수 ---
 def remove_html_tags(text):
@@ -146,25 +156,33 @@ def format_display_price(price_string):
     return cleaned
 
 
-# --- 데이터 로딩 ---
-@st.cache_data
-def load_data(path):
-    """CSV 파일을 불러와 데이터프레임으로 반환합니다."""
-    df = pd.read_csv(path)
-    
-    for col in ['원가', '할인가', '할인율']:
-        if col in df.columns:
-            df[col] = df[col].apply(remove_html_tags)
-    
-    if '장르' not in df.columns:
-        df['장르'] = '기타'
-    df['장르'] = df['장르'].fillna('기타').astype(str)
-    
-    if '사이트 URL' not in df.columns:
-        df['사이트 URL'] = ''
-    df['사이트 URL'] = df['사이트 URL'].fillna('')
-    
-    return df
+# --- 데이터 로딩 (공통 로직은 catalog.py) ---
+@st.cache_resource
+def get_catalog_store():
+    """
+    모든 세션이 공유하는 데이터 저장소를 반환합니다.
+    데이터 파일이 바뀌면 백그라운드에서 새 데이터와 인덱스를 만든 뒤 교체하므로, 다음 실행부터 새 데이터가 보입니다.
+    여러 Streamlit 프로세스를 띄워도 데이터는 공유 스냅샷 하나를 메모리 맵으로 함께 사용합니다.
+    """
+    return CatalogStore(shared_dir=shared_dir)
+
+
+# --- 이미지 (filter/thumbnails.py의 로컬 썸네일 캐시) ---
+def image_source(url, html=False):
+    """
+    캐시된 썸네일이 있으면 로컬 썸네일을, 없으면 원본 이미지 URL을 반환합니다.
+    html=True면 <img src>에 쓸 정적 파일 주소, 아니면 st.image에 넘길 파일 경로입니다.
+    """
+    name = get_catalog_store().current().thumbnails.get(url) if isinstance(url, str) else None
+    if name is None:
+        return url
+    return thumbnail_url(name) if html else thumbnail_file(name)
+
+
+# --- 차트 출력 (Plotly 직렬화 시간 측정) ---
+def plot(fig, **kwargs):
+    with request_metrics.timed("plotly_chart"):
+        st.plotly_chart(fig, **kwargs)
 
 
 # --- 샘플 데이터 생성 (실제 파일이 없을 경우) ---
@@ -209,6 +227,10 @@ def create_sample_data():
     return pd.DataFrame(sample_data)
 
 
+# --- 전체 데이터 보기 검색 조건 (Catalog.query 인자) ---
+DEFAULT_QUERY = {'query': None, 'platforms': [], 'genres': [], 'sort': 'default'}
+
+
 # --- 페이지 전환 함수 ---
 def set_page():
     st.session_state.page = st.session_state.page_selector
@@ -220,7 +242,8 @@ def view_detail(game_id):
     st.rerun()
 
 
-def render_dashboard(df):
+@request_metrics.timed("render_dashboard")
+def render_dashboard(df, genres, leaderboards=None):
     col1, col2, col3 = st.columns(3)
         
     with col1:
@@ -276,20 +299,20 @@ def render_dashboard(df):
             legend_title_text='범례',
             legend=dict(font=dict(size=18))
         )
-        st.plotly_chart(fig1, use_container_width=True)
+        plot(fig1, use_container_width=True)
 
         # 2. 가격대별 게임 분포 (막대 그래프)
         st.subheader("💰 가격대별 게임 분포")
         # '할인가' 컬럼을 숫자로 변환
-        df['numeric_sales_price'] = pd.to_numeric(
+        numeric_sales_price = pd.to_numeric(
             df['할인가'].astype(str).str.replace('₩', '').str.replace(',', ''), errors='coerce'
         ).fillna(0)
         
         bins = [0, 20000, 40000, 60000, 80000, 100000, float('inf')]
         labels = ['0-2만원', '2-4만원', '4-6만원', '6-8만원', '8-10만원', '10만원 이상']
-        df['price_range'] = pd.cut(df['numeric_sales_price'], bins=bins, labels=labels, right=False)
+        price_range = pd.cut(numeric_sales_price, bins=bins, labels=labels, right=False)
         
-        price_distribution = df['price_range'].value_counts().sort_index()
+        price_distribution = price_range.value_counts().sort_index()
         price_distribution_df = price_distribution.reset_index()
         price_distribution_df.columns = ['price_range', 'count']
 
@@ -299,17 +322,17 @@ def render_dashboard(df):
                     color='price_range',
                     color_discrete_sequence=px.colors.qualitative.Pastel)
         fig2.update_layout(showlegend=False)
-        st.plotly_chart(fig2, use_container_width=True)
+        plot(fig2, use_container_width=True)
 
         # 3. 할인율 구간별 게임 분포 (파이 그래프)
         st.subheader("📉 할인율 구간별 게임 분포")
         # '할인율' 컬럼을 숫자로 변환
-        df['numeric_discount'] = pd.to_numeric(
+        numeric_discount = pd.to_numeric(
             df['할인율'].astype(str).str.replace('%', ''), errors='coerce'
         ).fillna(0)
 
         # 0% 할인은 제외
-        df_discounted = df[df['numeric_discount'] > 0].copy()
+        df_discounted = df.assign(numeric_discount=numeric_discount)[numeric_discount > 0]
         
         discount_bins = [0, 20, 40, 60, 80, 101]
         discount_labels = ['1-20%', '21-40%', '41-60%', '61-80%', '81-100%']
@@ -323,14 +346,12 @@ def render_dashboard(df):
                     hole=0.3,
                     color_discrete_sequence=px.colors.qualitative.Plotly)
         fig3.update_layout(legend=dict(font=dict(size=18)))
-        st.plotly_chart(fig3, use_container_width=True)
+        plot(fig3, use_container_width=True)
 
         # 4. 장르별 게임 수 (막대 그래프)
         st.subheader("🕹️ 장르별 게임 수")
-        # '장르' 컬럼의 쉼표로 구분된 문자열을 개별 행으로 분리
-        df_exploded_genres = df.assign(장르=df['장르'].str.split(',')).explode('장르')
-        df_exploded_genres['장르'] = df_exploded_genres['장르'].str.strip()
-        genre_count = df_exploded_genres['장르'].value_counts().head(10).reset_index()
+        # 장르 비트셋에서 비트별 개수를 세어 집계
+        genre_count = genre_counts(df[GENRE_CODE_COLUMN], genres).sort_values(ascending=False, kind='stable').head(10).reset_index()
         genre_count.columns = ['장르', '게임 수']
         
         # 색상 스케일을 파란색 계열로 가시성 좋게 변경
@@ -344,74 +365,112 @@ def render_dashboard(df):
             xaxis_title_font_size = 20, yaxis_title_font_size = 20
         )
 
-        st.plotly_chart(fig4, use_container_width=True)
+        plot(fig4, use_container_width=True)
     
     with right_col:
-        st.subheader("할인 중인 게임 TOP 10")
-        
-        numeric_discounts = pd.to_numeric(df['할인율'].str.replace('%', ''), errors='coerce').fillna(0)
-        discounted_games_df = df[numeric_discounts > 0].head(10)
-        
-        with st.container(border=True):
-            if discounted_games_df.empty:
-                st.info("현재 할인 중인 게임이 없습니다.")
+        st.subheader("🏆 순위")
+
+        # 파이프라인(filter/leaderboards.py)이 저장한 순위표를 그대로 표시 (실행마다 정렬하지 않음)
+        boards = leaderboards or {}
+        tabs = st.tabs([label for label, _ in BOARDS.values()])
+        for tab, board in zip(tabs, BOARDS):
+            with tab, st.container(border=True):
+                entries = boards.get(board)
+                if entries is None or entries.empty:
+                    st.info("순위에 해당하는 게임이 없습니다.")
+                    continue
+                render_leaderboard(df, board, entries)
+
+
+def render_leaderboard(df, board, entries):
+    """순위표 하나의 항목들을 이미지 | 이름 | 가격 | 상세 버튼 행으로 표시합니다."""
+    # 상세보기 버튼(파란색)/가격 스타일은 목록 전체에 한 번만
+    page_assets.use("detail-button", "price")
+    for entry in entries.itertuples():
+        index = df.index[entry.pos]
+        best_row = df.iloc[entry.pos]
+
+        img_col, info_col, price_col, btn_col = st.columns([2, 3, 2, 1.8])
+
+        with img_col:
+            st.image(image_source(best_row['이미지 URL']), use_container_width=True)
+
+        with info_col:
+            st.markdown(f"**{best_row['게임 이름']}**")
+            caption = f"플랫폼: {best_row['플랫폼 이름']}"
+            if board == 'biggest_drop':
+                caption += f" | ₩{int(entry.drop):,} 하락"
+            elif board == 'most_reviewed_on_sale':
+                caption += f" | 리뷰 {int(entry.reviews):,}개"
+            st.caption(caption)
+
+        with price_col:
+            discount_html, price_html = "", ""
+            discount_str = str(best_row['할인율'])
+            discount_num = pd.to_numeric(discount_str.replace('%', ''), errors='coerce')
+            
+            if pd.notna(discount_num) and discount_num > 0:
+                discount_html = f'<span class="price-badge">-{int(discount_num)}%</span>'
+            
+            original_price_display = format_display_price(best_row['원가'])
+            sales_price_display = format_display_price(best_row['할인가'])
+            
+            if original_price_display != sales_price_display and '품절' not in sales_price_display:
+                price_html = f'<div class="price-block"><del class="price-was">{original_price_display}</del><br><strong class="price-now">{sales_price_display}</strong></div>'
             else:
-                for index, row in discounted_games_df.iterrows():
-                    # 🔥 NEW: 최저가 행 찾기
-                    best_row = get_best_price_row(df, row['게임 이름'])
-                    if best_row is None:
-                        best_row = row
-                    
-                    img_col, info_col, price_col, btn_col = st.columns([2, 3, 2, 1.8])
-                    
-                    with img_col:
-                        st.image(best_row['이미지 URL'], use_container_width=True)
-                    
-                    with info_col:
-                        st.markdown(f"**{best_row['게임 이름']}**")
-                        st.caption(f"플랫폼: {best_row['플랫폼 이름']}")
-                    
-                    with price_col:
-                        discount_html, price_html = "", ""
-                        discount_str = str(best_row['할인율'])
-                        discount_num = pd.to_numeric(discount_str.replace('%', ''), errors='coerce')
-                        
-                        if pd.notna(discount_num) and discount_num > 0:
-                            discount_html = f'<span style="background-color: #d43f3a; color: white; border-radius: 5px; padding: 3px 8px; font-weight: bold; font-size: 0.9em;">-{int(discount_num)}%</span>'
-                        
-                        original_price_display = format_display_price(best_row['원가'])
-                        sales_price_display = format_display_price(best_row['할인가'])
-                        
-                        if original_price_display != sales_price_display and '품절' not in sales_price_display:
-                            price_html = f'<div style="text-align: right;"><span style="font-size: 0.8em; color: grey;"><del>{original_price_display}</del></span><br><strong style="font-size: 1.2em;">{sales_price_display}</strong></div>'
-                        else:
-                            price_html = f'<div style="text-align: right; font-size: 1.2em; font-weight: bold;">{sales_price_display}</div>'
-                        
-                        final_html = f'<div style="display: flex; justify-content: flex-end; align-items: center; gap: 15px; height: 100%;">{discount_html}{price_html}</div>'
-                        st.markdown(final_html, unsafe_allow_html=True)
-                    
-                    with btn_col:
-                        # 상세보기 버튼을 파란색으로 변경
-                        st.markdown("""
-                        <style>
-                        .stButton > button {
-                            background-color: #007bff;
-                            color: white;
-                            border: none;
-                        }
-                        .stButton > button:hover {
-                            background-color: #0056b3;
-                            color: white;
-                        }
-                        </style>
-                        """, unsafe_allow_html=True)
-                        if st.button("상세", key=f"detail_{index}", use_container_width=True):
-                            view_detail(index)
+                price_html = f'<div class="price-block price-now">{sales_price_display}</div>'
+            
+            final_html = f'<div class="price-row right">{discount_html}{price_html}</div>'
+            st.markdown(final_html, unsafe_allow_html=True)
+
+        with btn_col:
+            if st.button("상세", key=f"detail_{board}_{index}", use_container_width=True):
+                view_detail(index)
+
+
+def game_card_html(best_row):
+    """게임 카드 HTML (이미지, 이름, 장르, 가격/할인 배지). 스타일은 page_assets의 'game-card'."""
+    # 할인율 처리
+    discount_str = str(best_row['할인율'])
+    discount_num = pd.to_numeric(discount_str.replace('%', ''), errors='coerce')
+    original_price_display = format_display_price(best_row['원가'])
+    sales_price_display = format_display_price(best_row['할인가'])
+    
+    # 할인 배지 설정
+    discount_badge = ""
+    if pd.notna(discount_num) and discount_num > 0:
+        discount_badge = f'<span class="discount-badge">-{int(discount_num)}%</span>'
+    
+    # 가격 정보 HTML
+    price_info_html = f'<div class="price-info">'
+    if pd.notna(discount_num) and discount_num > 0 and original_price_display != sales_price_display:
+        price_info_html += f'<div><div class="original-price">{original_price_display}</div><div class="sale-price">{sales_price_display}</div></div>'
+    else:
+        price_info_html += f'<div class="sale-price">{sales_price_display}</div>'
+    price_info_html += f'{discount_badge}</div>'
+    
+    # 게임 카드 HTML
+    card_html = (
+        f'<div class="game-card">'
+        f'<img src="{image_source(best_row["이미지 URL"], html=True)}" alt="{best_row["게임 이름"]}">'
+        f'<div class="game-title">{best_row["게임 이름"]}</div>'
+        f'<div class="game-genre">장르: {best_row["장르"][:30]}{"..." if len(best_row["장르"]) > 30 else ""}</div>'
+        f'<div class="price-container">'
+        f'{price_info_html}'
+        f'</div>'
+        f'</div>'
+    )
+    return card_html
+
 
+@request_metrics.timed("render_full_data")
+def render_full_data(catalog):
+    df, genres = catalog.df, catalog.genres
+    # 적용된 조건의 결과 수/패싯 개수와 표시할 만큼의 정렬된 위치 (catalog.facets의 비트맵/정렬 순서 사용)
+    applied = st.session_state.full_data_query
+    result = catalog.query(**applied, limit=st.session_state.num_to_display)
 
-def render_full_data(df):
     # 상단 필터 섹션
-    all_genres = sorted(list(df['장르'].str.split(',').explode().str.strip().unique()))
     filter_col, _ = st.columns([1, 3])
     
     with filter_col:
@@ -419,170 +478,48 @@ def render_full_data(df):
             st.subheader("🔍 필터 설정")
             with st.expander("검색 및 필터 옵션", expanded=True):
                 with st.form(key='filter_form'):
-                    search_query = st.text_input("게임 이름 검색", placeholder="예: 사이버펑크 2077")
-                    platforms = sorted(df['플랫폼 이름'].unique())
-                    selected_platforms = st.multiselect("플랫폼 선택", options=platforms)
-                    selected_genres = st.multiselect("장르 선택", options=all_genres)
+                    search_query = st.text_input("게임 이름 검색", value=applied['query'] or "",
+                                                 placeholder="예: 사이버펑크 2077")
+                    platform_facets, genre_facets = result.platform_counts, result.genre_counts
+                    selected_platforms = st.multiselect(
+                        "플랫폼 선택", options=list(platform_facets), default=applied['platforms'],
+                        format_func=lambda p: f"{p} ({platform_facets[p]:,})",
+                    )
+                    selected_genres = st.multiselect(
+                        "장르 선택", options=sorted(genres), default=applied['genres'],
+                        format_func=lambda g: f"{g} ({genre_facets[g]:,})",
+                    )
+                    sort = st.selectbox("정렬", options=list(SORTS), index=list(SORTS).index(applied['sort']),
+                                        format_func=SORTS.get)
                     submit_button = st.form_submit_button(label='필터 적용')
     
     if submit_button:
-        filtered_df = df.copy()
-        
-        if search_query:
-            filtered_df = filtered_df[filtered_df['게임 이름'].str.contains(search_query, case=False, na=False)]
-        
-        if selected_platforms:
-            filtered_df = filtered_df[filtered_df['플랫폼 이름'].isin(selected_platforms)]
-        
-        if selected_genres:
-            for genre in selected_genres:
-                filtered_df = filtered_df[filtered_df['장르'].str.contains(re.escape(genre), case=False, na=False)]
-        
-        st.session_state.filtered_df = filtered_df
+        st.session_state.full_data_query = {
+            'query': search_query, 'platforms': selected_platforms, 'genres': selected_genres, 'sort': sort,
+        }
         st.session_state.num_to_display = 20
         st.rerun()
     
     # 게임 목록
-    current_results = st.session_state.filtered_df
-    st.subheader(f"검색 결과: {len(current_results)}개의 게임")
+    st.subheader(f"검색 결과: {result.total}개의 게임")
     
-    if current_results.empty:
+    if result.total == 0:
         st.warning("선택한 조건에 맞는 게임이 없습니다.")
     else:
-        # CSS 스타일링
-        st.markdown("""
-        <style>
-            .game-card {
-                border: 1px solid #e0e0e0;
-                border-radius: 10px;
-                padding: 15px;
-                margin-bottom: 20px;
-                transition: all 0.3s ease;
-                display: flex;
-                flex-direction: column;
-                height: 420px;
-                position: relative;
-            }
-            .game-card:hover {
-                box-shadow: 0 4px 8px rgba(0,0,0,0.15);
-                transform: translateY(-2px);
-                background-color: #f8f9fa;
-                border-color: #5B7C99;
-            }
-            .game-card img {
-                width: 100%;
-                height: 150px;
-                object-fit: cover;
-                border-radius: 8px;
-            }
-            .game-title {
-                font-weight: bold;
-                font-size: 16px;
-                margin-top: 10px;
-                height: 40px;
-                overflow: hidden;
-                display: -webkit-box;
-                -webkit-line-clamp: 2;
-                -webkit-box-orient: vertical;
-            }
-            .game-genre {
-                color: #666;
-                font-size: 14px;
-                margin-bottom: 8px;
-                height: 20px;
-                overflow: hidden;
-                text-overflow: ellipsis;
-                white-space: nowrap;
-            }
-            .price-container {
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                margin-top: auto;
-                padding-top: 10px;
-                height: 60px;
-            }
-            .price-info {
-                display: flex;
-                align-items: center;
-                gap: 10px;
-            }
-            .original-price {
-                color: #999;
-                text-decoration: line-through;
-                font-size: 14px;
-            }
-            .sale-price {
-                font-weight: bold;
-                font-size: 18px;
-                color: #d32f2f;
-            }
-            .discount-badge {
-                background-color: #d43f3a;
-                color: white;
-                border-radius: 4px;
-                padding: 2px 6px;
-                font-size: 12px;
-                font-weight: bold;
-            }
-            /* 상세보기 버튼 스타일 */
-            .stButton > button {
-                background-color: #007bff !important;
-                color: white !important;
-                border: none !important;
-            }
-            .stButton > button:hover {
-                background-color: #0056b3 !important;
-                color: white !important;
-            }
-        </style>
-        """, unsafe_allow_html=True)
-        
-        results_to_show = current_results.head(st.session_state.num_to_display)
+        # 카드 스타일
+        page_assets.use("game-card")
         
         # 4열 그리드 생성
         cols = st.columns(4)
         col_index = 0
         
-        for index, row in results_to_show.iterrows():
+        for pos in result.positions:
+            index = df.index[pos]
             with cols[col_index]:
-                # 🔥 NEW: 최저가 행 찾기
-                best_row = get_best_price_row(df, row['게임 이름'])
-                if best_row is None:
-                    best_row = row
+                # 같은 게임의 판매처 중 최저가 행 (전체 목록 대신 catalog.rows_by_key의 해당 게임 행만 비교)
+                best_row = df.iloc[catalog.best_offer_position(pos)]
                 
-                # 할인율 처리
-                discount_str = str(best_row['할인율'])
-                discount_num = pd.to_numeric(discount_str.replace('%', ''), errors='coerce')
-                original_price_display = format_display_price(best_row['원가'])
-                sales_price_display = format_display_price(best_row['할인가'])
-                
-                # 할인 배지 설정
-                discount_badge = ""
-                if pd.notna(discount_num) and discount_num > 0:
-                    discount_badge = f'<span class="discount-badge">-{int(discount_num)}%</span>'
-                
-                # 가격 정보 HTML
-                price_info_html = f'<div class="price-info">'
-                if pd.notna(discount_num) and discount_num > 0 and original_price_display != sales_price_display:
-                    price_info_html += f'<div><div class="original-price">{original_price_display}</div><div class="sale-price">{sales_price_display}</div></div>'
-                else:
-                    price_info_html += f'<div class="sale-price">{sales_price_display}</div>'
-                price_info_html += f'{discount_badge}</div>'
-                
-                # 게임 카드 HTML
-                card_html = (
-                    f'<div class="game-card">'
-                    f'<img src="{best_row["이미지 URL"]}" alt="{best_row["게임 이름"]}">'
-                    f'<div class="game-title">{best_row["게임 이름"]}</div>'
-                    f'<div class="game-genre">장르: {best_row["장르"][:30]}{"..." if len(best_row["장르"]) > 30 else ""}</div>'
-                    f'<div class="price-container">'
-                    f'{price_info_html}'
-                    f'</div>'
-                    f'</div>'
-                )
-                
-                st.markdown(card_html, unsafe_allow_html=True)
+                st.markdown(game_card_html(best_row), unsafe_allow_html=True)
                 
                 # 상세보기 버튼 추가
                 if st.button("상세보기", key=f"view_detail_{index}", use_container_width=True):
@@ -591,13 +528,36 @@ def render_full_data(df):
                 col_index = (col_index + 1) % 4
         
         # 더 보기 버튼
-        if len(current_results) > st.session_state.num_to_display:
+        if result.total > st.session_state.num_to_display:
             if st.button("더 보기", use_container_width=True):
                 st.session_state.num_to_display += 20
                 st.rerun()
 
 
-def render_game_detail(df, df_sales):
+def render_recommendation(rec):
+    """게임 하나의 구매 적정 가격 추천 결과를 표시합니다."""
+    st.markdown("---")
+    st.subheader("💡 구매 적정 가격")
+
+    if rec is None or pd.isna(rec['historical_low']) or pd.isna(rec['expected_price']):
+        st.info("해당 게임의 가격 이력이 부족해 추천 정보를 계산하지 못했습니다.")
+        return
+
+    if rec['verdict'] == BUY_NOW:
+        st.success(f"**{BUY_NOW}** — 현재 가격이 적정 가격 이하입니다.")
+    elif pd.notna(rec['verdict']) and rec['verdict']:
+        wait = f" (다음 할인까지 약 {int(rec['expected_wait_days'])}일)" if pd.notna(rec['expected_wait_days']) else ""
+        st.warning(f"**{rec['verdict']}** — 할인 시 약 ₩{int(rec['expected_price']):,}까지 내려갈 것으로 예상됩니다{wait}.")
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("역대 최저가", f"₩{int(rec['historical_low']):,}")
+    col2.metric("예상 할인가", f"₩{int(rec['expected_price']):,}")
+    col3.metric("평균 할인 폭", f"{rec['typical_depth'] * 100:.0f} %")
+    col4.metric("연간 할인 횟수", f"{rec['sales_per_year']:.1f} 회")
+
+
+@request_metrics.timed("render_game_detail")
+def render_game_detail(df, df_sales, recommendations, offers, similar=None):
     selected_id = st.session_state.get('selected_game_id')
         
     if st.button("← 목록으로 돌아가기"):
@@ -628,7 +588,7 @@ def render_game_detail(df, df_sales):
             img_col, info_col = st.columns([2, 3])
             
             with img_col:
-                st.image(best_row['이미지 URL'], use_container_width=True)
+                st.image(image_source(best_row['이미지 URL']), use_container_width=True)
             
             with info_col:
                 st.subheader("가격 정보")
@@ -638,17 +598,18 @@ def render_game_detail(df, df_sales):
                 discount_num = pd.to_numeric(discount_str.replace('%', ''), errors='coerce')
                 
                 if pd.notna(discount_num) and discount_num > 0:
-                    discount_html = f'<span style="background-color: #d43f3a; color: white; border-radius: 5px; padding: 3px 8px; font-weight: bold; font-size: 0.9em;">-{int(discount_num)}%</span>'
+                    discount_html = f'<span class="price-badge">-{int(discount_num)}%</span>'
                 
                 original_price_display = format_display_price(best_row['원가'])
                 sales_price_display = format_display_price(best_row['할인가'])
                 
                 if original_price_display != sales_price_display and '품절' not in sales_price_display:
-                    price_html = f'<div style="text-align: left;"><span style="font-size: 1.1em; color: grey;"><del>{original_price_display}</del></span><br><strong style="font-size: 1.8em; color: #d32f2f;">{sales_price_display}</strong></div>'
+                    price_html = f'<div class="price-block"><del class="price-was">{original_price_display}</del><br><strong class="price-now">{sales_price_display}</strong></div>'
                 else:
-                    price_html = f'<div style="text-align: left; font-size: 1.8em; font-weight: bold;">{sales_price_display}</div>'
+                    price_html = f'<div class="price-block price-now">{sales_price_display}</div>'
                 
-                final_price_html = f'<div style="display: flex; justify-content: flex-start; align-items: center; gap: 15px; height: 100%;">{price_html}{discount_html}</div>'
+                page_assets.use("price")
+                final_price_html = f'<div class="price-row large">{price_html}{discount_html}</div>'
                 st.markdown(final_price_html, unsafe_allow_html=True)
                 
                 st.subheader(" ")
@@ -661,48 +622,23 @@ def render_game_detail(df, df_sales):
             st.markdown("---")
             st.subheader("🛍️ 사이트별 가격 비교")
 
-            store_logos = {
-                'steam': 'https://upload.wikimedia.org/wikipedia/commons/thumb/8/83/Steam_icon_logo.svg/1024px-Steam_icon_logo.svg.png',
-                'directg': 'https://avatars.fastly.steamstatic.com/9e83477d3d1484489b83970cfd7a1051f886f688_full.jpg',
-                'epicgames': 'https://upload.wikimedia.org/wikipedia/commons/3/31/Epic_Games_logo.svg',
-                'greenmangaming': 'https://mcvuk.com/wp-content/uploads/green-man-gaming-logo_rgb_light-bg_copypng.png'
-            }
-
+            # 로딩 시 만들어 둔 (게임 × 사이트) 가격표에서 한 행만 조회
             game_name = best_row['게임 이름']
-            related_games = df[df['게임 이름'] == game_name]
-            
-            stores_data = {
-                'steam': None, 'directg': None, 'epicgames': None, 'greenmangaming': None
-            }
-            
-            for _, row in related_games.iterrows():
-                url = str(row.get('사이트 URL', '')).lower()
-                if 'directg.net' in url:
-                    stores_data['directg'] = row
-                elif 'store.steampowered.com' in url:
-                    stores_data['steam'] = row
-                elif 'epicgames.com' in url:
-                    stores_data['epicgames'] = row
-                elif 'greenmangaming.com' in url:
-                    stores_data['greenmangaming'] = row
-            
-            store_display_names = {
-                'steam': 'Steam', 
-                'directg': 'Direct Games', 
-                'epicgames': 'Epic Games', 
-                'greenmangaming': 'Green Man Gaming'
-            }
-            
-            # 간단한 컨테이너 방식으로 변경
-            for store_key, store_name in store_display_names.items():
-                store_data = stores_data.get(store_key)
+            game_offers = offers.loc[game_name] if game_name in offers.index else None
+
+            # 간단한 컨테이너 방식으로 변경 (행 스타일은 한 번만)
+            page_assets.use("store-row")
+            for store_key, (_, store_name) in STORES.items():
+                store_data = None
+                if game_offers is not None and pd.notna(game_offers[('사이트 URL', store_key)]):
+                    store_data = game_offers.xs(store_key, level=1)
 
                 with st.container(border=True):
                     # 순서: 로고 | 스토어명 | 가격 | 구매버튼
                     col_logo, col_name, col_price, col_button = st.columns([0.3, 1.5, 0.4, 0.4])
 
                     with col_logo:
-                        st.image(store_logos[store_key], width=100)
+                        st.image(image_source(STORE_LOGOS[store_key]), width=100)
 
                     with col_name:
                         st.markdown(f"**{store_name}**")
@@ -715,51 +651,36 @@ def render_game_detail(df, df_sales):
                             discount_num = pd.to_numeric(discount_str.replace('%', ''), errors='coerce')
 
                             if pd.notna(discount_num) and discount_num > 0 and original != sales:
-                                st.markdown(f"""
-                                    <span style='background-color: #dc3545; color: white; border-radius: 4px; padding: 2px 6px; font-size: 12px; font-weight: bold;'>-{int(discount_num)}%</span>
-                                    <span style='color: #888; text-decoration: line-through; font-size: 13px; margin-left: 6px;'>{original}</span>
-                                    <span style='font-size: 15px; font-weight: bold; color: #d32f2f; margin-left: 10px;'>{sales}</span>
-                                """, unsafe_allow_html=True)
+                                st.markdown(
+                                    f'<span class="store-badge">-{int(discount_num)}%</span>'
+                                    f'<span class="store-was">{original}</span>'
+                                    f'<span class="store-sale">{sales}</span>',
+                                    unsafe_allow_html=True
+                                )
                             else:
-                                st.markdown(f"<span style='font-size: 15px; font-weight: bold;'>{sales}</span>", unsafe_allow_html=True)
+                                st.markdown(f'<span class="store-price">{sales}</span>', unsafe_allow_html=True)
                         else:
-                            st.markdown("<span style='color: #999;'>정보 없음</span>", unsafe_allow_html=True)
+                            st.markdown('<span class="store-none">정보 없음</span>', unsafe_allow_html=True)
 
                     with col_button:
                         if store_data is not None and store_data['사이트 URL']:
-                            st.markdown("""
-                                <style>
-                                .custom-link-button {
-                                    display: inline-block;
-                                    background-color: #007bff;
-                                    color: white !important;
-                                    padding: 6px 10px;
-                                    border-radius: 6px;
-                                    text-decoration: none !important;
-                                    font-size: 13px;
-                                    font-weight: bold;
-                                    text-align: center;
-                                    transition: background-color 0.2s;
-                                    width: 100%;
-                                }
-                                .custom-link-button:hover {
-                                    background-color: #0056b3;
-                                }
-                                </style>
-                            """, unsafe_allow_html=True)
                             st.markdown(
                                 f'<a href="{store_data["사이트 URL"]}" target="_blank" class="custom-link-button">구매하기</a>',
                                 unsafe_allow_html=True
                             )
                         else:
-                            st.markdown("<span style='color: #999;'>-</span>", unsafe_allow_html=True)
+                            st.markdown('<span class="store-none">-</span>', unsafe_allow_html=True)
                 
-            st.markdown("---")
-            st.subheader("📈 가격 추이")
-            
             # '게임 이름' 클리닝
             cleaned_game_name = clean_game_name_final(best_row['게임 이름'])
 
+            # 배치로 계산된 추천 결과 조회
+            rec = recommendations.loc[cleaned_game_name] if cleaned_game_name in recommendations.index else None
+            render_recommendation(rec)
+
+            st.markdown("---")
+            st.subheader("📈 가격 추이")
+
             # combined_sales_data.csv에서 해당 게임의 데이터 필터링
             game_sales_data = df_sales[df_sales['게임 이름'] == cleaned_game_name]
 
@@ -767,36 +688,90 @@ def render_game_detail(df, df_sales):
                 # visualize 함수를 호출하여 그래프 생성
                 fig = visualize(game_sales_data)
                 # Streamlit에 그래프 표시
-                st.plotly_chart(fig, use_container_width=True, key=f"price_chart_{cleaned_game_name}")
+                plot(fig, use_container_width=True, key=f"price_chart_{cleaned_game_name}")
             else:
                 st.info("해당 게임의 가격 추이 데이터가 없습니다.")
 
+            # 비슷한 할인 게임: 로딩 시 계산해 둔 인덱스(filter/similar.py)에서 한 행만 조회
+            similar_rows = df.iloc[similar(selected_id)] if similar is not None else df.iloc[:0]
+            if not similar_rows.empty:
+                st.markdown("---")
+                st.subheader("🎯 비슷한 할인 게임")
+                page_assets.use("game-card")
+                cols = st.columns(4)
+                for i, (index, row) in enumerate(similar_rows.iterrows()):
+                    with cols[i % 4]:
+                        st.markdown(game_card_html(row), unsafe_allow_html=True)
+                        if st.button("상세보기", key=f"similar_{index}", use_container_width=True):
+                            view_detail(index)
+
+
+def render_admin():
+    """요청 지연 시간 집계/로그/cProfile 결과 (메뉴에 없는 관리자 페이지, ?admin=1)"""
+    st.subheader("⏱️ 요청 지연 시간")
+    st.caption("이 앱 프로세스의 모든 세션 기준, 페이지·구간별 최근 실행의 p50/p95입니다.")
+
+    profiling = st.toggle("cProfile 기록 (모든 실행에 적용, 켜 두면 느려집니다)", value=request_metrics.profiling_enabled())
+    request_metrics.enable_profiling(profiling)
 
+    table = request_metrics.summary()
+    if table.empty:
+        st.info("아직 기록된 실행이 없습니다.")
+    else:
+        st.dataframe(table, use_container_width=True, hide_index=True)
+
+    with st.expander("최근 실행 로그"):
+        st.code("\n".join(reversed(request_metrics.recent_lines())) or "-")
+    for page, text in request_metrics.profiles().items():
+        with st.expander(f"cProfile — {page}"):
+            st.code(text)
+
+    if st.button("집계 초기화"):
+        request_metrics.reset()
+        st.rerun()
+
+
+@request_metrics.timed_rerun
 def main():
     # --- 페이지 설정 ---
     st.set_page_config(layout="wide")
+    page_assets.begin()
     st.image("data/icon.png", width=150)
     st.title("🔥 게임 할인 정보 대시보드")
     
     st.caption("데이터는 웹 스크래핑을 기반으로 수집되었습니다.")
 
+    # --- 숨겨진 관리자 페이지 ---
+    if st.query_params.get("admin") == "1":
+        request_metrics.set_page("관리자")
+        render_admin()
+        return
+
     # --- 데이터 로드 ---
     try:
-        df = load_data("data/cleaned_merged_games_data.csv")
-        df_sales = load_data("data/combined_sales_data.csv")
-
+        with request_metrics.timed("load_data"):
+            catalog = get_catalog_store().current()
     except FileNotFoundError:
         st.error("오류: 데이터 파일을 찾을 수 없습니다.")
         st.info("`merged_games_data.csv`와 `combined_sales_data.csv` 파일을 앱과 같은 위치에 넣어주세요.")
         st.stop()
 
+    # 공유 데이터는 읽기 전용으로만 사용 (변경 시 다른 세션에 영향)
+    df, genres = catalog.df, catalog.genres
+    df_sales, recommendations = catalog.sales, catalog.recommendations
+
     # --- 세션 상태 초기화 ---
+    # 데이터가 교체되면 이전 데이터 기준의 검색 결과는 버림
+    if st.session_state.get('dataset_version') != catalog.version:
+        st.session_state.dataset_version = catalog.version
+        st.session_state.full_data_query = dict(DEFAULT_QUERY)
+        st.session_state.num_to_display = 20
     if 'page' not in st.session_state:
         st.session_state.page = '대시보드'
     if 'num_to_display' not in st.session_state:
         st.session_state.num_to_display = 20
-    if 'filtered_df' not in st.session_state:
-        st.session_state.filtered_df = df
+    if 'full_data_query' not in st.session_state:
+        st.session_state.full_data_query = dict(DEFAULT_QUERY)
     if 'selected_game_id' not in st.session_state:
         st.session_state.selected_game_id = None
 
@@ -810,14 +785,15 @@ def main():
     )
 
     # --- 페이지 렌더링 ---
+    request_metrics.set_page(st.session_state.page)
     if st.session_state.page == '대시보드':
-        render_dashboard(df)
+        render_dashboard(df, genres, catalog.leaderboards)
 
     elif st.session_state.page == '전체 데이터 보기':
-        render_full_data(df)
+        render_full_data(catalog)
 
     elif st.session_state.page == '게임 상세':
-        render_game_detail(df, df_sales)
+        render_game_detail(df, df_sales, recommendations, catalog.offers, catalog.similar_games)
 
 
 # --- 앱 실행 ---
@@ -0,0 +1,124 @@
+"""
+앱 종단 간 성능 측정 (헤드리스)
+합성 데이터(bench/synthetic.py)를 규모별로 만들어, 앱과 API가 거치는 데이터 경로와 페이지 함수를
+Streamlit 서버 없이(bare mode) 직접 호출하고 작업별 시간/메모리를 기록합니다.
+
+- load.catalog: CSV 읽기 + 장르 인코딩 + 추천 계산 + 조회/비슷한 게임 인덱스 (Catalog 생성)
+- shared.publish / shared.attach: 프로세스 간 공유 스냅샷 게시/연결
+- filter.*: 전체 데이터 보기 패싯 검색(Catalog.query, 정렬/패싯 개수 포함), API 검색(Catalog.search)
+- page.*: render_dashboard / render_full_data / render_game_detail
+- api.*: 상세/통계 응답 생성
+
+    python -m bench.app_benchmark --rows 100000 300000 1000000 [--memory]
+
+결과는 profiling.py 실행 리포트(data/reports/app_benchmark_<시각>.json/.txt)로 저장되며,
+--memory를 주면 tracemalloc으로 작업별 최대 할당량을 함께 잽니다. (측정 오버헤드로 시간은 늘어남)
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import tracemalloc
+
+import streamlit as st
+
+import app
+from bench.synthetic import write_dataset
+from catalog import Catalog, CatalogStore, attach_catalog, publish_catalog
+from profiling import stage, write_report
+
+QUERY = "dark"
+PLATFORMS = ["Steam"]
+GENRES = ["Action", "Indie"]
+
+
+def measure(name, rows, func, memory=False):
+    """작업 하나를 단계로 측정합니다. memory=True면 tracemalloc 최대 할당량(MB)을 기록에 추가합니다."""
+    if memory:
+        tracemalloc.start()
+    try:
+        with stage(name, rows_in=rows) as m:
+            result = func()
+            if hasattr(result, "__len__"):
+                m["rows_out"] = len(result)
+        if memory:
+            m["alloc_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 1)
+    finally:
+        if memory:
+            tracemalloc.stop()
+    return result, m
+
+
+def multi_store_game(catalog):
+    """판매 사이트가 가장 많은 게임의 ID (상세 페이지 측정용)"""
+    counts = catalog.df.groupby('게임 이름').size()
+    name = counts.idxmax()
+    return int(catalog.df.index[catalog.df['게임 이름'] == name][0])
+
+
+def run_scale(rows, directory, years, memory):
+    records = []
+
+    def step(name, func):
+        result, record = measure(f"{name}@{rows}", rows, func, memory)
+        records.append(record)
+        return result
+
+    catalog_path, sales_path = write_dataset(rows, directory, years)
+
+    # 추천 배치 결과 파일이 없으므로 Catalog 생성 시 추천도 함께 계산됨
+    catalog = step("load.catalog", lambda: Catalog(catalog_path, sales_path, os.path.join(directory, "none.csv")))
+    records[-1]["rows_out"] = len(catalog.df)
+
+    shared = os.path.join(directory, "shared")
+    step("shared.publish", lambda: publish_catalog(catalog, shared))
+    step("shared.attach", lambda: attach_catalog(catalog.version, shared).df)
+
+    # 페이지 함수가 쓰는 공유 저장소(썸네일 등)를 합성 데이터로 고정 (실제 데이터 로딩/감시 스레드가 측정에 섞이지 않도록)
+    store = CatalogStore.of(catalog)
+    app.get_catalog_store = lambda: store
+
+    df, genres = catalog.df, catalog.genres
+    step("filter.app_query", lambda: catalog.query(QUERY, limit=20).positions)
+    step("filter.app_all", lambda: catalog.query(QUERY, PLATFORMS, GENRES, sort="price", limit=20).positions)
+    step("filter.api_search", lambda: catalog.search(QUERY, PLATFORMS, GENRES))
+
+    st.session_state.full_data_query = dict(app.DEFAULT_QUERY)
+    st.session_state.num_to_display = 20
+    st.session_state.selected_game_id = multi_store_game(catalog)
+    step("page.dashboard", lambda: app.render_dashboard(df, genres, catalog.leaderboards))
+    step("page.full_data", lambda: app.render_full_data(catalog))
+    step("page.detail", lambda: app.render_game_detail(df, catalog.sales, catalog.recommendations, catalog.offers,
+                                                           catalog.similar_games))
+
+    game_id = st.session_state.selected_game_id
+    step("api.detail", lambda: catalog.detail(game_id))
+    step("api.stats", lambda: catalog.stats())
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 데이터 규모별 앱/데이터 경로 성능 측정")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100000, 300000, 1000000], help="게임 목록 행 수")
+    parser.add_argument("--years", type=int, default=3, help="가격 이력 기간(년)")
+    parser.add_argument("--memory", action="store_true", help="tracemalloc으로 작업별 최대 할당량 측정")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="game-bench-")
+    allocations = []
+    try:
+        for rows in args.rows:
+            print(f"[진행] {rows}행 측정 중...")
+            allocations += run_scale(rows, directory, args.years, args.memory)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    if args.memory:
+        print("작업별 최대 할당량 (tracemalloc)")
+        for record in allocations:
+            print(f"  {record['stage']:<40}{record['alloc_peak_mb']:>10} MB")
+    write_report("app_benchmark")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+대용량 합성 데이터 생성기
+병합/정리된 게임 목록(data/cleaned_merged_games_data.csv)과 같은 스키마의 게임 목록과,
+앱이 읽는 가격 이력(data/combined_sales_data.csv) 형식의 이력을 원하는 크기로 만듭니다.
+실제 데이터의 분포(게임당 판매 사이트 수, 사이트별 플랫폼, 장르 빈도/개수, 가격·할인율, 연령 등급)를 따릅니다.
+
+    python -m bench.synthetic --rows 100000 1000000 --years 3 --out-dir data/synthetic
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from filter.encoding import AGE_RATINGS
+from filter.recommend import clean_game_names
+from filter.stores import STORES
+
+out_dir = "data/synthetic"
+
+# 게임당 판매 사이트 수 1~4개의 비율 (실제 데이터 기준)
+STORE_COUNT_WEIGHTS = [0.47, 0.38, 0.13, 0.02]
+STORE_WEIGHTS = {'steam': 0.25, 'directg': 0.37, 'epicgames': 0.18, 'greenmangaming': 0.20}
+DIRECTG_PLATFORMS = (['Steam', 'Epic Games', 'Rockstar'], [0.978, 0.019, 0.003])
+STORE_PLATFORM = {'steam': 'Steam', 'epicgames': 'Epic Games', 'greenmangaming': 'Green Man Gaming'}
+
+GENRES = {
+    'Action': 2437, 'Adventure': 1578, 'Simulation': 1109, 'Strategy': 835, 'RPG': 812, 'Indie': 798,
+    'Casual': 355, 'Sports': 326, 'Racing': 269, 'Early Access': 203, 'Massively Multiplayer': 96,
+    'Shooter': 61, 'FPS': 48, 'Puzzle': 41, 'Free To Play': 38, 'Design & Illustration': 9,
+    'Animation & Modeling': 7, 'Game Development': 7, 'Utilities': 7, 'Education': 5,
+}
+GENRE_COUNT_WEIGHTS = [0.56, 0.24, 0.10, 0.054, 0.032, 0.014]
+AGE_WEIGHTS = [0.46, 0.18, 0.18, 0.02, 0.16]   # AGE_RATINGS 순서
+
+ADJECTIVES = ['Dark', 'Lost', 'Eternal', 'Iron', 'Silent', 'Crimson', 'Hidden', 'Broken', 'Final', 'Wild',
+              'Ancient', 'Frozen', 'Golden', 'Shadow', 'Neon', 'Savage', 'Hollow', 'Royal', 'Infinite', 'Cursed']
+NOUNS = ['Kingdom', 'Legends', 'Frontier', 'Dungeon', 'Empire', 'Odyssey', 'Protocol', 'Horizon', 'Tactics',
+         'Survivors', 'Chronicles', 'Racer', 'Station', 'Knights', 'Colony', 'Arena', 'Saga', 'Outpost', 'Rift', 'Drift']
+SUFFIXES = ['', '', '', ' 2', ' 3', ': Remastered', " - Deluxe Edition", ' & Friends', ": Director's Cut", ' Online']
+
+URL_PATTERNS = {
+    'steam': "https://store.steampowered.com/app/{id}/{slug}/",
+    'directg': "https://directg.net/game/game_page.html?product_code={id}",
+    'epicgames': "https://store.epicgames.com/ko/p/{slug}",
+    'greenmangaming': "https://www.greenmangaming.com/games/{slug}-pc/",
+}
+IMAGE_PATTERNS = {
+    'steam': "https://shared.fastly.steamstatic.com/store_item_assets/steam/apps/{id}/capsule_sm_120.jpg",
+    'directg': "https://image.directg.net/upload/product/goods_{id}_simg.jpg",
+    'epicgames': "https://cdn1.epicgames.com/offer/{id}/EGS_{slug}_1200x1600.jpg",
+    'greenmangaming': "https://images.greenmangaming.com/{id}/cover.jpg",
+}
+
+
+def _game_names(n, rng):
+    adj = rng.choice(ADJECTIVES, n)
+    noun = rng.choice(NOUNS, n)
+    suffix = rng.choice(SUFFIXES, n)
+    # 뒤에 번호를 붙여 게임 이름(과 정리된 게임 키)이 겹치지 않게 함
+    return pd.Series(adj) + ' ' + pd.Series(noun) + ' ' + pd.Series(np.arange(n)).astype(str) + pd.Series(suffix)
+
+
+def _genre_strings(n, rng):
+    names = np.array(list(GENRES))
+    weights = np.array(list(GENRES.values()), dtype=float)
+    counts = rng.choice(len(GENRE_COUNT_WEIGHTS), n, p=GENRE_COUNT_WEIGHTS) + 1
+    # 행마다 가중치 기반 무작위 키로 정렬해 중복 없이 앞에서 counts개 선택 (Efraimidis-Spirakis)
+    keys = rng.random((n, len(names))) ** (1 / weights)
+    order = np.argsort(-keys, axis=1)
+    picked = names[order[:, :counts.max()]]
+    mask = np.arange(picked.shape[1]) < counts[:, None]
+    return [', '.join(row[m]) for row, m in zip(picked, mask)]
+
+
+def make_catalog(rows, seed=0):
+    """게임 목록 합성 데이터 (한 게임이 여러 판매 사이트에 중복 등장)"""
+    rng = np.random.default_rng(seed)
+    mean_stores = np.dot(np.arange(1, 5), STORE_COUNT_WEIGHTS)
+    games = max(1, int(rows / mean_stores))
+
+    names = _game_names(games, rng)
+    slugs = clean_game_names(names)
+    genres = np.array(_genre_strings(games, rng), dtype=object)
+    ages = rng.choice(np.array(AGE_RATINGS, dtype=object), games, p=AGE_WEIGHTS)
+    base_price = np.clip(np.round(rng.lognormal(10.2, 0.55, games), -2), 0, 300000)
+    base_price[rng.random(games) < 0.02] = 0  # 무료 게임
+    reviews = np.where(rng.random(games) < 0.2, rng.lognormal(5, 2, games), 0).astype(int)
+
+    # 게임별 판매 사이트 선택 (가중치 기반 중복 없는 추출)
+    store_keys = np.array(list(STORES))
+    store_count = rng.choice(4, games, p=STORE_COUNT_WEIGHTS) + 1
+    keys = rng.random((games, 4)) ** (1 / np.array([STORE_WEIGHTS[k] for k in store_keys]))
+    order = np.argsort(-keys, axis=1)
+    selected = np.arange(4) < store_count[:, None]
+    game_idx = np.repeat(np.arange(games), store_count)
+    store = store_keys[order[selected.nonzero()[0], selected.nonzero()[1]]]
+
+    n = len(game_idx)
+    discount = np.where(rng.random(n) < 0.45, rng.choice(np.arange(5, 95, 5), n), 0).astype(float)
+    original = np.round(base_price[game_idx] * rng.uniform(0.92, 1.05, n), -2)
+    discount[original == 0] = 0
+    sale = np.round(original * (1 - discount / 100), -2)
+
+    platform = np.array([STORE_PLATFORM.get(s, '') for s in store], dtype=object)
+    is_directg = store == 'directg'
+    platform[is_directg] = rng.choice(DIRECTG_PLATFORMS[0], is_directg.sum(), p=DIRECTG_PLATFORMS[1])
+
+    product_id = (game_idx * 7919 + 100000).astype(str)
+    slug = slugs.to_numpy()[game_idx]
+    site_url = [URL_PATTERNS[s].format(id=i, slug=g) for s, i, g in zip(store, product_id, slug)]
+    image_url = [IMAGE_PATTERNS[s].format(id=i, slug=g) for s, i, g in zip(store, product_id, slug)]
+
+    catalog = pd.DataFrame({
+        "게임 이름": names.to_numpy()[game_idx],
+        "원가": original.astype(int),
+        "할인가": sale.astype(int),
+        "사이트 URL": site_url,
+        "할인율": discount,
+        "유저리뷰수": reviews[game_idx],
+        "플랫폼 이름": platform,
+        "이미지 URL": image_url,
+        "장르": genres[game_idx],
+        "연령 등급": ages[game_idx],
+    })
+    # 실제 목록처럼 스토어별로 섞인 순서
+    return catalog.sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+def make_sales(catalog, years=3, sales_per_year=2, seed=0, end="2025-07-31"):
+    """
+    가격 이력 합성 데이터 (앱/추천 배치가 읽는 combined_sales_data.csv 형식)
+    게임마다 관측 기간 동안 정가 기록과 할인 기록을 섞어 만듭니다.
+    """
+    rng = np.random.default_rng(seed + 1)
+    games = catalog.drop_duplicates("게임 이름")
+    keys = clean_game_names(games["게임 이름"]).to_numpy()
+    regular = games["원가"].to_numpy(dtype=float)
+    platform = games["플랫폼 이름"].to_numpy()
+
+    per_game = rng.poisson(sales_per_year * years * 2, len(games)) + 1   # 정가/할인 기록 절반씩
+    idx = np.repeat(np.arange(len(games)), per_game)
+    n = len(idx)
+    days = rng.integers(0, int(365.25 * years), n)
+    dates = pd.Timestamp(end) - pd.to_timedelta(days, unit="D")
+    depth = np.where(rng.random(n) < 0.5, rng.choice(np.arange(10, 95, 5), n), 0) / 100
+
+    return pd.DataFrame({
+        "게임 이름": keys[idx],
+        "할인 시작일": dates.strftime("%Y-%m-%d"),
+        "할인가": np.round(regular[idx] * (1 - depth), -2).astype(int),
+        "플랫폼 이름": platform[idx],
+    }).sort_values(["게임 이름", "할인 시작일"], ignore_index=True)
+
+
+def write_dataset(rows, directory=out_dir, years=3, sales_per_year=2, seed=0):
+    """합성 게임 목록/가격 이력을 CSV로 저장하고 (게임 목록 경로, 가격 이력 경로)를 반환합니다."""
+    os.makedirs(directory, exist_ok=True)
+    catalog = make_catalog(rows, seed)
+    sales = make_sales(catalog, years, sales_per_year, seed=seed)
+    catalog_path = os.path.join(directory, f"catalog_{rows}.csv")
+    sales_path = os.path.join(directory, f"sales_{rows}.csv")
+    catalog.to_csv(catalog_path, index=False, encoding="utf-8-sig")
+    sales.to_csv(sales_path, index=False, encoding="utf-8-sig")
+    return catalog_path, sales_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대용량 합성 게임 목록/가격 이력 생성")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100000], help="게임 목록 행 수 (여러 개 가능)")
+    parser.add_argument("--years", type=int, default=3, help="가격 이력 기간(년)")
+    parser.add_argument("--sales-per-year", type=float, default=2, help="게임당 연간 할인 횟수 (정가 기록도 같은 수만큼)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out-dir", default=out_dir)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        catalog_path, sales_path = write_dataset(rows, args.out_dir, args.years, args.sales_per_year, args.seed)
+        print(f"[완료] {rows}행 합성 데이터 → {catalog_path}, {sales_path}")
+
+
+if __name__ == "__main__":
+    main()
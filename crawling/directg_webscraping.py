@@ -1,21 +1,32 @@
+import argparse
+
 import requests
 from bs4 import BeautifulSoup
 import pandas as pd
 from urllib.parse import urljoin
-import time
+from concurrent.futures import ThreadPoolExecutor
+
+from crawling import limiter
+from crawling.page_archive import PageArchive
+from profiling import stage, track, write_report
+
+output_file = "data/directg_games_data.csv"
 
-def scrape_all_directg_games():
+BASE_URL = "https://directg.net/game/game.html"
+MAX_WORKERS = 8  # 상세 페이지 최대 동시 요청 수 (실제 동시 요청 수는 limiter가 조절)
+
+def scrape_all_directg_games(archive=None):
     """
     다이렉트 게임즈의 모든 페이지를 순회하며,
     DLC를 제외하고 상세 페이지의 정보를 포함한 최종 데이터를 스크래핑하는 함수 (최종본)
     """
-    base_url = "https://directg.net/game/game.html"
+    base_url = BASE_URL
     game_data_list = []
 
     # --- 1. 최종 페이지 번호 찾기 ---
     try:
         print("최종 페이지 번호를 확인합니다...")
-        response = requests.get(base_url)
+        response = limiter.get(requests, base_url, timeout=30)
         response.raise_for_status()
         response.encoding = 'utf-8'
         soup = BeautifulSoup(response.text, 'html.parser')
@@ -36,128 +47,220 @@ def scrape_all_directg_games():
         last_page = 1 
     
     # --- 2. 1페이지부터 마지막 페이지까지 순회 ---
+    with stage("directg.pages") as m:
+        m["requests"] = crawl_pages(last_page, base_url, game_data_list, archive)
+        m["rows_out"] = len(game_data_list)
+        m["hosts"] = limiter.stats()
+
+    return game_data_list
+
+
+def fetch_detail(session, url):
+    """상세 페이지 응답 (실패하면 예외 객체를 반환해 목록 순서대로 처리할 때 다시 던짐)"""
+    try:
+        with track("directg.detail.fetch"):
+            return limiter.get(session, url, timeout=30)
+    except requests.exceptions.RequestException as e:
+        return e
+
+
+def crawl_pages(last_page, base_url, game_data_list, archive=None):
+    """
+    목록/상세 페이지를 순회하며 game_data_list에 결과를 채우고, 보낸 요청 수를 반환합니다.
+    목록 페이지마다 상세 페이지들을 호스트 limiter가 허용하는 만큼 병렬로 미리 받아 둡니다.
+    archive(PageArchive)를 주면 받은 목록/상세 페이지 원본을 보관합니다.
+    """
+    limiter.limiter_for(base_url, max_limit=MAX_WORKERS)
+    with requests.Session() as session, ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        return _crawl_pages(last_page, base_url, game_data_list, session, executor, archive)
+
+
+def parse_list_page(html, base_url=BASE_URL):
+    """목록 페이지 HTML을 게임 항목 dict 목록으로 바꿉니다. (상세 페이지 정보 제외)"""
+    soup = BeautifulSoup(html, 'html.parser')
+    items = []
+    for item in soup.select('div.product.vm-col.vm-col-3'):
+        temp_title_tag = item.find('h2', itemprop='name')
+        temp_title = temp_title_tag['content'] if temp_title_tag else '제목 없음'
+
+        site_url = 'URL 없음'
+        site_url_tag = item.find('a', itemprop='url')
+        if site_url_tag and 'href' in site_url_tag.attrs:
+            site_url = urljoin(base_url, site_url_tag['href'])
+
+        platform_name = '플랫폼 정보 없음'
+        platform_img = item.select_one('div[style*="display:block"] img')
+        if platform_img and 'src' in platform_img.attrs:
+            src = platform_img['src']
+            if 'steam' in src: platform_name = 'Steam'
+            elif 'rockstar' in src: platform_name = 'Rockstar'
+            elif 'epic' in src: platform_name = 'Epic Games'
+
+        image_tag = item.find('img', class_='browseProductImage')
+        image_url = image_tag['src'] if image_tag else '이미지 없음'
+
+        sales_price_tag = item.find('span', class_='PricesalesPrice', itemprop='price')
+        sales_price = sales_price_tag.get_text(strip=True) if sales_price_tag else '품절'
+
+        base_price_tag = item.find('span', class_='PricebasePrice')
+        if base_price_tag and base_price_tag.get_text(strip=True):
+            original_price = base_price_tag.get_text(strip=True)
+            discount_rate_tag = item.find('span', class_='label-danger')
+            discount_rate = discount_rate_tag.get_text(strip=True) if discount_rate_tag else '0%'
+        else:
+            original_price = sales_price
+            discount_rate = '0%'
+
+        items.append({
+            "temp_title": temp_title,
+            "site_url": site_url,
+            "platform": platform_name,
+            "image": image_url,
+            "sales_price": sales_price,
+            "original_price": original_price,
+            "discount_rate": discount_rate,
+        })
+    return items
+
+
+def parse_detail_page(html):
+    """상세 페이지 HTML에서 (영문 제목, 장르, 연령 등급)을 추출합니다. DLC면 None. (없는 값은 None/'정보 없음')"""
+    with track("directg.detail.parse"):
+        detail_soup = BeautifulSoup(html, 'html.parser')
+
+    # --- DLC 게임인지 확인하는 최종 로직 ---
+    short_desc_div = detail_soup.find('div', class_='product-short-description')
+    if short_desc_div and "기본 게임이 필요합니다" in short_desc_div.get_text():
+        return None
+
+    game_title, genre, age_rating = None, '정보 없음', '정보 없음'
+    title_span_tag = detail_soup.select_one('h1 span[style="text-transform:none"]')
+    if title_span_tag:
+        game_title = title_span_tag.get_text(strip=True)
+
+    info_section = detail_soup.find('div', class_='product-info')
+    if info_section:
+        genre_desc_tag = info_section.find('span', class_='vm-desc', string='장르 ')
+        if genre_desc_tag:
+            genre_value_tag = genre_desc_tag.find_next_sibling('span', class_='vm-value')
+            if genre_value_tag: genre = genre_value_tag.get_text(strip=True)
+
+        age_img_tag = info_section.select_one('div#etc > img')
+        if age_img_tag and 'src' in age_img_tag.attrs:
+            img_src = age_img_tag['src']
+            if 'age_10' in img_src: age_rating = '전체 이용가'
+            elif 'age_12' in img_src: age_rating = '12세 이용가'
+            elif 'age_15' in img_src: age_rating = '15세 이용가'
+            elif 'age_19' in img_src: age_rating = '19세 이용가'
+
+    return game_title, genre, age_rating
+
+
+def game_row(item, detail=None):
+    """목록 항목과 상세 페이지 추출 결과로 결과 행을 만듭니다."""
+    game_title, genre, age_rating = detail or (None, '정보 없음', '정보 없음')
+    return {
+        "게임 이름": game_title or item["temp_title"],
+        "원가": item["original_price"],
+        "할인가": item["sales_price"],
+        "사이트 URL": item["site_url"],
+        "할인율": item["discount_rate"],
+        "유저 평점": None,
+        "유저 리뷰": None,
+        "플랫폼 이름": item["platform"],
+        "이미지": item["image"],
+        "장르": genre,
+        "연령 등급": age_rating,
+    }
+
+
+def _crawl_pages(last_page, base_url, game_data_list, session, executor, archive=None):
+    request_count = 0
     for page_num in range(1, last_page + 1):
         page_url = f"https://directg.net/game/game.html?page={page_num}"
         print(f"\n--- {page_num} 페이지 스크래핑 시작 ---")
 
         try:
-            response = requests.get(page_url)
+            with track("directg.list.fetch"):
+                request_count += 1
+                response = limiter.get(session, page_url, timeout=30)
             response.raise_for_status()
             response.encoding = 'utf-8'
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            game_items = soup.select('div.product.vm-col.vm-col-3')
+            game_items = parse_list_page(response.text, base_url)
             if not game_items:
                 print(f"{page_num} 페이지에 게임이 없어 중단합니다.")
                 break
+            if archive:
+                archive.put(page_url, response.text, "directg", "list", {"page": page_num})
+
+            detail_urls = [item["site_url"] for item in game_items if item["site_url"] != 'URL 없음']
+            details = dict(zip(detail_urls, executor.map(lambda url: fetch_detail(session, url), detail_urls)))
+            request_count += len(detail_urls)
 
             for item in game_items:
-                # 1단계: 목록 페이지에서 기본 정보 및 URL 추출
-                temp_title_tag = item.find('h2', itemprop='name')
-                temp_title = temp_title_tag['content'] if temp_title_tag else '제목 없음'
-                
-                site_url = 'URL 없음'
-                site_url_tag = item.find('a', itemprop='url')
-                if site_url_tag and 'href' in site_url_tag.attrs:
-                    site_url = urljoin(base_url, site_url_tag['href'])
-
-                # 2단계: 상세 페이지 접속하여 최종 데이터 추출
-                game_title, genre, age_rating = temp_title, '정보 없음', '정보 없음'
-                
-                if site_url != 'URL 없음':
+                detail = None
+                if item["site_url"] != 'URL 없음':
                     try:
-                        detail_response = requests.get(site_url)
+                        detail_response = details[item["site_url"]]
+                        if isinstance(detail_response, Exception):
+                            raise detail_response
                         detail_response.encoding = 'utf-8'
-                        detail_soup = BeautifulSoup(detail_response.text, 'html.parser')
-                        
-                        # --- DLC 게임인지 확인하는 최종 로직 ---
-                        short_desc_div = detail_soup.find('div', class_='product-short-description')
-                        if short_desc_div and "기본 게임이 필요합니다" in short_desc_div.get_text():
-                            print(f"  - DLC 게임으로 판단되어 건너뜁니다: {temp_title}")
-                            continue 
-                        # --- DLC 확인 로직 끝 ---
-                        
-                        # 영문 제목, 장르, 연령 등급 추출
-                        title_span_tag = detail_soup.select_one('h1 span[style="text-transform:none"]')
-                        if title_span_tag:
-                            game_title = title_span_tag.get_text(strip=True)
-                        
-                        info_section = detail_soup.find('div', class_='product-info')
-                        if info_section:
-                            genre_desc_tag = info_section.find('span', class_='vm-desc', string='장르 ')
-                            if genre_desc_tag:
-                                genre_value_tag = genre_desc_tag.find_next_sibling('span', class_='vm-value')
-                                if genre_value_tag: genre = genre_value_tag.get_text(strip=True)
-
-                            age_img_tag = info_section.select_one('div#etc > img')
-                            if age_img_tag and 'src' in age_img_tag.attrs:
-                                img_src = age_img_tag['src']
-                                if 'age_10' in img_src: age_rating = '전체 이용가'
-                                elif 'age_12' in img_src: age_rating = '12세 이용가'
-                                elif 'age_15' in img_src: age_rating = '15세 이용가'
-                                elif 'age_19' in img_src: age_rating = '19세 이용가'
-
+                        if archive:
+                            archive.put(item["site_url"], detail_response.text, "directg", "detail")
+                        detail = parse_detail_page(detail_response.text)
                     except requests.exceptions.RequestException as detail_e:
-                        print(f"'{temp_title}' 상세 페이지 접속 실패: {detail_e}")
+                        print(f"'{item['temp_title']}' 상세 페이지 접속 실패: {detail_e}")
+                        continue
+                    if detail is None:
+                        print(f"  - DLC 게임으로 판단되어 건너뜁니다: {item['temp_title']}")
                         continue
 
-                # 3단계: 목록 페이지에서 나머지 정보 추출
-                platform_name = '플랫폼 정보 없음'
-                platform_img = item.select_one('div[style*="display:block"] img')
-                if platform_img and 'src' in platform_img.attrs:
-                    src = platform_img['src']
-                    if 'steam' in src: platform_name = 'Steam'
-                    elif 'rockstar' in src: platform_name = 'Rockstar'
-                    elif 'epic' in src: platform_name = 'Epic Games'
-                
-                image_tag = item.find('img', class_='browseProductImage')
-                image_url = image_tag['src'] if image_tag else '이미지 없음'
-                
-                sales_price_tag = item.find('span', class_='PricesalesPrice', itemprop='price')
-                sales_price = sales_price_tag.get_text(strip=True) if sales_price_tag else '품절'
-
-                base_price_tag = item.find('span', class_='PricebasePrice')
-                if base_price_tag and base_price_tag.get_text(strip=True):
-                    original_price = base_price_tag.get_text(strip=True)
-                    discount_rate_tag = item.find('span', class_='label-danger')
-                    discount_rate = discount_rate_tag.get_text(strip=True) if discount_rate_tag else '0%'
-                else:
-                    original_price = sales_price
-                    discount_rate = '0%'
-                
-                print(f"  - 처리 완료: {game_title}")
-                game_data_list.append({
-                    "게임 이름": game_title,
-                    "원가": original_price,
-                    "할인가": sales_price,
-                    "사이트 URL": site_url,
-                    "할인율": discount_rate,
-                    "유저 평점": None, 
-                    "유저 리뷰": None,
-                    "플랫폼 이름": platform_name,
-                    "이미지": image_url,
-                    "장르": genre,
-                    "연령 등급": age_rating,
-                })
+                row = game_row(item, detail)
+                print(f"  - 처리 완료: {row['게임 이름']}")
+                game_data_list.append(row)
         
         except Exception as e:
             print(f"{page_num} 페이지 처리 중 오류 발생: {e}")
             continue 
 
-        time.sleep(1)
+        print(f"[진행] {page_num}/{last_page} 페이지, {limiter.limiter_for(base_url).describe()}")
+
+    return request_count
 
-    return game_data_list
+
+def extract_archived(archive, records):
+    """
+    보관된 목록 페이지(records)마다 현재 파서로 행을 다시 만듭니다. (page_archive 재추출용)
+    상세 페이지는 보관소에서 URL의 가장 최근 원본을 찾고, 없으면 목록 정보만 씁니다.
+    """
+    rows = []
+    for r in records.itertuples():
+        for item in parse_list_page(archive.read(r.sha)):
+            detail = None
+            if item["site_url"] != 'URL 없음':
+                html = archive.latest_content(item["site_url"], "directg", "detail")
+                if html is not None:
+                    detail = parse_detail_page(html)
+                    if detail is None:
+                        continue
+            rows.append(game_row(item, detail))
+    return rows
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="다이렉트 게임즈 전체 페이지 스크래핑")
+    parser.add_argument("--archive", default=None, help="받은 페이지 원본을 보관할 디렉터리 (page_archive)")
+    args = parser.parse_args()
+
     print("다이렉트 게임즈 전체 페이지 스크래핑을 시작합니다...")
-    scraped_data = scrape_all_directg_games()
+    scraped_data = scrape_all_directg_games(PageArchive(args.archive) if args.archive else None)
 
     if scraped_data:
         df = pd.DataFrame(scraped_data)
         print(f"\n총 {len(df)}개의 게임 데이터를 수집했습니다.")
         print("최종 스크래핑 결과 (상위 5개):")
         print(df.head())
-        df.to_csv("data/directg_games_data.csv", index=False, encoding='utf-8-sig')
-        print("\n'data/directg_games_data.csv' 파일로 저장이 완료되었습니다.")
+        df.to_csv(output_file, index=False, encoding='utf-8-sig')
+        print(f"\n'{output_file}' 파일로 저장이 완료되었습니다.")
     else:
-        print("스크래핑된 데이터가 없습니다.")
\ No newline at end of file
+        print("스크래핑된 데이터가 없습니다.")
+    write_report("directg_crawl")
\ No newline at end of file
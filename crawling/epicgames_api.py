@@ -0,0 +1,224 @@
+"""
+Epic Games 스토어 카탈로그 수집 (JSON API)
+브라우저로 상품 페이지를 하나씩 여는 대신, 스토어 웹이 사용하는 GraphQL searchStore 응답을
+페이지 단위(PAGE_SIZE개)로 병렬 요청해 제목/가격/할인/이미지/태그를 한 번에 가져옵니다.
+결과는 병합 단계의 공통 컬럼 형식(가격은 원화 정수)으로 저장되므로 그대로 병합할 수 있습니다.
+가격은 통화의 소수 자릿수(currencyInfo.decimals)로 나눈 뒤 반올림하고, 원화가 아닌 응답은 오류로 중단합니다.
+
+    python -m crawling.epicgames_api --workers 4
+    python -m filter.merge_games --extra data/epicgames_games_data.csv
+
+--archive로 페이지 응답을 보관소(crawling.page_archive)에 넣어 두면 python -m crawling.page_archive --extract epicgames로
+네트워크 없이 같은 결과를 다시 만들 수 있습니다.
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import requests
+
+from crawling import limiter
+from crawling.page_archive import PageArchive
+from filter.merge_games import genre_translation
+from profiling import stage, track, write_report
+
+output_file = "data/epicgames_games_data.csv"
+
+GRAPHQL_URL = "https://store.epicgames.com/graphql"
+STORE_URL = "https://store.epicgames.com/{locale}/p/{slug}"
+PAGE_SIZE = 100
+CURRENCY = "KRW"
+HEADERS = {"User-Agent": "Mozilla/5.0", "Content-Type": "application/json"}
+COLUMNS = ["게임 이름", "원가", "할인가", "사이트 URL", "할인율", "유저리뷰수", "플랫폼 이름", "이미지 URL", "장르", "연령 등급"]
+
+# 카드에 쓸 이미지 우선순위
+IMAGE_TYPES = ["OfferImageTall", "DieselStoreFrontTall", "Thumbnail", "OfferImageWide", "DieselStoreFrontWide"]
+
+SEARCH_QUERY = """
+query searchStoreQuery($category: String, $count: Int, $country: String!, $locale: String,
+                       $sortBy: String, $sortDir: String, $start: Int) {
+  Catalog {
+    searchStore(category: $category, count: $count, country: $country, locale: $locale,
+                sortBy: $sortBy, sortDir: $sortDir, start: $start) {
+      elements {
+        title
+        id
+        namespace
+        productSlug
+        urlSlug
+        keyImages { type url }
+        tags { id name groupName }
+        catalogNs { mappings(pageType: "productHome") { pageSlug pageType } }
+        offerMappings { pageSlug pageType }
+        price(country: $country) {
+          totalPrice {
+            originalPrice
+            discountPrice
+            currencyCode
+            currencyInfo { decimals }
+          }
+        }
+      }
+      paging { count total }
+    }
+  }
+}
+"""
+
+
+def page_variables(start, count=PAGE_SIZE, locale="ko", country="KR"):
+    return {
+        "category": "games/edition/base", "count": count, "country": country, "locale": locale,
+        "sortBy": "releaseDate", "sortDir": "DESC", "start": start,
+    }
+
+
+def fetch_page(session, start, count=PAGE_SIZE, locale="ko", country="KR"):
+    """searchStore 한 페이지의 JSON 응답을 반환합니다."""
+    with track("epic.page.fetch"):
+        res = limiter.post(
+            session,
+            GRAPHQL_URL,
+            json={"query": SEARCH_QUERY, "variables": page_variables(start, count, locale, country)},
+            headers=HEADERS,
+            timeout=30,
+        )
+        res.raise_for_status()
+        return res.json()
+
+
+def _search_store(payload):
+    return payload["data"]["Catalog"]["searchStore"]
+
+
+def _page_slug(element):
+    for mapping in (element.get("catalogNs") or {}).get("mappings") or []:
+        if mapping.get("pageSlug"):
+            return mapping["pageSlug"]
+    for mapping in element.get("offerMappings") or []:
+        if mapping.get("pageSlug"):
+            return mapping["pageSlug"]
+    slug = element.get("productSlug") or element.get("urlSlug")
+    return slug.split("/")[0] if slug else None
+
+
+def _image_url(element):
+    images = {img.get("type"): img.get("url") for img in element.get("keyImages") or []}
+    for image_type in IMAGE_TYPES:
+        if images.get(image_type):
+            return images[image_type]
+    return next(iter(images.values()), None)
+
+
+def _genres(element):
+    names = [tag["name"] for tag in element.get("tags") or [] if tag.get("groupName") == "genre" and tag.get("name")]
+    return ", ".join(genre_translation.get(name, name) for name in names) if names else "정보 없음"
+
+
+def parse_element(element, locale="ko"):
+    """searchStore 항목 하나를 병합용 공통 컬럼 dict로 바꿉니다. 상품 페이지가 없는 항목은 None."""
+    slug = _page_slug(element)
+    if not slug:
+        return None
+
+    total = ((element.get("price") or {}).get("totalPrice")) or {}
+    if total and total.get("currencyCode") != CURRENCY:
+        # 병합 단계는 Epic 가격을 원화 정수로 읽으므로 다른 통화는 받지 않음
+        raise ValueError(f"{CURRENCY}가 아닌 가격입니다 ({total.get('currencyCode')}): country=KR로 요청하세요")
+    scale = 10 ** ((total.get("currencyInfo") or {}).get("decimals", 0) or 0)
+    original = total.get("originalPrice")
+    sale = total.get("discountPrice")
+    original = None if original is None else round(original / scale)
+    sale = original if sale is None else round(sale / scale)
+    discount = round((1 - sale / original) * 100) if original and sale is not None else 0
+
+    return {
+        "게임 이름": element.get("title"),
+        "원가": "정보 없음" if original is None else original,
+        "할인가": "정보 없음" if sale is None else sale,
+        "사이트 URL": STORE_URL.format(locale=locale, slug=slug),
+        "할인율": f"{discount}%",
+        "유저리뷰수": 0,  # Epic 스토어는 리뷰 수를 제공하지 않음
+        "플랫폼 이름": "Epic Games",
+        "이미지 URL": _image_url(element),
+        "장르": _genres(element),
+        "연령 등급": "정보 없음",
+    }
+
+
+def parse_page(payload, locale="ko"):
+    """페이지 응답 하나를 (행 목록, 전체 항목 수)로 바꿉니다."""
+    with track("epic.page.parse"):
+        search = _search_store(payload)
+        rows = [row for row in (parse_element(e, locale) for e in search["elements"]) if row]
+        return rows, search["paging"]["total"]
+
+
+def crawl_catalog(workers=8, page_size=PAGE_SIZE, max_items=None, locale="ko", country="KR", archive=None):
+    """
+    전체 카탈로그를 수집합니다. 첫 페이지로 전체 항목 수를 확인한 뒤 나머지 페이지를 병렬로 요청하고,
+    페이지 순서대로 합칩니다. (요청 수 = 전체 항목 수 / page_size)
+    실제 동시 요청 수는 호스트 limiter가 workers 안에서 조절합니다.
+    """
+    host = limiter.limiter_for(GRAPHQL_URL, max_limit=workers)
+
+    def get(start):
+        payload = fetch_page(session, start, page_size, locale, country)
+        if archive:
+            archive.put(f"{GRAPHQL_URL}?locale={locale}&country={country}&start={start}&count={page_size}",
+                        json.dumps(payload, ensure_ascii=False), "epicgames", "page", {"start": start, "locale": locale})
+        return payload
+
+    with requests.Session() as session:
+        first = get(0)
+        rows, total = parse_page(first, locale)
+        total = min(total, max_items) if max_items else total
+        starts = list(range(page_size, total, page_size))
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for done, payload in enumerate(executor.map(get, starts), start=2):
+                rows += parse_page(payload, locale)[0]
+                if done % 20 == 0:
+                    print(f"[진행] {done}/{1 + len(starts)}페이지, {host.describe()}")
+
+    return to_frame(rows), 1 + len(starts)
+
+
+def to_frame(rows):
+    return pd.DataFrame(rows, columns=COLUMNS).drop_duplicates(subset="사이트 URL")
+
+
+def extract_archived(archive, records):
+    """보관된 페이지 응답(records)마다 현재 파서로 행을 다시 만듭니다. (page_archive 재추출용)"""
+    rows = []
+    for r in records.itertuples():
+        rows += parse_page(json.loads(archive.read(r.sha)), r.meta.get("locale", "ko"))[0]
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Epic Games 스토어 카탈로그 수집 (JSON API)")
+    parser.add_argument("--workers", type=int, default=8, help="최대 동시 요청 수 (실제 값은 응답 상태에 맞춰 조절)")
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZE)
+    parser.add_argument("--max-items", type=int, default=None, help="최대 수집 항목 수 (기본: 전체)")
+    parser.add_argument("--output", default=output_file)
+    parser.add_argument("--archive", default=None, help="페이지 응답을 넣을 보관소 디렉터리 (page_archive)")
+    args = parser.parse_args()
+
+    with stage("epic.pages") as m:
+        archive = PageArchive(args.archive) if args.archive else None
+        df, requests_made = crawl_catalog(args.workers, args.page_size, args.max_items, archive=archive)
+        m["requests"] = requests_made
+        m["rows_out"] = len(df)
+        m["hosts"] = limiter.stats()
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    df.to_csv(args.output, index=False, encoding="utf-8-sig")
+    print(f"[완료] {len(df)}개 게임 ({requests_made}회 요청) → {args.output}")
+    write_report("epic_crawl")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Green Man Gaming 카탈로그 수집 (검색 JSON API)
+목록 페이지의 게임 카드(li.ais-Hits-item)는 브라우저에서 Algolia InstantSearch가 그리므로 HTML에는 결과가 없습니다.
+그래서 브라우저 대신 그 위젯이 호출하는 Algolia 검색 API를 페이지 단위(HITS_PER_PAGE개)로 직접 요청해
+JSON 응답을 페이지마다 따로 파싱합니다. 첫 페이지로 전체 페이지 수를 확인한 뒤 나머지를 병렬로 요청합니다. (Epic과 같은 방식)
+
+검색 설정(앱 ID, 검색 전용 키, 인덱스 이름)은 목록 페이지의 InstantSearch 설정에서 읽고,
+바뀌었거나 찾지 못하면 GMG_ALGOLIA_APP_ID / GMG_ALGOLIA_API_KEY / GMG_ALGOLIA_INDEX 환경 변수로 지정합니다.
+결과를 좁히는 Algolia 필터 식이 필요하면 GMG_ALGOLIA_FILTERS로 줍니다. (Algolia는 기본적으로 검색 하나당 1000개까지만
+페이지를 넘길 수 있으므로, 그보다 많으면 필터로 나눠 여러 번 수집합니다)
+첫 페이지에 결과가 없으면 빈 파일을 쓰지 않고 실패합니다.
+
+목록에는 장르/연령 등급이 없으므로 --reference로 기존 병합 데이터를 주면 같은 게임 이름의 값을 채웁니다.
+
+    python -m crawling.greenmangaming_crawler --workers 4
+    python -m filter.merge_games --extra data/greenmangaming_games_data.csv
+
+--archive로 페이지 응답을 보관소(crawling.page_archive)에 넣어 두면 python -m crawling.page_archive --extract greenmangaming으로
+다시 추출합니다. (장르/연령 등급은 재추출 뒤 채워지지 않은 상태)
+"""
+import argparse
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urljoin
+
+import pandas as pd
+import requests
+
+from crawling import limiter
+from crawling.page_archive import PageArchive
+from profiling import stage, track, write_report
+
+output_file = "data/greenmangaming_games_data.csv"
+reference_file = "data/cleaned_merged_games_data.csv"
+
+BASE_URL = "https://www.greenmangaming.com"
+LIST_URL = BASE_URL + "/ko/all-games/platforms-os/pc/"
+SEARCH_URL = "https://{app_id}-dsn.algolia.net/1/indexes/{index}/query"
+HITS_PER_PAGE = 100
+CURRENCY = "KRW"
+HEADERS = {"User-Agent": "Mozilla/5.0", "Accept-Language": "ko-KR,ko;q=0.9"}
+COLUMNS = ["게임 이름", "원가", "할인가", "사이트 URL", "할인율", "유저리뷰수", "플랫폼 이름", "이미지 URL", "장르", "연령 등급"]
+
+# 검색 결과(hit) 필드 → 후보 키 (앞에서부터 처음 있는 값을 사용)
+HIT_FIELDS = {
+    "name": ["DisplayName", "Name", "name", "title"],
+    "url": ["Url", "url", "ProductUrl"],
+    "image": ["ImageUrl", "Image", "image"],
+    "price": ["Price", "CurrentPrice", "price"],
+    "original": ["Rrp", "Drp", "OriginalPrice", "rrp"],
+}
+
+# 목록 페이지에 들어 있는 InstantSearch 설정
+CONFIG_PATTERNS = {
+    "app_id": r"""(?:appId|applicationId|ALGOLIA_APP_ID)["']?\s*[:=]\s*["']([A-Z0-9]{8,12})["']""",
+    "api_key": r"""(?:apiKey|searchKey|searchOnlyApiKey|ALGOLIA_API_KEY)["']?\s*[:=]\s*["']([0-9a-f]{32})["']""",
+    "index": r"""(?:indexName|ALGOLIA_INDEX)["']?\s*[:=]\s*["']([\w.-]+)["']""",
+}
+
+
+def search_config(session):
+    """Algolia 검색 설정 dict(app_id, api_key, index). 환경 변수가 있으면 우선합니다."""
+    config = {key: os.environ.get(f"GMG_ALGOLIA_{key.upper()}") for key in CONFIG_PATTERNS}
+    if not all(config.values()):
+        res = limiter.get(session, LIST_URL, headers=HEADERS, timeout=30)
+        res.raise_for_status()
+        for key, pattern in CONFIG_PATTERNS.items():
+            found = re.search(pattern, res.text)
+            config[key] = config[key] or (found.group(1) if found else None)
+    missing = [f"GMG_ALGOLIA_{key.upper()}" for key, value in config.items() if not value]
+    if missing:
+        raise RuntimeError(f"목록 페이지에서 검색 설정을 찾지 못했습니다. 환경 변수로 지정하세요: {', '.join(missing)}")
+    return config
+
+
+def fetch_page(session, config, page, hits_per_page=HITS_PER_PAGE):
+    """검색 결과 한 페이지(0부터)의 JSON 응답 문자열을 반환합니다."""
+    with track("gmg.page.fetch"):
+        query = {"query": "", "page": page, "hitsPerPage": hits_per_page}
+        if os.environ.get("GMG_ALGOLIA_FILTERS"):
+            query["filters"] = os.environ["GMG_ALGOLIA_FILTERS"]
+        params = urlencode(query)
+        res = limiter.post(
+            session,
+            SEARCH_URL.format(app_id=config["app_id"].lower(), index=config["index"]),
+            json={"params": params},
+            headers={**HEADERS, "X-Algolia-Application-Id": config["app_id"], "X-Algolia-API-Key": config["api_key"]},
+            timeout=30,
+        )
+        res.raise_for_status()
+        res.encoding = "utf-8"
+        return res.text
+
+
+def _field(hit, name):
+    return next((hit[key] for key in HIT_FIELDS[name] if hit.get(key) not in (None, "")), None)
+
+
+def _amount(value):
+    """가격 필드 값 (숫자 또는 통화별 dict) → 원화 금액"""
+    if isinstance(value, dict):
+        value = value.get(CURRENCY)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_hit(hit):
+    """검색 결과 항목 하나를 병합용 공통 컬럼 dict로 바꿉니다. 상품 URL이 없으면 None."""
+    url = _field(hit, "url")
+    if not url:
+        return None
+    current = _amount(_field(hit, "price"))
+    original = _amount(_field(hit, "original")) or current
+    discount = round((1 - current / original) * 100) if original and current is not None else 0
+
+    return {
+        "게임 이름": _field(hit, "name"),
+        "원가": "정보 없음" if original is None else int(original),
+        "할인가": "정보 없음" if current is None else int(current),
+        "사이트 URL": urljoin(BASE_URL, url),
+        "할인율": f"{max(discount, 0)}%",
+        "유저리뷰수": 0,
+        "플랫폼 이름": "Green Man Gaming",
+        "이미지 URL": _field(hit, "image"),
+        "장르": "정보 없음",
+        "연령 등급": "정보 없음",
+    }
+
+
+def parse_page(text):
+    """페이지 응답 하나를 (행 목록, 전체 페이지 수)로 바꿉니다. (다른 페이지와 독립)"""
+    with track("gmg.page.parse"):
+        payload = json.loads(text)
+        rows = [row for row in map(parse_hit, payload.get("hits") or []) if row]
+        return rows, payload.get("nbPages", 0)
+
+
+def crawl_catalog(workers=8, max_pages=None, archive=None):
+    """
+    첫 페이지로 전체 페이지 수를 확인한 뒤 나머지 페이지를 병렬로 요청해 페이지 순서대로 합칩니다.
+    실제 동시 요청 수는 호스트 limiter가 workers 안에서 조절합니다. (반환: 데이터프레임, 요청 수)
+    """
+    def get(page):
+        text = fetch_page(session, config, page)
+        if archive:
+            archive.put(f"{LIST_URL}?page={page + 1}", text, "greenmangaming", "page", {"page": page})
+        return text
+
+    with requests.Session() as session:
+        config = search_config(session)
+        host = limiter.limiter_for(SEARCH_URL.format(app_id=config["app_id"].lower(), index=config["index"]),
+                                   max_limit=workers)
+        rows, pages = parse_page(get(0))
+        if not rows:
+            raise RuntimeError(f"검색 결과 첫 페이지가 비어 있습니다. 검색 설정을 확인하세요: {config['index']}")
+        pages = min(pages, max_pages) if max_pages else pages
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for done, text in enumerate(executor.map(get, range(1, pages)), start=2):
+                rows += parse_page(text)[0]
+                if done % 10 == 0:
+                    print(f"[진행] {done}/{pages}페이지 {len(rows)}개, {host.describe()}")
+
+    return to_frame(rows), max(pages, 1)
+
+
+def to_frame(rows):
+    return pd.DataFrame(rows, columns=COLUMNS).drop_duplicates(subset="사이트 URL")
+
+
+def fill_from_reference(df, path=reference_file):
+    """기존 병합 데이터에서 게임 이름이 같은 행의 장르/연령 등급을 채웁니다."""
+    if not os.path.exists(path) or df.empty:
+        return df
+    reference = (pd.read_csv(path, usecols=["게임 이름", "장르", "연령 등급"])
+                 .dropna(subset=["장르"]).drop_duplicates("게임 이름").set_index("게임 이름"))
+    for col in ["장르", "연령 등급"]:
+        found = df["게임 이름"].map(reference[col])
+        df[col] = found.where(found.notna(), df[col])
+    return df
+
+
+def extract_archived(archive, records):
+    """보관된 페이지 응답(records)마다 현재 파서로 행을 다시 만듭니다. (page_archive 재추출용)"""
+    rows = []
+    for r in records.itertuples():
+        rows += parse_page(archive.read(r.sha))[0]
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Green Man Gaming 카탈로그 수집 (검색 JSON API)")
+    parser.add_argument("--workers", type=int, default=8, help="최대 동시 요청 수 (실제 값은 응답 상태에 맞춰 조절)")
+    parser.add_argument("--max-pages", type=int, default=None, help="최대 결과 페이지 수 (기본: 끝까지)")
+    parser.add_argument("--reference", default=reference_file, help="장르/연령 등급을 가져올 병합 데이터")
+    parser.add_argument("--output", default=output_file)
+    parser.add_argument("--archive", default=None, help="페이지 응답을 넣을 보관소 디렉터리 (page_archive)")
+    args = parser.parse_args()
+
+    with stage("gmg.pages") as m:
+        archive = PageArchive(args.archive) if args.archive else None
+        df, requests_made = crawl_catalog(args.workers, args.max_pages, archive)
+        m["requests"] = requests_made
+        m["rows_out"] = len(df)
+        m["hosts"] = limiter.stats()
+
+    df = fill_from_reference(df, args.reference)
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    df.to_csv(args.output, index=False, encoding="utf-8-sig")
+    print(f"[완료] {len(df)}개 게임 ({requests_made}회 요청) → {args.output}")
+    write_report("gmg_crawl")
+
+
+if __name__ == "__main__":
+    main()
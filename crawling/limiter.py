@@ -0,0 +1,229 @@
+"""
+호스트별 적응형 동시 요청 제한 (크롤러 공통)
+고정된 max_workers/time.sleep 대신, 스토어(호스트)마다 동시 요청 수를 응답 상태에 맞춰 조절합니다.
+
+- 응답이 빠르고 오류율이 낮으면 동시 요청 수를 조금씩(성공 1회당 1/한도) 늘립니다. (가산 증가)
+- 429/5xx/타임아웃/연결 오류가 나면 한도를 절반으로 줄입니다. (승산 감소, 왕복 시간당 한 번)
+- 연속 실패가 breaker_failures번 쌓이거나 Retry-After를 받으면 차단기를 열어 잠시 요청을 멈추고,
+  대기 후 요청 하나로 상태를 확인해(half-open) 성공하면 다시 엽니다. (실패할 때마다 대기 시간 2배)
+
+    res = limiter.get(session, url, timeout=30)        # requests 요청 (스로틀 응답은 재시도)
+
+    with limiter.limiter_for(url).slot():               # 그 밖의 요청 (Selenium 등)
+        driver.get(url)
+
+스레드 풀은 최대 한도(max_limit) 크기로 만들고 실제 동시 요청 수는 limiter가 정합니다.
+현재 한도/처리량/오류율은 stats()로 확인하며, 크롤러는 진행 로그와 실행 리포트에 함께 남깁니다.
+"""
+import email.utils
+import threading
+import time
+from collections import deque
+from urllib.parse import urlparse
+
+import requests
+
+THROTTLE_STATUS = {429, 500, 502, 503, 504}
+TRANSIENT_ERRORS = (requests.Timeout, requests.ConnectionError, TimeoutError)
+
+_registry_lock = threading.Lock()
+_limiters = {}
+
+
+class AdaptiveLimiter:
+    def __init__(self, host, initial=2, min_limit=1, max_limit=16, latency_target=3.0, error_threshold=0.1,
+                 decrease=0.5, breaker_failures=5, breaker_cooldown=10.0, max_cooldown=300.0, window=30.0):
+        self.host = host
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target    # 이보다 느린 응답이면 한도를 늘리지 않음 (초)
+        self.error_threshold = error_threshold  # 최근 window초 오류율이 이보다 높으면 늘리지 않음
+        self.decrease = decrease
+        self.breaker_failures = breaker_failures
+        self.breaker_cooldown = breaker_cooldown
+        self.max_cooldown = max_cooldown
+        self.window = window
+
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self._cond = threading.Condition()
+        self._events = deque()                  # (완료 시각, 성공 여부)
+        self._failures = 0                      # 연속 실패 수
+        self._cooldown = breaker_cooldown
+        self._open_until = 0.0
+        self._probing = False
+        self._last_cut = 0.0
+        self._started = time.monotonic()
+
+    def _half_open(self):
+        return self._failures >= self.breaker_failures
+
+    def acquire(self):
+        """요청 하나를 보낼 수 있을 때까지 기다립니다. (차단기가 열려 있으면 대기 후 확인 요청 하나만 허용)"""
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if now < self._open_until:
+                    self._cond.wait(self._open_until - now)
+                elif self._half_open():
+                    if not self._probing:
+                        self._probing = True
+                        break
+                    self._cond.wait()
+                elif self.in_flight < int(self.limit):
+                    break
+                else:
+                    self._cond.wait()
+            self.in_flight += 1
+        return time.monotonic()
+
+    def release(self, start, ok, retry_after=None):
+        """
+        요청 결과를 반영합니다. ok=True(성공), False(스로틀/일시 오류), None(그 밖의 오류: 한도 조절 없음).
+        """
+        now = time.monotonic()
+        latency = now - start
+        with self._cond:
+            self.in_flight -= 1
+            self._probing = False
+            if ok is not None:
+                self._events.append((now, ok))
+                while self._events and self._events[0][0] < now - self.window:
+                    self._events.popleft()
+            if ok:
+                self.completed += 1
+                self._failures = 0
+                self._cooldown = self.breaker_cooldown
+                if latency <= self.latency_target and self._error_rate() <= self.error_threshold:
+                    self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            elif ok is False:
+                self.failed += 1
+                self._failures += 1
+                # 같은 혼잡으로 동시에 실패한 요청들이 한도를 여러 번 깎지 않도록 왕복 시간당 한 번만 감소
+                if now - self._last_cut > latency:
+                    self.limit = max(self.min_limit, self.limit * self.decrease)
+                    self._last_cut = now
+                if self._half_open() or retry_after:
+                    self._open_until = now + max(self._cooldown, retry_after or 0)
+                    self._cooldown = min(self._cooldown * 2, self.max_cooldown)
+            self._cond.notify_all()
+
+    def _error_rate(self):
+        if not self._events:
+            return 0.0
+        return sum(1 for _, ok in self._events if not ok) / len(self._events)
+
+    def slot(self, transient=()):
+        """
+        요청 하나를 감싸는 with 블록. TRANSIENT_ERRORS(와 transient로 준 예외)는 스로틀로 집계하고 다시 던집니다.
+        HTTP 응답이면 블록 안에서 status()로 상태 코드를 알려 줍니다.
+        """
+        return _Slot(self, TRANSIENT_ERRORS + tuple(transient))
+
+    def state(self):
+        if time.monotonic() < self._open_until:
+            return "open"
+        return "half-open" if self._half_open() else "closed"
+
+    def stats(self):
+        """현재 한도, 진행 중 요청 수, 최근 처리량(초당 성공 수), 오류율, 차단기 상태"""
+        with self._cond:
+            now = time.monotonic()
+            ok = sum(1 for _, success in self._events if success)
+            span = min(self.window, now - self._started) or 1.0
+            return {
+                "host": self.host,
+                "limit": int(self.limit),
+                "in_flight": self.in_flight,
+                "throughput": round(ok / span, 2),
+                "error_rate": round(self._error_rate(), 3),
+                "state": self.state(),
+                "completed": self.completed,
+                "failed": self.failed,
+            }
+
+    def describe(self):
+        s = self.stats()
+        return (f"{s['host']} 동시 {s['limit']} (진행 {s['in_flight']}), {s['throughput']} req/s, "
+                f"오류 {s['error_rate']:.0%}, 차단기 {s['state']}")
+
+
+class _Slot:
+    def __init__(self, limiter, transient):
+        self.limiter = limiter
+        self.transient = transient
+        self.ok = True
+        self.retry_after = None
+
+    def __enter__(self):
+        self.start = self.limiter.acquire()
+        return self
+
+    def status(self, code, retry_after=None):
+        self.ok = code not in THROTTLE_STATUS
+        self.retry_after = _retry_after_seconds(retry_after) if not self.ok else None
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            ok = self.ok
+        else:
+            ok = False if issubclass(exc_type, self.transient) else None
+        self.limiter.release(self.start, ok, self.retry_after)
+        return False
+
+
+def _retry_after_seconds(value):
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def limiter_for(url, **options):
+    """URL(또는 호스트 이름)의 호스트별 limiter. options는 처음 만들 때만 적용됩니다."""
+    host = urlparse(url).netloc or url
+    with _registry_lock:
+        if host not in _limiters:
+            _limiters[host] = AdaptiveLimiter(host, **options)
+        return _limiters[host]
+
+
+def request(session, method, url, retries=3, **kwargs):
+    """
+    호스트 limiter를 거쳐 요청합니다. 스로틀 응답(429/5xx)이나 일시 오류는 retries번까지 다시 시도하고
+    (다음 요청은 줄어든 한도/차단기 대기를 거침), 마지막 응답을 반환하거나 마지막 예외를 던집니다.
+    """
+    limiter = limiter_for(url)
+    for attempt in range(retries + 1):
+        try:
+            with limiter.slot() as slot:
+                res = session.request(method, url, **kwargs)
+                slot.status(res.status_code, res.headers.get("Retry-After"))
+        except TRANSIENT_ERRORS:
+            if attempt == retries:
+                raise
+            continue
+        if slot.ok or attempt == retries:
+            return res
+
+
+def get(session, url, **kwargs):
+    return request(session, "GET", url, **kwargs)
+
+
+def post(session, url, **kwargs):
+    return request(session, "POST", url, **kwargs)
+
+
+def stats():
+    with _registry_lock:
+        limiters = list(_limiters.values())
+    return [limiter.stats() for limiter in limiters]
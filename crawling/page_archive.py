@@ -0,0 +1,225 @@
+"""
+원본 페이지 보관소와 오프라인 재추출
+크롤러가 받은 HTML/JSON을 내용 해시(sha1) 기준으로 한 번만 압축해 세그먼트 파일에 이어 쓰고,
+어떤 URL을 언제 받았는지는 색인(index.db)에 남깁니다. 선택자가 깨졌거나 컬럼을 추가했을 때
+다시 크롤링하지 않고 보관된 페이지에 현재 파서를 프로세스 풀로 다시 적용해 결과 CSV를 만듭니다.
+
+    data/page_archive/
+        index.db                  pages(url, store, kind, fetched_at, sha, meta), blobs(sha → 세그먼트 위치)
+        segments/<작성자>-0000.seg 레코드마다 독립된 gzip(zstandard가 설치되어 있으면 zstd) 조각
+
+    python -m crawling.steam_crawler --archive data/page_archive            # 크롤링하면서 보관
+    python -m crawling.page_archive --extract steam --workers 0              # 보관된 페이지로 다시 추출
+
+재추출은 저장소별로 URL마다 가장 최근에 받은 페이지를 사용합니다. 보관된 페이지가 없거나 추출된 행이 없으면
+크롤러 결과 파일을 빈 파일로 덮어쓰지 않고 멈춥니다.
+"""
+import argparse
+import functools
+import gzip
+import hashlib
+import importlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing
+
+import pandas as pd
+
+from filter.parallel import run_chunked
+from profiling import stage, write_report
+
+try:
+    import zstandard  # 선택: 설치되어 있으면 zstd로 압축
+except ImportError:
+    zstandard = None
+
+archive_dir = "data/page_archive"
+
+SEGMENT_BYTES = 64 * 2**20   # 세그먼트 파일 하나의 최대 크기
+
+# 저장소 → (extract_archived/output_file이 있는 크롤러 모듈, 재추출 대상 페이지 종류)
+EXTRACTORS = {
+    "steam": ("crawling.steam_crawler", "detail"),
+    "directg": ("crawling.directg_webscraping", "list"),
+    "epicgames": ("crawling.epicgames_api", "page"),
+    "greenmangaming": ("crawling.greenmangaming_crawler", "page"),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    sha         TEXT PRIMARY KEY,
+    segment     TEXT NOT NULL,
+    offset      INTEGER NOT NULL,
+    length      INTEGER NOT NULL,
+    size        INTEGER NOT NULL,
+    codec       TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    url         TEXT NOT NULL,
+    store       TEXT NOT NULL,
+    kind        TEXT NOT NULL,
+    fetched_at  REAL NOT NULL,
+    sha         TEXT NOT NULL,
+    meta        TEXT
+);
+CREATE INDEX IF NOT EXISTS pages_lookup ON pages (store, kind, url, fetched_at);
+"""
+
+
+def _compress(data):
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=10).compress(data), "zst"
+    return gzip.compress(data, compresslevel=6), "gz"
+
+
+def _decompress(data, codec):
+    if codec == "zst":
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class PageArchive:
+    """
+    스레드 여러 개가 같은 객체로 put()해도 되고, 프로세스마다 자기 세그먼트 파일에 쓰므로
+    여러 작업자 프로세스가 같은 보관소를 함께 써도 됩니다.
+    """
+
+    def __init__(self, directory=archive_dir):
+        self.directory = directory
+        self.segment_dir = os.path.join(directory, "segments")
+        self.index_path = os.path.join(directory, "index.db")
+        os.makedirs(self.segment_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._writer = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._segment_no = 0
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.index_path, timeout=60)
+        conn.execute("PRAGMA busy_timeout=60000")
+        return conn
+
+    def _segment_path(self):
+        name = f"{self._writer}-{self._segment_no:04d}.seg"
+        path = os.path.join(self.segment_dir, name)
+        if os.path.exists(path) and os.path.getsize(path) >= SEGMENT_BYTES:
+            self._segment_no += 1
+            return self._segment_path()
+        return path
+
+    def put(self, url, content, store, kind, meta=None):
+        """페이지 하나를 보관하고 내용 해시를 반환합니다. 같은 내용은 한 번만 저장됩니다."""
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        sha = hashlib.sha1(data).hexdigest()
+        meta = json.dumps(meta, ensure_ascii=False) if meta else None
+        with self._lock, closing(self._connect()) as conn:
+            with conn:
+                if conn.execute("SELECT 1 FROM blobs WHERE sha = ?", (sha,)).fetchone() is None:
+                    blob, codec = _compress(data)
+                    path = self._segment_path()
+                    with open(path, "ab") as f:
+                        offset = f.tell()
+                        f.write(blob)
+                    conn.execute(
+                        "INSERT OR IGNORE INTO blobs (sha, segment, offset, length, size, codec) VALUES (?, ?, ?, ?, ?, ?)",
+                        (sha, os.path.basename(path), offset, len(blob), len(data), codec),
+                    )
+                conn.execute(
+                    "INSERT INTO pages (url, store, kind, fetched_at, sha, meta) VALUES (?, ?, ?, ?, ?, ?)",
+                    (url, store, kind, time.time(), sha, meta),
+                )
+        return sha
+
+    def read(self, sha):
+        """내용 해시로 원본 페이지 문자열을 읽습니다."""
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT segment, offset, length, codec FROM blobs WHERE sha = ?", (sha,)).fetchone()
+        if row is None:
+            raise KeyError(sha)
+        segment, offset, length, codec = row
+        with open(os.path.join(self.segment_dir, segment), "rb") as f:
+            f.seek(offset)
+            return _decompress(f.read(length), codec).decode("utf-8")
+
+    def latest(self, store, kind):
+        """저장소·종류별로 URL마다 가장 최근에 받은 페이지 목록 (url, sha, meta, fetched_at)"""
+        query = (
+            "SELECT url, sha, meta, MAX(fetched_at) AS fetched_at FROM pages "
+            "WHERE store = ? AND kind = ? GROUP BY url ORDER BY fetched_at"
+        )
+        with closing(self._connect()) as conn:
+            records = pd.read_sql_query(query, conn, params=(store, kind))
+        records["meta"] = [json.loads(m) if m else {} for m in records["meta"]]
+        return records
+
+    def latest_content(self, url, store, kind):
+        """URL의 가장 최근 페이지 문자열 (없으면 None)"""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT sha FROM pages WHERE store = ? AND kind = ? AND url = ? ORDER BY fetched_at DESC LIMIT 1",
+                (store, kind, url),
+            ).fetchone()
+        return self.read(row[0]) if row else None
+
+    def stats(self):
+        """보관된 페이지 수, 고유 내용 수, 원본/압축 크기(MB)"""
+        with closing(self._connect()) as conn:
+            pages = conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            blobs, size, stored = conn.execute("SELECT COUNT(*), SUM(size), SUM(length) FROM blobs").fetchone()
+        return {"pages": pages, "blobs": blobs,
+                "raw_mb": round((size or 0) / 2**20, 1), "stored_mb": round((stored or 0) / 2**20, 1)}
+
+
+def _extract_chunk(store, directory, records):
+    """프로세스 풀에서 실행: 크롤러 모듈의 extract_archived(archive, records)로 행을 다시 만듭니다."""
+    module = importlib.import_module(EXTRACTORS[store][0])
+    return pd.DataFrame(module.extract_archived(PageArchive(directory), records))
+
+
+def extract(store, directory=archive_dir, workers=None, chunk_size=200):
+    """
+    보관된 페이지 전체에 현재 파서를 다시 적용한 결과 데이터프레임을 반환합니다.
+    크롤러 모듈에 to_frame(rows)가 있으면 크롤링 결과와 같은 컬럼/중복 제거를 적용합니다.
+    """
+    module_name, kind = EXTRACTORS[store]
+    records = PageArchive(directory).latest(store, kind)
+    if records.empty:
+        return pd.DataFrame(), 0
+    func = functools.partial(_extract_chunk, store, directory)
+    df = run_chunked([records], func, workers=workers, chunk_size=chunk_size)
+    module = importlib.import_module(module_name)
+    if hasattr(module, "to_frame"):
+        df = module.to_frame(df.to_dict("records"))
+    return df, len(records)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="보관된 원본 페이지로 크롤링 결과 다시 추출 (네트워크 없음)")
+    parser.add_argument("--extract", required=True, choices=list(EXTRACTORS), help="저장소")
+    parser.add_argument("--archive", default=archive_dir)
+    parser.add_argument("--workers", type=int, default=1, help="프로세스 수 (0이면 CPU 코어 수)")
+    parser.add_argument("--chunk-size", type=int, default=200, help="프로세스 하나가 한 번에 처리할 페이지 수")
+    parser.add_argument("--output", default=None, help="결과 CSV (기본: 해당 크롤러의 출력 파일)")
+    args = parser.parse_args()
+
+    with stage(f"archive.extract.{args.extract}") as m:
+        df, pages = extract(args.extract, args.archive, args.workers or None, args.chunk_size)
+        m["rows_in"] = pages
+        m["rows_out"] = len(df)
+
+    if df.empty:
+        raise SystemExit(f"[중단] 보관된 {args.extract} 페이지 {pages}개에서 추출된 행이 없어 결과 파일을 쓰지 않습니다.")
+    output = args.output or importlib.import_module(EXTRACTORS[args.extract][0]).output_file
+    df.to_csv(output, index=False, encoding="utf-8-sig")
+    print(f"[완료] 보관된 페이지 {pages}개 → {len(df)}행 → {output} ({PageArchive(args.archive).stats()})")
+    write_report("archive_extract")
+
+
+if __name__ == "__main__":
+    main()
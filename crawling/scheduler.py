@@ -0,0 +1,203 @@
+"""
+가격 변동성 기반 재방문 스케줄러
+모든 상세 페이지를 매번 똑같이 다시 방문하는 대신, URL마다 '지난 방문 이후 가격이 바뀌었을 확률'을 추정해
+요청 예산(--budget) 안에서 확률이 높은 순서로 방문 계획(data/crawl_plan.csv)을 만듭니다.
+
+- 변경률(일 단위): 가격 이력(data/combined_sales_data.csv)의 가격 변화 횟수와 지난 크롤링에서 관측한 변화
+  횟수를 관측 일수로 나눈 값. 이력이 적은 게임은 전체 평균 쪽으로 당깁니다. (PRIOR_DAYS일 분량의 사전값)
+- 시즌 가중치: 이번 달에 가격이 바뀐 비율. 게임별 월별 변화 비율을 전체 월별 비율(스토어 세일 달력) 쪽으로 당겨 씁니다.
+- 우선순위: 1 - exp(-변경률 × 시즌 가중치 × 마지막 방문 후 경과 일수). 한 번도 방문하지 않은 URL은 1.
+
+크롤러는 --plan을 주면 검색 결과에 새로 나타난 URL(방문 기록과 게임 목록에 없음)을 먼저, 남은 예산만큼 계획된 URL을
+방문합니다. (admit_links) 방문하고 나면 apply_crawl()이 방문 기록(data/crawl_state.csv)을 갱신하고,
+방문하지 않은 URL은 직전 결과를 그대로 이어 씁니다.
+
+    python -m crawling.scheduler --budget 800
+    python -m crawling.steam_crawler --plan data/crawl_plan.csv
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from filter.recommend import KEY_COLUMN, catalog_file, clean_game_names, sales_file
+from filter.stores import STORES, classify_store
+from profiling import stage, write_report
+
+state_file = "data/crawl_state.csv"
+plan_file = "data/crawl_plan.csv"
+
+PRIOR_DAYS = 90          # 이력이 없는 URL에 주는 전체 평균 변경률의 관측 일수
+SEASON_PSEUDOCOUNT = 12  # 게임별 월별 비율을 전체 월별 비율로 당기는 강도 (가상의 변화 횟수)
+SALES_COLUMNS = ["게임 이름", "플랫폼 이름", "할인 시작일", "할인가"]
+STATE_COLUMNS = ["사이트 URL", "first_crawled", "last_crawled", "last_changed", "visits", "changes"]
+PRICE_COLUMNS = ["원가", "할인가"]
+
+
+def price_changes(sales):
+    """가격 이력에서 (게임 키, 플랫폼)별로 가격이 바뀐 기록만 골라 반환합니다."""
+    history = pd.DataFrame({
+        KEY_COLUMN: sales["게임 이름"].astype(str),
+        "플랫폼 이름": sales["플랫폼 이름"],
+        "date": pd.to_datetime(sales["할인 시작일"], errors="coerce"),
+        "price": pd.to_numeric(sales["할인가"], errors="coerce"),
+    }).dropna().sort_values([KEY_COLUMN, "플랫폼 이름", "date"], ignore_index=True)
+
+    same_series = history[[KEY_COLUMN, "플랫폼 이름"]].eq(history[[KEY_COLUMN, "플랫폼 이름"]].shift()).all(axis=1)
+    changed = same_series & history["price"].ne(history["price"].shift())
+    span = history.groupby([KEY_COLUMN, "플랫폼 이름"])["date"].agg(["min", "max"])
+    return history[changed], span
+
+
+def history_rates(sales, month):
+    """
+    (게임 키, 플랫폼)별 가격 이력 변화 횟수, 관측 일수, 이번 달 시즌 가중치를 계산합니다.
+    반환: (게임별 표, 전체 평균 변경률, 전체 기준 이번 달 시즌 가중치)
+    sales가 None이면(가격 이력 없음) 방문 기록만으로 추정합니다.
+    """
+    changes, span = price_changes(pd.DataFrame(columns=SALES_COLUMNS) if sales is None else sales)
+    stats = pd.DataFrame({
+        "hist_changes": changes.groupby([KEY_COLUMN, "플랫폼 이름"]).size(),
+        "hist_days": (span["max"] - span["min"]).dt.days,
+    }).fillna({"hist_changes": 0})
+    global_rate = stats["hist_changes"].sum() / max(stats["hist_days"].sum(), 1)
+
+    # 월별 변화 비율: 전체(세일 달력) → 게임별로 당겨서 추정
+    months = changes["date"].dt.month
+    global_share = months.value_counts(normalize=True).reindex(range(1, 13), fill_value=0)
+    if not global_share.any():
+        global_share[:] = 1 / 12  # 변화 기록이 없으면 달마다 같은 비율
+    in_month = changes[months == month].groupby([KEY_COLUMN, "플랫폼 이름"]).size()
+    stats["hist_month"] = in_month.reindex(stats.index, fill_value=0)
+    share = (stats["hist_month"] + SEASON_PSEUDOCOUNT * global_share[month]) / (stats["hist_changes"] + SEASON_PSEUDOCOUNT)
+    stats["seasonal"] = share * 12
+    return stats, global_rate, global_share[month] * 12
+
+
+def load_state(path=state_file):
+    """URL별 방문 기록 (첫/마지막 방문일, 마지막 변경 관측일, 방문/변경 횟수)"""
+    state = pd.read_csv(path) if os.path.exists(path) else pd.DataFrame(columns=STATE_COLUMNS)
+    for col in ["first_crawled", "last_crawled", "last_changed"]:
+        state[col] = pd.to_datetime(state[col])
+    state[["visits", "changes"]] = state[["visits", "changes"]].astype(float)
+    return state
+
+
+def priorities(catalog, sales, state, today):
+    """게임 목록의 URL마다 변경률, 시즌 가중치, 경과 일수, 우선순위를 계산합니다. (우선순위 내림차순)"""
+    today = pd.Timestamp(today)
+    stats, global_rate, global_seasonal = history_rates(sales, today.month)
+
+    urls = catalog[["사이트 URL", "게임 이름", "플랫폼 이름"]].dropna(subset=["사이트 URL"])
+    urls = urls.drop_duplicates("사이트 URL").reset_index(drop=True)
+    urls[KEY_COLUMN] = clean_game_names(urls["게임 이름"])
+    plan = urls.join(stats, on=[KEY_COLUMN, "플랫폼 이름"])
+    plan = plan.merge(state, on="사이트 URL", how="left")
+
+    observed_days = (plan["last_crawled"] - plan["first_crawled"]).dt.days.fillna(0)
+    changes = plan["hist_changes"].fillna(0) + plan["changes"].fillna(0)
+    days = plan["hist_days"].fillna(0) + observed_days
+    plan["rate"] = (changes + global_rate * PRIOR_DAYS) / (days + PRIOR_DAYS)
+    plan["seasonal"] = plan["seasonal"].fillna(global_seasonal)
+    plan["elapsed_days"] = (today - plan["last_crawled"]).dt.days
+
+    expected = plan["rate"] * plan["seasonal"] * plan["elapsed_days"].clip(lower=0)
+    plan["priority"] = (1 - np.exp(-expected)).fillna(1.0)  # 방문 기록 없음 → 1
+    columns = ["사이트 URL", "게임 이름", "플랫폼 이름", "rate", "seasonal", "elapsed_days", "priority"]
+    return plan.sort_values(["priority", "rate"], ascending=False, ignore_index=True)[columns]
+
+
+def make_plan(catalog, sales, state, today, budget, stores=None):
+    """
+    우선순위 상위 budget개 URL. stores(판매 사이트 키)를 주면 해당 사이트 URL만 고릅니다.
+    ('플랫폼 이름'은 게임의 플랫폼이라 다이렉트 게임즈의 Steam 키 게임도 'Steam'이므로 URL로 거릅니다.)
+    """
+    plan = priorities(catalog, sales, state, today)
+    if stores:
+        plan = plan[classify_store(plan["사이트 URL"]).isin(stores).to_numpy()]
+    return plan.head(budget).reset_index(drop=True)
+
+
+def planned_urls(path=plan_file):
+    """계획된 URL 목록 (우선순위 순서)"""
+    return pd.read_csv(path)["사이트 URL"].tolist()
+
+
+def known_urls(state_path=state_file, catalog_path=catalog_file):
+    """방문 기록이나 게임 목록에 이미 있는 URL 집합 (계획이 다룰 수 있는 URL)"""
+    urls = set(load_state(state_path)["사이트 URL"])
+    if os.path.exists(catalog_path):
+        urls |= set(pd.read_csv(catalog_path, usecols=["사이트 URL"])["사이트 URL"].dropna())
+    return urls
+
+
+def admit_links(links, plan, known):
+    """
+    검색 결과 링크(제목, 링크, 이미지) 중 이번에 방문할 것을 고릅니다.
+    계획은 게임 목록에 있는 URL만 다루므로, 검색 결과에 새로 나타난 URL(known에 없음)을 우선순위 1로 먼저 넣고
+    예산(계획된 URL 수)의 남은 자리를 계획 순서대로 채웁니다.
+    """
+    by_url = {link: (title, link, img) for title, link, img in links}
+    fresh = [url for url in by_url if url not in known]
+    planned = [url for url in plan if url in by_url]
+    return [by_url[url] for url in (fresh + planned)[:len(plan)]]
+
+
+def apply_crawl(previous, crawled, today, path=state_file):
+    """
+    계획대로 방문한 결과(crawled)를 직전 결과(previous)와 비교해 방문 기록을 갱신·저장하고,
+    방문한 URL은 새 행으로, 나머지는 직전 행으로 채운 전체 결과를 반환합니다.
+    """
+    today = pd.Timestamp(today).normalize()
+    state = load_state(path).set_index("사이트 URL")
+
+    old = previous.drop_duplicates("사이트 URL").set_index("사이트 URL")[PRICE_COLUMNS].astype(str)
+    new = crawled.drop_duplicates("사이트 URL").set_index("사이트 URL")[PRICE_COLUMNS].astype(str)
+    seen_before = new.index.isin(old.index)
+    changed = pd.Series(seen_before, index=new.index)
+    changed[seen_before] = old.loc[new.index[seen_before]].ne(new[seen_before]).any(axis=1).to_numpy()
+
+    visited = state.reindex(state.index.union(new.index))
+    visited.loc[new.index, "first_crawled"] = visited.loc[new.index, "first_crawled"].fillna(today)
+    visited.loc[new.index, "last_crawled"] = today
+    visited.loc[new.index, "visits"] = visited.loc[new.index, "visits"].fillna(0) + 1
+    visited.loc[new.index, "changes"] = visited.loc[new.index, "changes"].fillna(0) + changed.astype(int)
+    visited.loc[changed[changed].index, "last_changed"] = today
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    visited = visited.astype({"visits": int, "changes": int}).rename_axis("사이트 URL").reset_index()
+    visited[STATE_COLUMNS].to_csv(path, index=False, encoding="utf-8-sig")
+
+    kept = previous[~previous["사이트 URL"].isin(new.index)]
+    return pd.concat([kept, crawled], ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가격 변동성 기반 크롤링 방문 계획")
+    parser.add_argument("--budget", type=int, default=1000, help="이번 실행의 상세 페이지 요청 수")
+    parser.add_argument("--stores", nargs="*", default=["steam"], choices=list(STORES),
+                        help="계획에 넣을 판매 사이트 (기본: --plan을 지원하는 steam)")
+    parser.add_argument("--today", default=None, help="기준일 (기본: 오늘)")
+    parser.add_argument("--catalog", default=catalog_file)
+    parser.add_argument("--sales", default=sales_file)
+    parser.add_argument("--state", default=state_file)
+    parser.add_argument("--output", default=plan_file)
+    args = parser.parse_args()
+
+    today = pd.Timestamp(args.today or pd.Timestamp.now()).normalize()
+    with stage("scheduler.plan") as m:
+        catalog = pd.read_csv(args.catalog)
+        sales = pd.read_csv(args.sales) if os.path.exists(args.sales) else None
+        plan = make_plan(catalog, sales, load_state(args.state), today, args.budget, args.stores)
+        m["rows_in"] = catalog["사이트 URL"].nunique()
+        m["rows_out"] = len(plan)
+
+    plan.to_csv(args.output, index=False, encoding="utf-8-sig")
+    expected = plan["priority"].sum()
+    print(f"[완료] {m['rows_in']}개 중 {len(plan)}개 URL 계획 (예상 변경 {expected:.0f}건) → {args.output}")
+    write_report("scheduler")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,24 @@
-import time
+import argparse
 import re
 import os
 import pandas as pd
 import requests
 from bs4 import BeautifulSoup
 from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.chrome.options import Options
+import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from crawling import limiter, scheduler
+from crawling.page_archive import PageArchive
+from crawling.work_queue import WorkQueue, queue_file, work
+from profiling import stage, track, write_report
+
+output_file = "data/steam_detailed_data.csv"
+STORE_HOST = "store.steampowered.com"
+MAX_DETAIL_WORKERS = 8  # 동시에 띄울 수 있는 최대 크롬 수 (실제 동시 요청 수는 limiter가 조절)
+
 # 크롬 드라이버 셋업
 def setup_selenium():
     options = Options()
@@ -17,121 +28,240 @@ def setup_selenium():
     options.add_argument("--window-size=1920,1080")
     return webdriver.Chrome(options=options)
 
-# 상세 페이지에서 정보 크롤링
-def get_game_detail(driver, url):
+# 상세 페이지에서 정보 크롤링 (실패하면 예외). archive를 주면 받은 HTML을 보관
+def fetch_game_detail(driver, url, archive=None, meta=None):
+    with track("steam.detail.fetch"):
+        with limiter.limiter_for(url).slot(transient=(TimeoutException,)):
+            driver.get(url)
+        html = driver.page_source
+    if archive is not None:
+        archive.put(url, html, "steam", "detail", meta)
+    with track("steam.detail.parse"):
+        return parse_game_detail(html)
+
+# 상세 페이지에서 정보 크롤링 (실패하면 '정보 없음')
+def get_game_detail(driver, url, archive=None, meta=None):
     try:
-        driver.get(url)
-        time.sleep(1.5)
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-
-        # 가격: 본편만
-        price_section = None
-        for section in soup.select(".game_area_purchase_game"):
-            if section.select_one(".btn_addtocart"):
-                price_section = section
-                break
-
-        if price_section:
-            price_tags = price_section.select(".discount_original_price, .discount_final_price, .game_purchase_price")
-            prices = [p.text.strip() for p in price_tags if p.text.strip()]
-        else:
-            prices = []
-
-        # 가격 판별
-        if price_section and "Free To Play" in price_section.text:
-            origin_price = sale_price = "Free"
-        elif not prices:
-            origin_price = sale_price = "정보 없음"
-        elif len(prices) == 1:
-            origin_price = sale_price = prices[0]
-        else:
-            origin_price, sale_price = prices[0], prices[-1]
-
-        # 할인율 계산
-        if "₩" in origin_price and "₩" in sale_price and origin_price != sale_price:
-            try:
-                op = int(origin_price.replace("₩", "").replace(",", ""))
-                sp = int(sale_price.replace("₩", "").replace(",", ""))
-                discount = f"{int((1 - sp / op) * 100)}%"
-            except:
-                discount = "정보 없음"
-        elif origin_price == sale_price:
-            discount = "0%"
-        else:
+        return fetch_game_detail(driver, url, archive, meta)
+    except Exception as e:
+        print(f"[ERROR] {url}: {e}")
+        return ("정보 없음",) * 6
+
+# 상세 페이지 HTML 파싱
+def parse_game_detail(html):
+    soup = BeautifulSoup(html, "html.parser")
+
+    # 가격: 본편만
+    price_section = None
+    for section in soup.select(".game_area_purchase_game"):
+        if section.select_one(".btn_addtocart"):
+            price_section = section
+            break
+
+    if price_section:
+        price_tags = price_section.select(".discount_original_price, .discount_final_price, .game_purchase_price")
+        prices = [p.text.strip() for p in price_tags if p.text.strip()]
+    else:
+        prices = []
+
+    # 가격 판별
+    if price_section and "Free To Play" in price_section.text:
+        origin_price = sale_price = "Free"
+    elif not prices:
+        origin_price = sale_price = "정보 없음"
+    elif len(prices) == 1:
+        origin_price = sale_price = prices[0]
+    else:
+        origin_price, sale_price = prices[0], prices[-1]
+
+    # 할인율 계산
+    if "₩" in origin_price and "₩" in sale_price and origin_price != sale_price:
+        try:
+            op = int(origin_price.replace("₩", "").replace(",", ""))
+            sp = int(sale_price.replace("₩", "").replace(",", ""))
+            discount = f"{int((1 - sp / op) * 100)}%"
+        except:
             discount = "정보 없음"
+    elif origin_price == sale_price:
+        discount = "0%"
+    else:
+        discount = "정보 없음"
 
-        # 리뷰 수
-        review_tag = soup.select_one(".user_reviews_summary_row .responsive_hidden")
-        review_count = re.findall(r"[\d,]+", review_tag.text)[-1].replace(",", "") if review_tag else "정보 없음"
+    # 리뷰 수
+    review_tag = soup.select_one(".user_reviews_summary_row .responsive_hidden")
+    review_count = re.findall(r"[\d,]+", review_tag.text)[-1].replace(",", "") if review_tag else "정보 없음"
 
-        # 연령 등급 (이미지 alt)
-        age_img = soup.select_one(".shared_game_rating img")
-        age = age_img["alt"].strip() if age_img and "alt" in age_img.attrs else "정보 없음"
+    # 연령 등급 (이미지 alt)
+    age_img = soup.select_one(".shared_game_rating img")
+    age = age_img["alt"].strip() if age_img and "alt" in age_img.attrs else "정보 없음"
 
-        # 장르
-        genre_tags = soup.select(".details_block a[href*='genre']")
-        genre = ", ".join([g.text.strip() for g in genre_tags]) if genre_tags else "정보 없음"
+    # 장르
+    genre_tags = soup.select(".details_block a[href*='genre']")
+    genre = ", ".join([g.text.strip() for g in genre_tags]) if genre_tags else "정보 없음"
 
-        return origin_price, sale_price, discount, review_count, age, genre
+    return origin_price, sale_price, discount, review_count, age, genre
 
-    except Exception as e:
-        print(f"[ERROR] {url}: {e}")
-        return ("정보 없음",) * 6
+# 결과 행
+def game_row(title, link, img_url, detail):
+    origin, sale, discount, review, age, genre = detail
+    return {
+        "게임 이름": title,
+        "원가": origin,
+        "할인가": sale,
+        "사이트 URL": link,
+        "할인율": discount,
+        "유저리뷰수": review,
+        "플랫폼 이름": "Steam",
+        "이미지 URL": img_url,
+        "장르": genre,
+        "연령 등급": age
+    }
 
 # 드라이버 단일 작업
-def get_game_data(title, link, img_url):
+def get_game_data(title, link, img_url, archive=None):
     driver = setup_selenium()
     try:
-        origin, sale, discount, review, age, genre = get_game_detail(driver, link)
-        return {
-            "게임 이름": title,
-            "원가": origin,
-            "할인가": sale,
-            "사이트 URL": link,
-            "할인율": discount,
-            "유저리뷰수": review,
-            "플랫폼 이름": "Steam",
-            "이미지 URL": img_url,
-            "장르": genre,
-            "연령 등급": age
-        }
+        detail = get_game_detail(driver, link, archive, {"title": title, "img": img_url})
+        return game_row(title, link, img_url, detail)
     finally:
         driver.quit()
 
-# 전체 페이지 수집
-def crawl_all_pages(max_page=50):
+# 검색 결과에서 (제목, 링크, 이미지) 수집
+def search_game_links(max_page=50):
     base_url = "https://store.steampowered.com/search/?filter=globaltopsellers&page={}"
     headers = {"User-Agent": "Mozilla/5.0"}
     game_links = []
+    limiter.limiter_for(STORE_HOST, max_limit=MAX_DETAIL_WORKERS)
+    session = requests.Session()
 
-    for page in range(1, max_page + 1):
-        res = requests.get(base_url.format(page), headers=headers)
-        soup = BeautifulSoup(res.text, "html.parser")
-        games = soup.select("a.search_result_row")
+    with stage("steam.search_pages") as m:
+        for page in range(1, max_page + 1):
+            with track("steam.search.fetch"):
+                res = limiter.get(session, base_url.format(page), headers=headers, timeout=30)
+            with track("steam.search.parse"):
+                soup = BeautifulSoup(res.text, "html.parser")
+                games = soup.select("a.search_result_row")
 
-        for game in games:
-            title = game.select_one(".title").text.strip()
-            link = game["href"].split("?")[0]
-            if "bundle" in link or "sub" in link or "soundtrack" in title.lower():
-                continue
-            img = game.select_one("img")["src"]
-            game_links.append((title, link, img))
+                for game in games:
+                    title = game.select_one(".title").text.strip()
+                    link = game["href"].split("?")[0]
+                    if "bundle" in link or "sub" in link or "soundtrack" in title.lower():
+                        continue
+                    img = game.select_one("img")["src"]
+                    game_links.append((title, link, img))
+        m["requests"] = max_page
+        m["rows_out"] = len(game_links)
+    return game_links
 
+# 전체 페이지 수집
+def crawl_all_pages(max_page=50, plan=None, archive=None):
+    """
+    검색 결과에서 게임 링크를 모은 뒤 상세 페이지를 수집합니다. plan(우선순위 순 URL 목록)을 주면
+    새로 나타난 URL과 계획된 URL만 예산 안에서 방문하고(scheduler.admit_links),
+    archive(PageArchive)를 주면 상세 페이지 HTML을 보관합니다.
+    """
+    game_links = search_game_links(max_page)
+    host = limiter.limiter_for(STORE_HOST)
+
+    if plan is not None:
+        print(f"[INFO] 방문 계획에 따라 {len(game_links)}개 중 일부만 방문합니다.")
+        game_links = scheduler.admit_links(game_links, plan, scheduler.known_urls())
     print(f"[INFO] 총 {len(game_links)}개 게임 크롤링 시작...")
 
     all_data = []
-    with ThreadPoolExecutor(max_workers=5) as executor:  # 병렬성 조정
-        futures = [executor.submit(get_game_data, t, l, i) for t, l, i in game_links]
-        for future in as_completed(futures):
-            result = future.result()
-            if result:
-                all_data.append(result)
+    with stage("steam.detail_pages", rows_in=len(game_links)) as m:
+        with ThreadPoolExecutor(max_workers=MAX_DETAIL_WORKERS) as executor:
+            futures = [executor.submit(get_game_data, t, l, i, archive) for t, l, i in game_links]
+            for done, future in enumerate(as_completed(futures), start=1):
+                result = future.result()
+                if result:
+                    all_data.append(result)
+                if done % 50 == 0:
+                    print(f"[INFO] {done}/{len(game_links)} 완료, {host.describe()}")
+        m["requests"] = len(game_links)
+        m["rows_out"] = len(all_data)
+        m["hosts"] = limiter.stats()
 
     return pd.DataFrame(all_data)
 
+# 작업 큐에 상세 페이지 등록 (URL 기준 중복 제거)
+def enqueue_game_links(queue, game_links, refresh=False):
+    return queue.enqueue(((l, {"title": t, "img": i}) for t, l, i in game_links), refresh=refresh)
+
+# 보관된 상세 페이지로 결과 행 다시 만들기 (crawling.page_archive에서 호출)
+def extract_archived(archive, records):
+    return [
+        game_row(r.meta.get("title"), r.url, r.meta.get("img"), parse_game_detail(archive.read(r.sha)))
+        for r in records.itertuples()
+    ]
+
+# 작업 큐 작업자: 스레드마다 크롬 하나를 띄워 큐가 빌 때까지 상세 페이지 처리
+def run_worker(queue, threads=4, archive=None):
+    local = threading.local()
+
+    def start():
+        local.driver = setup_selenium()
+
+    def stop():
+        local.driver.quit()
+
+    def handle(task):
+        detail = fetch_game_detail(local.driver, task.url, archive, task.payload)
+        return game_row(task.payload["title"], task.url, task.payload["img"], detail)
+
+    limiter.limiter_for(STORE_HOST, max_limit=threads)
+    with stage("steam.queue_worker") as m:
+        done, failed = work(queue, handle, threads=threads, on_start=start, on_stop=stop)
+        m["requests"] = done + failed
+        m["rows_out"] = done
+        m["hosts"] = limiter.stats()
+    return done, failed
+
 # 실행
-if __name__ == "__main__":
+def main():
+    parser = argparse.ArgumentParser(description="Steam 글로벌 최고 판매 게임 크롤링")
+    parser.add_argument("--max-page", type=int, default=70, help="검색 결과 페이지 수")
+    parser.add_argument("--plan", default=None, help="방문 계획 CSV (crawling.scheduler). 주면 계획된 URL만 방문")
+    parser.add_argument("--output", default=output_file)
+    parser.add_argument("--queue", default=None, help=f"작업 큐 DB (예: {queue_file}). 주면 아래 단계 중 하나만 실행")
+    parser.add_argument("--enqueue", action="store_true", help="검색 결과의 상세 페이지를 큐에 등록")
+    parser.add_argument("--work", action="store_true", help="큐가 빌 때까지 상세 페이지 처리 (프로세스/머신마다 실행)")
+    parser.add_argument("--export", action="store_true", help="큐에 쌓인 결과를 --output으로 저장")
+    parser.add_argument("--threads", type=int, default=4, help="작업자 프로세스 하나의 스레드(크롬) 수")
+    parser.add_argument("--archive", default=None, help="상세 페이지 HTML 보관소 디렉터리 (예: data/page_archive)")
+    args = parser.parse_args()
+
     os.makedirs("data", exist_ok=True)
-    df = crawl_all_pages(max_page=70)  # 페이지 수 조절
-    df.to_csv("data/steam_detailed_data.csv", index=False, encoding="utf-8-sig")
+    plan = scheduler.planned_urls(args.plan) if args.plan else None
+    archive = PageArchive(args.archive) if args.archive else None
+
+    if args.queue:
+        queue = WorkQueue(args.queue)
+        if args.enqueue:
+            links = search_game_links(args.max_page)
+            if plan is not None:
+                links = scheduler.admit_links(links, plan, scheduler.known_urls())
+            print(f"[완료] {enqueue_game_links(queue, links, refresh=True)}개 새 작업 등록, 상태: {queue.counts()}")
+        if args.work:
+            done, failed = run_worker(queue, args.threads, archive)
+            print(f"[완료] 작업자 종료: 완료 {done}, 실패 {failed}, 상태: {queue.counts()}")
+        if args.export:
+            df = queue.export()
+            if plan is not None and os.path.exists(args.output):
+                df = scheduler.apply_crawl(pd.read_csv(args.output), df, pd.Timestamp.now())
+            df.to_csv(args.output, index=False, encoding="utf-8-sig")
+            print(f"[완료] {len(df)}개 결과 → {args.output}")
+        write_report("steam_queue")
+        return
+
+    df = crawl_all_pages(max_page=args.max_page, plan=plan, archive=archive)
+    if plan is not None and os.path.exists(args.output):
+        # 방문 기록을 갱신하고, 이번에 방문하지 않은 게임은 직전 결과를 이어 씀
+        df = scheduler.apply_crawl(pd.read_csv(args.output), df, pd.Timestamp.now())
+    df.to_csv(args.output, index=False, encoding="utf-8-sig")
     print("[완료] CSV 저장 완료!")
+    write_report("steam_crawl")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+크롤링 작업 큐 (로컬 SQLite)
+한 프로세스의 futures 목록 대신 디스크의 작업 큐에 URL을 넣어 두고, 여러 작업자 프로세스가 나눠 가져가 처리합니다.
+프로세스가 죽어도 작업은 남고, 처리 중이던 작업은 임대 시간이 지나면 다른 작업자가 다시 가져갑니다.
+
+- 중복 제거: URL이 기본 키라서 같은 URL은 한 번만 들어갑니다. (refresh=True면 새 라운드: 이전 결과를 모두 지우고 넣은 URL 중 끝난 작업을 다시 대기로)
+- 임대(lease): 작업자가 가져간 작업은 visibility초 동안 다른 작업자에게 보이지 않고, 그 안에 완료/실패를 알려야 합니다.
+- 재시도: 실패하거나 임대가 만료된 작업은 attempts가 max_attempts에 이를 때까지 지수 대기 후 다시 대기열로 갑니다.
+- 결과: 완료할 때 함께 넘긴 행(dict)은 results 테이블에 저장되고 export()로 한 번에 꺼냅니다.
+
+    queue = WorkQueue("data/crawl_queue.db")
+    queue.enqueue([(url, {"title": ...}), ...])
+    work(queue, handler, threads=4)          # handler(task) → 결과 행 dict, 예외면 실패로 기록
+    df = queue.export()
+
+여러 프로세스가 같은 DB 파일을 쓰므로 WAL 모드로 열고, 작업 임대는 BEGIN IMMEDIATE 트랜잭션 하나로 처리합니다.
+(SQLite 파일 잠금을 믿을 수 없는 네트워크 파일 시스템에는 두지 않습니다)
+"""
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from collections import namedtuple
+
+import pandas as pd
+
+queue_file = "data/crawl_queue.db"
+
+PENDING, LEASED, DONE, FAILED = "pending", "leased", "done", "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    url             TEXT PRIMARY KEY,
+    payload         TEXT,
+    status          TEXT NOT NULL DEFAULT 'pending',
+    attempts        INTEGER NOT NULL DEFAULT 0,
+    available_at    REAL NOT NULL DEFAULT 0,
+    lease_owner     TEXT,
+    lease_expires   REAL,
+    error           TEXT,
+    updated_at      REAL
+);
+CREATE INDEX IF NOT EXISTS tasks_ready ON tasks (status, available_at);
+CREATE TABLE IF NOT EXISTS results (
+    url             TEXT PRIMARY KEY,
+    data            TEXT NOT NULL,
+    worker          TEXT,
+    finished_at     REAL NOT NULL
+);
+"""
+
+Task = namedtuple("Task", ["url", "payload", "attempts"])
+
+
+def worker_name():
+    """작업자 식별자 (호스트 이름-PID-임의값)"""
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+
+class WorkQueue:
+    def __init__(self, path=queue_file, visibility=300, max_attempts=4, backoff=30):
+        self.path = path
+        self.visibility = visibility      # 임대 시간(초)
+        self.max_attempts = max_attempts
+        self.backoff = backoff            # 재시도 대기(초) = backoff × 2^(attempts-1)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        # 호출마다 연결을 따로 열어 스레드/프로세스 간에 공유하지 않음
+        conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        conn.execute("PRAGMA busy_timeout=60000")
+        return _Connection(conn)
+
+    def enqueue(self, items, refresh=False):
+        """
+        (url, payload dict) 목록을 넣고 새로 들어간 수를 반환합니다. 이미 있는 URL은 건너뜁니다.
+        refresh=True면 새 라운드를 시작합니다. 이번에 넣지 않은 URL의 결과도 지워서 export()에는 이번 라운드 결과만 나옵니다.
+        """
+        now = time.time()
+        rows = [(url, json.dumps(payload or {}, ensure_ascii=False), now) for url, payload in items]
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            before = conn.total_changes
+            conn.executemany("INSERT OR IGNORE INTO tasks (url, payload, updated_at) VALUES (?, ?, ?)", rows)
+            added = conn.total_changes - before
+            if refresh:
+                # 이전 라운드의 결과는 모두 지우고 (계획에서 빠진 URL이 방문한 것으로 기록되지 않도록) 다시 처리
+                conn.execute("DELETE FROM results")
+                conn.executemany(
+                    "UPDATE tasks SET status = 'pending', attempts = 0, available_at = 0, error = NULL, updated_at = ? "
+                    "WHERE url = ? AND status IN ('done', 'failed')",
+                    [(now, url) for url, _, _ in rows],
+                )
+            conn.execute("COMMIT")
+        return added
+
+    def lease(self, worker, limit=1):
+        """
+        처리할 작업을 최대 limit개 임대합니다. 대기 중이면서 재시도 시각이 지났거나, 임대가 만료된 작업이 대상입니다.
+        임대가 만료된 채 시도 횟수를 다 쓴 작업은 실패로 옮깁니다.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "UPDATE tasks SET status = 'failed', error = 'lease expired', lease_owner = NULL, updated_at = ? "
+                "WHERE status = 'leased' AND lease_expires <= ? AND attempts >= ?",
+                (now, now, self.max_attempts),
+            )
+            rows = conn.execute(
+                "SELECT url, payload, attempts FROM tasks "
+                "WHERE (status = 'pending' AND available_at <= ?) OR (status = 'leased' AND lease_expires <= ?) "
+                "ORDER BY available_at LIMIT ?",
+                (now, now, limit),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE tasks SET status = 'leased', attempts = attempts + 1, lease_owner = ?, lease_expires = ?, "
+                "updated_at = ? WHERE url = ?",
+                [(worker, now + self.visibility, now, url) for url, _, _ in rows],
+            )
+            conn.execute("COMMIT")
+        return [Task(url, json.loads(payload or "{}"), attempts + 1) for url, payload, attempts in rows]
+
+    def extend(self, worker, url, seconds=None):
+        """처리가 길어질 때 임대 시간을 늘립니다. 이미 다른 작업자에게 넘어갔으면 False."""
+        with self._connect() as conn:
+            cur = conn.execute(
+                "UPDATE tasks SET lease_expires = ? WHERE url = ? AND status = 'leased' AND lease_owner = ?",
+                (time.time() + (seconds or self.visibility), url, worker),
+            )
+            return cur.rowcount == 1
+
+    def complete(self, worker, url, result=None):
+        """작업을 완료로 기록합니다. 임대가 만료되어 다른 작업자가 가져간 뒤라면 무시하고 False를 반환합니다."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            cur = conn.execute(
+                "UPDATE tasks SET status = 'done', lease_owner = NULL, error = NULL, updated_at = ? "
+                "WHERE url = ? AND status = 'leased' AND lease_owner = ?",
+                (now, url, worker),
+            )
+            owned = cur.rowcount == 1
+            if owned and result is not None:
+                conn.execute(
+                    "INSERT OR REPLACE INTO results (url, data, worker, finished_at) VALUES (?, ?, ?, ?)",
+                    (url, json.dumps(result, ensure_ascii=False), worker, now),
+                )
+            conn.execute("COMMIT")
+        return owned
+
+    def fail(self, worker, url, error):
+        """실패를 기록합니다. 시도 횟수가 남았으면 지수 대기 후 다시 대기열로, 아니면 실패로 둡니다."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE tasks SET "
+                "status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "available_at = ? + ? * (1 << (attempts - 1)), lease_owner = NULL, error = ?, updated_at = ? "
+                "WHERE url = ? AND status = 'leased' AND lease_owner = ?",
+                (self.max_attempts, now, self.backoff, str(error)[:500], now, url, worker),
+            )
+
+    def counts(self):
+        """상태별 작업 수"""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall()
+        return {status: 0 for status in (PENDING, LEASED, DONE, FAILED)} | dict(rows)
+
+    def drained(self):
+        counts = self.counts()
+        return counts[PENDING] == 0 and counts[LEASED] == 0
+
+    def export(self):
+        """완료된 작업의 결과 행을 데이터프레임으로 반환합니다."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT data FROM results ORDER BY finished_at").fetchall()
+        return pd.DataFrame([json.loads(data) for data, in rows])
+
+
+class _Connection:
+    """with 블록이 끝나면 닫히는 sqlite3 연결 (sqlite3의 기본 with는 커밋만 하고 닫지 않음)"""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __enter__(self):
+        return self._conn
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None and self._conn.in_transaction:
+            self._conn.execute("ROLLBACK")
+        self._conn.close()
+        return False
+
+
+def work(queue, handler, threads=4, worker=None, poll=5.0, on_start=None, on_stop=None):
+    """
+    큐가 빌 때까지 threads개 스레드로 작업을 임대해 handler(task)를 실행합니다. 반환: (완료 수, 실패 수)
+    다른 작업자가 임대 중인 작업이 남아 있으면 poll초마다 다시 확인합니다. (만료되면 가져와 재시도)
+    on_start/on_stop은 스레드마다 한 번 호출됩니다. (스레드별 브라우저 생성/종료 등)
+    """
+    worker = worker or worker_name()
+    totals = {"done": 0, "failed": 0}
+    lock = threading.Lock()
+
+    def loop():
+        if on_start:
+            on_start()
+        try:
+            while True:
+                tasks = queue.lease(worker, 1)
+                if not tasks:
+                    if queue.drained():
+                        return
+                    time.sleep(poll)
+                    continue
+                task = tasks[0]
+                try:
+                    result = handler(task)
+                except Exception as e:
+                    queue.fail(worker, task.url, e)
+                    key = "failed"
+                else:
+                    queue.complete(worker, task.url, result)
+                    key = "done"
+                with lock:
+                    totals[key] += 1
+        finally:
+            if on_stop:
+                on_stop()
+
+    pool = [threading.Thread(target=loop, daemon=True) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return totals["done"], totals["failed"]
@@ -0,0 +1,141 @@
+"""
+가격 하락 알림 (관심 목록 일괄 평가)
+새로 병합된 스냅샷을 관심 목록의 모든 규칙과 한 번의 조인으로 비교하고,
+조건을 만족한 알림을 로컬 SQLite 발송함(outbox)에 중복 없이 쌓습니다.
+
+관심 목록 CSV (data/watchlist.csv) 컬럼:
+    rule_id, user_id, game_id, store, max_price, min_discount
+    - game_id: 게임 키 (filter.recommend.clean_game_names 규칙으로 정리한 게임 이름)
+    - store: steam / directg / epicgames / greenmangaming 또는 any
+    - max_price, min_discount: 비워 두면 조건 없음
+
+--changes <변경 피드>를 주면(filter.snapshot_diff) 새로 생기거나 가격이 바뀐 판매처가 있는 게임의 규칙만 평가합니다.
+"""
+import argparse
+import sqlite3
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from filter.recommend import clean_game_names
+from filter.snapshot_diff import changed_rows
+from filter.stores import classify_store
+from profiling import stage, write_report
+
+watchlist_file = "data/watchlist.csv"
+snapshot_file = "data/cleaned_merged_games_data.csv"
+outbox_file = "data/alerts.db"
+
+ANY_STORE = 'any'
+
+OUTBOX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    rule_id     INTEGER NOT NULL,
+    user_id     TEXT,
+    game_id     TEXT NOT NULL,
+    store       TEXT NOT NULL,
+    price       INTEGER NOT NULL,
+    discount    REAL,
+    url         TEXT,
+    created_at  TEXT NOT NULL,
+    sent_at     TEXT,
+    UNIQUE (rule_id, store, price)
+)
+"""
+
+
+def build_offers(snapshot):
+    """스냅샷을 (game_id, store, price, discount, url) 형태의 판매 정보 표로 바꿉니다."""
+    return pd.DataFrame({
+        'game_id': clean_game_names(snapshot['게임 이름']),
+        'store': classify_store(snapshot['사이트 URL']).astype(object),
+        'price': pd.to_numeric(snapshot['할인가'].astype(str).str.replace(r'[^\d.]', '', regex=True), errors='coerce'),
+        'discount': pd.to_numeric(snapshot['할인율'].astype(str).str.replace('%', ''), errors='coerce').fillna(0),
+        'url': snapshot['사이트 URL'],
+    }).dropna(subset=['store', 'price'])
+
+
+def load_watchlist(path=watchlist_file):
+    rules = pd.read_csv(path, dtype={'user_id': str, 'game_id': str, 'store': str})
+    if 'rule_id' not in rules.columns:
+        rules['rule_id'] = np.arange(len(rules))
+    for col in ['user_id', 'max_price', 'min_discount']:
+        if col not in rules.columns:
+            rules[col] = np.nan
+    rules['store'] = rules['store'].fillna(ANY_STORE).str.lower()
+    return rules
+
+
+def evaluate(rules, offers):
+    """
+    모든 규칙을 판매 정보와 조인해 조건을 만족하는 알림을 반환합니다.
+    store가 any인 규칙은 해당 게임의 가장 싼 판매처 하나만 남깁니다.
+    """
+    any_rules = rules[rules['store'] == ANY_STORE].drop(columns='store')
+    store_rules = rules[rules['store'] != ANY_STORE]
+
+    matched = pd.concat([
+        any_rules.merge(offers, on='game_id', how='inner'),
+        store_rules.merge(offers, on=['game_id', 'store'], how='inner'),
+    ], ignore_index=True)
+
+    ok = matched['max_price'].isna() | (matched['price'] <= matched['max_price'])
+    ok &= matched['min_discount'].isna() | (matched['discount'] >= matched['min_discount'])
+    matched = matched[ok]
+
+    matched = matched.sort_values(['rule_id', 'price', 'store'], kind='stable')
+    return matched.drop_duplicates(subset='rule_id', keep='first').reset_index(drop=True)
+
+
+def write_outbox(alerts, path=outbox_file):
+    """알림을 발송함에 추가합니다. 같은 규칙·판매처·가격의 알림은 한 번만 들어갑니다. 새로 추가된 수를 반환합니다."""
+    now = datetime.now().isoformat(timespec='seconds')
+    rows = alerts.assign(created_at=now)[
+        ['rule_id', 'user_id', 'game_id', 'store', 'price', 'discount', 'url', 'created_at']
+    ]
+    rows = rows.astype({'rule_id': 'int64', 'price': 'int64'}).astype(object).where(rows.notna(), None)
+
+    with sqlite3.connect(path) as conn:
+        conn.execute(OUTBOX_SCHEMA)
+        before = conn.total_changes
+        conn.executemany(
+            "INSERT OR IGNORE INTO outbox (rule_id, user_id, game_id, store, price, discount, url, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows.itertuples(index=False, name=None),
+        )
+        return conn.total_changes - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description="관심 목록 가격 알림 평가")
+    parser.add_argument("--watchlist", default=watchlist_file)
+    parser.add_argument("--snapshot", default=snapshot_file)
+    parser.add_argument("--outbox", default=outbox_file)
+    parser.add_argument("--changes", default=None, help="변경 피드 (주면 바뀐 게임만 평가)")
+    args = parser.parse_args()
+
+    with stage("alerts.load") as m:
+        rules = load_watchlist(args.watchlist)
+        offers = build_offers(pd.read_csv(args.snapshot))
+        if args.changes:
+            # 'any' 규칙은 가장 싼 판매처를 골라야 하므로 판매 정보는 바뀐 게임의 모든 판매처를 남김
+            changed = build_offers(changed_rows(args.changes))['game_id']
+            offers = offers[offers['game_id'].isin(changed)]
+            rules = rules[rules['game_id'].isin(changed)]
+        m["rows_out"] = len(rules)
+
+    with stage("alerts.evaluate", rows_in=len(rules)) as m:
+        alerts = evaluate(rules, offers)
+        m["rows_out"] = len(alerts)
+
+    with stage("alerts.outbox", rows_in=len(alerts)) as m:
+        added = write_outbox(alerts, args.outbox)
+        m["rows_out"] = added
+
+    print(f"[완료] 규칙 {len(rules)}개 중 {len(alerts)}개 조건 충족, 새 알림 {added}개 → {args.outbox}")
+    write_report("alerts")
+
+
+if __name__ == "__main__":
+    main()
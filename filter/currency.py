@@ -0,0 +1,106 @@
+"""
+통화 감지 및 원화 환산
+- 통화 기호가 있으면 기호로, 없으면 판매 사이트의 기본 통화로 판별
+- 환율은 날짜별 환율표(data/exchange_rates.csv: date,currency,krw)에서 기준일 이전 최신 값을 사용
+- 가격 컬럼 전체를 한 번에 변환하고, 원래 금액과 통화는 별도 컬럼에 보존
+"""
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from filter.stores import classify_store
+
+exchange_rate_file = "data/exchange_rates.csv"
+
+CURRENCY_COLUMN = '통화'
+
+# 가격 문자열의 통화 기호 → 통화 코드 (앞쪽 항목이 우선)
+CURRENCY_SYMBOLS = {
+    '₩': 'KRW', '\\': 'KRW', '원': 'KRW', 'US$': 'USD', '$': 'USD', '€': 'EUR', '£': 'GBP', '¥': 'JPY',
+}
+
+# 기호가 없을 때 사용하는 판매 사이트별 기본 통화
+STORE_CURRENCY = {
+    'steam': 'KRW',
+    'directg': 'KRW',
+    'epicgames': 'KRW',
+    'greenmangaming': 'USD',
+}
+
+FREE_KEYWORDS = ['무료', 'Free']
+
+
+@lru_cache(maxsize=4)
+def _read_rates(path, mtime):
+    rates = pd.read_csv(path, parse_dates=['date'])
+    rates['currency'] = rates['currency'].str.upper().str.strip()
+    return rates.sort_values(['currency', 'date'], ignore_index=True)
+
+
+def load_rates(path=exchange_rate_file):
+    """환율표를 불러옵니다. 파일이 바뀌지 않았다면 메모리에 캐시된 표를 돌려줍니다."""
+    return _read_rates(path, os.path.getmtime(path))
+
+
+def rates_on(date=None, path=exchange_rate_file):
+    """
+    기준일(없으면 환율표의 최신일)에 적용할 통화별 원화 환율을 반환합니다.
+    기준일 이전 값이 없는 통화는 가장 오래된 값을 사용합니다.
+    """
+    rates = load_rates(path)
+    if date is None:
+        rate_map = rates.groupby('currency')['krw'].last().to_dict()
+    else:
+        before = rates[rates['date'] <= pd.Timestamp(date)]
+        rate_map = rates.groupby('currency')['krw'].first().to_dict()
+        rate_map.update(before.groupby('currency')['krw'].last().to_dict())
+    rate_map.setdefault('KRW', 1.0)
+    return rate_map
+
+
+def detect_currency(values, stores):
+    """가격 문자열의 통화 기호와 판매 사이트로 행별 통화 코드를 판별합니다."""
+    text = values.astype(str)
+    currency = pd.Series(np.nan, index=values.index, dtype=object)
+    for symbol, code in CURRENCY_SYMBOLS.items():
+        currency = currency.mask(currency.isna() & text.str.contains(symbol, regex=False), code)
+    default = stores.astype(object).map(STORE_CURRENCY)
+    return currency.fillna(default).fillna('KRW')
+
+
+def parse_amount(values):
+    """가격 문자열에서 숫자만 추출합니다. 무료는 0, 읽을 수 없으면 NaN입니다."""
+    text = values.astype(str).str.strip()
+    amount = pd.to_numeric(text.str.replace(r'[^\d.]', '', regex=True), errors='coerce')
+    is_free = text.str.contains('|'.join(FREE_KEYWORDS), case=False, regex=True)
+    return amount.mask(is_free, 0.0)
+
+
+def normalize_prices(df, columns=('원가', '할인가'), date=None, rate_path=exchange_rate_file):
+    """
+    가격 컬럼을 원화 정수로 변환합니다.
+    원래 금액은 '<컬럼> 원본', 통화는 '통화' 컬럼에 남깁니다.
+    환율표에 없는 통화의 가격은 NaN이 되어 검증 단계에서 격리됩니다.
+    이미 '통화' 컬럼이 있는(환산이 끝난) 데이터는 그대로 반환합니다.
+    """
+    if CURRENCY_COLUMN in df.columns:
+        return df
+    df = df.copy()
+    stores = classify_store(df['사이트 URL']) if '사이트 URL' in df.columns else pd.Series(np.nan, index=df.index)
+    rate_map = rates_on(date, rate_path)
+
+    # 원가/할인가 중 한쪽에만 기호가 있는 경우도 판별되도록 함께 검사
+    text = df[columns[0]].astype(str)
+    for col in columns[1:]:
+        text = text + ' ' + df[col].astype(str)
+    currency = detect_currency(text, stores)
+    rate = currency.map(rate_map)
+    df[CURRENCY_COLUMN] = currency
+
+    for col in columns:
+        amount = parse_amount(df[col])
+        df[f'{col} 원본'] = amount
+        df[col] = (amount * rate).round().astype('Int64')
+    return df
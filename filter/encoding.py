@@ -0,0 +1,93 @@
+"""
+장르/연령 등급 인코딩
+- 장르: 쉼표로 구분된 문자열을 장르 사전의 비트 위치로 바꿔 행마다 정수 비트셋('장르 코드')으로 저장
+- 연령 등급: 순서가 있는 categorical
+"""
+import json
+
+import numpy as np
+import pandas as pd
+
+genre_dictionary_file = "data/genre_dictionary.json"
+
+GENRE_CODE_COLUMN = '장르 코드'
+MAX_GENRES = 63  # int64 비트셋에 담을 수 있는 장르 수
+
+AGE_RATINGS = ['전체 이용가', '12세 이용가', '15세 이용가', '18세 이용가', '19세 이용가']
+AGE_DTYPE = pd.CategoricalDtype(AGE_RATINGS, ordered=True)
+
+
+def split_genres(genres):
+    """장르 문자열 시리즈를 (원래 행 인덱스, 장르) 형태의 긴 시리즈로 펼칩니다."""
+    exploded = genres.fillna('').astype(str).str.split(',').explode().str.strip()
+    return exploded[exploded != '']
+
+
+def build_genre_dictionary(genres):
+    """등장 빈도 내림차순(동률은 이름순)으로 장르 사전을 만듭니다."""
+    counts = split_genres(genres).value_counts()
+    ordered = sorted(counts.index, key=lambda g: (-counts[g], g))
+    if len(ordered) > MAX_GENRES:
+        raise ValueError(f"장르 수({len(ordered)})가 비트셋 한도({MAX_GENRES})를 넘습니다.")
+    return ordered
+
+
+def encode_genres(genres, dictionary):
+    """장르 문자열 시리즈를 int64 비트셋 시리즈로 변환합니다. 사전에 없는 장르는 무시합니다."""
+    exploded = split_genres(genres)
+    bits = exploded.map({genre: i for i, genre in enumerate(dictionary)}).dropna().astype(np.int64)
+    codes = np.left_shift(np.int64(1), bits.to_numpy())
+    # 한 행 안의 장르는 서로 다른 비트이므로 합이 곧 비트 OR입니다.
+    encoded = pd.Series(codes, index=bits.index).groupby(level=0).sum()
+    return encoded.reindex(genres.index, fill_value=0).astype(np.int64)
+
+
+def genre_mask(dictionary, selected):
+    """선택한 장르들의 비트를 모두 켠 마스크를 반환합니다."""
+    mask = 0
+    for genre in selected:
+        if genre in dictionary:
+            mask |= 1 << dictionary.index(genre)
+    return np.int64(mask)
+
+
+def filter_by_genres(codes, dictionary, selected):
+    """선택한 장르를 모두 포함하는 행(AND 조건)의 불리언 배열을 반환합니다."""
+    if any(genre not in dictionary for genre in selected):
+        return np.zeros(len(codes), dtype=bool)
+    mask = genre_mask(dictionary, selected)
+    return (np.asarray(codes, dtype=np.int64) & mask) == mask
+
+
+def genre_counts(codes, dictionary):
+    """비트 위치별 개수를 세어 장르별 게임 수 시리즈를 반환합니다."""
+    codes = np.asarray(codes, dtype=np.int64)
+    shifts = np.arange(len(dictionary), dtype=np.int64)
+    counts = ((codes[:, None] >> shifts) & 1).sum(axis=0)
+    return pd.Series(counts, index=dictionary, name='게임 수')
+
+
+def encode_age_rating(ratings):
+    """연령 등급을 순서형 categorical로 변환합니다. 목록에 없는 값은 NaN이 됩니다."""
+    return ratings.astype(AGE_DTYPE)
+
+
+def encode_frame(df, dictionary=None):
+    """데이터프레임에 '장르 코드' 컬럼을 추가하고 연령 등급을 categorical로 바꿉니다."""
+    if dictionary is None:
+        dictionary = build_genre_dictionary(df['장르'])
+    df = df.copy()
+    df[GENRE_CODE_COLUMN] = encode_genres(df['장르'], dictionary)
+    if '연령 등급' in df.columns:
+        df['연령 등급'] = encode_age_rating(df['연령 등급'])
+    return df, dictionary
+
+
+def save_genre_dictionary(dictionary, path=genre_dictionary_file):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(dictionary, f, ensure_ascii=False, indent=2)
+
+
+def load_genre_dictionary(path=genre_dictionary_file):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
@@ -0,0 +1,122 @@
+"""
+패싯 검색 인덱스 (전체 데이터 보기 / API 검색)
+- 패싯 비트맵: 플랫폼/장르 값마다 '이 값을 가진 행'을 행당 1비트로 압축(np.packbits)한 배열.
+  조건 조합은 비트 AND/OR, 개수는 popcount(np.bitwise_count)로 계산하므로 질의마다 데이터프레임을 거르지 않습니다.
+- 정렬 순서: 가격/할인율/리뷰 수/이름 순의 행 위치 배열을 한 번만 만들어 두고,
+  질의 결과는 정렬 순서 배열을 결과 비트로 걸러(order[hit[order]]) 얻습니다. (질의마다 정렬하지 않음)
+
+패싯 개수는 다음 선택 시 결과 수입니다.
+- 플랫폼(OR 조건): 플랫폼 선택을 뺀 나머지 조건에 해당 플랫폼을 더했을 때의 결과 수
+- 장르(AND 조건): 현재 결과 중 해당 장르를 가진 게임 수
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from filter.encoding import GENRE_CODE_COLUMN
+
+# 정렬 키 → 화면 표시 이름 ('default'는 파일 순서)
+SORTS = {
+    'default': '기본 순서',
+    'price': '가격 낮은 순',
+    'discount': '할인율 높은 순',
+    'reviews': '리뷰 많은 순',
+    'name': '이름 순',
+}
+
+FacetResult = namedtuple('FacetResult', ['total', 'positions', 'platform_counts', 'genre_counts'])
+
+
+def pack(mask):
+    """불리언 배열을 행당 1비트 비트맵(uint8)으로 압축합니다."""
+    return np.packbits(np.asarray(mask, dtype=bool))
+
+
+def _popcounts(matrix, bitmap):
+    """비트맵 행렬(값 수 × 바이트)의 각 행과 bitmap의 교집합 크기"""
+    return np.bitwise_count(matrix & bitmap).sum(axis=1, dtype=np.int64)
+
+
+def _descending(values):
+    # 안정 정렬로 같은 값은 파일 순서 유지, 결측은 맨 뒤
+    return np.argsort(-np.nan_to_num(values, nan=-np.inf), kind='stable')
+
+
+class FacetIndex:
+    def __init__(self, df, genres, sale_price, discount):
+        self.size = len(df)
+        platforms = df['플랫폼 이름'].astype(str).to_numpy()
+        self.platforms = sorted(set(platforms))
+        self.platform_bitmaps = np.stack([pack(platforms == p) for p in self.platforms]) if self.platforms \
+            else np.zeros((0, (self.size + 7) // 8), dtype=np.uint8)
+
+        codes = np.asarray(df[GENRE_CODE_COLUMN], dtype=np.int64)
+        self.genres = list(genres)
+        self.genre_bitmaps = np.packbits(
+            ((codes[None, :] >> np.arange(len(self.genres), dtype=np.int64)[:, None]) & 1).astype(bool), axis=1,
+        ) if self.genres else np.zeros((0, (self.size + 7) // 8), dtype=np.uint8)
+
+        reviews = df['유저리뷰수'] if '유저리뷰수' in df.columns else pd.Series(np.nan, index=df.index)
+        names = df['게임 이름'].astype(str).str.casefold().to_numpy()
+        self.orders = {
+            'price': np.argsort(np.asarray(sale_price, dtype=float), kind='stable').astype(np.int32),
+            'discount': _descending(np.asarray(discount, dtype=float)).astype(np.int32),
+            'reviews': _descending(pd.to_numeric(reviews, errors='coerce').to_numpy(dtype=float)).astype(np.int32),
+            'name': np.argsort(names, kind='stable').astype(np.int32),
+        }
+        self._all = pack(np.ones(self.size, dtype=bool))
+
+    @classmethod
+    def from_arrays(cls, size, platforms, genres, bitmaps, orders):
+        """
+        bitmaps()/orders로 내보낸 배열로 인덱스를 만듭니다. (배열을 복사하지 않음)
+        공유 스냅샷(catalog.attach_catalog)에 연결한 프로세스가 비트맵과 정렬 순서를 다시 계산하지 않도록 사용합니다.
+        """
+        index = cls.__new__(cls)
+        index.size = size
+        index.platforms, index.genres = list(platforms), list(genres)
+        bitmaps = np.asarray(bitmaps, dtype=np.uint8).reshape(len(index.platforms) + len(index.genres), -1)
+        index.platform_bitmaps, index.genre_bitmaps = bitmaps[:len(index.platforms)], bitmaps[len(index.platforms):]
+        index.orders = {sort: np.asarray(order, dtype=np.int32) for sort, order in orders.items()}
+        index._all = pack(np.ones(size, dtype=bool))
+        return index
+
+    def bitmaps(self):
+        """플랫폼 비트맵 다음에 장르 비트맵을 이어 붙인 1차원 배열 (from_arrays의 bitmaps)"""
+        return np.concatenate([self.platform_bitmaps, self.genre_bitmaps]).ravel()
+
+    def _any_of(self, values, names, bitmaps):
+        """선택한 값 중 하나라도 가진 행 (없는 값은 무시)"""
+        rows = [names.index(v) for v in values if v in names]
+        return np.bitwise_or.reduce(bitmaps[rows], axis=0) if rows else np.zeros_like(self._all)
+
+    def _all_of(self, values, names, bitmaps):
+        """선택한 값을 모두 가진 행 (없는 값이 있으면 결과 없음)"""
+        if any(v not in names for v in values):
+            return np.zeros_like(self._all)
+        return np.bitwise_and.reduce(bitmaps[[names.index(v) for v in values]], axis=0, initial=255)
+
+    def query(self, text_mask=None, platforms=None, genres=None, sort='default', offset=0, limit=None):
+        """
+        조건에 맞는 결과 수, 정렬된 결과 중 [offset, offset+limit) 위치, 플랫폼/장르별 패싯 개수를 반환합니다.
+        text_mask는 이름 검색 결과 불리언 배열(없으면 전체)입니다.
+        """
+        base = self._all if text_mask is None else pack(text_mask)
+        if genres:
+            base = base & self._all_of(genres, self.genres, self.genre_bitmaps)
+        platform_counts = _popcounts(self.platform_bitmaps, base)
+
+        result = base & self._any_of(platforms, self.platforms, self.platform_bitmaps) if platforms else base
+        genre_counts = _popcounts(self.genre_bitmaps, result)
+
+        hit = np.unpackbits(result, count=self.size).view(bool)
+        order = self.orders.get(sort)
+        positions = np.flatnonzero(hit) if order is None else order[hit[order]]
+        stop = None if limit is None else offset + limit
+        return FacetResult(
+            total=int(hit.sum()),
+            positions=positions[offset:stop],
+            platform_counts=dict(zip(self.platforms, platform_counts.tolist())),
+            genre_counts=dict(zip(self.genres, genre_counts.tolist())),
+        )
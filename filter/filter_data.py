@@ -0,0 +1,111 @@
+"""
+합친 데이터 필터링 (filter_data.ipynb의 스크립트 버전)
+병합된 CSV를 청크 단위로 나눠 프로세스 풀에서 정리한 뒤 하나로 합칩니다.
+"""
+import argparse
+import re
+from functools import partial
+
+import pandas as pd
+
+from filter.currency import normalize_prices
+from filter.encoding import encode_frame, save_genre_dictionary
+from filter.parallel import run_chunked
+from filter.validate import quarantine_file, strip_html, validate, write_report
+from profiling import stage
+from profiling import write_report as write_profile
+
+input_file = "data/merged_games_data.csv"
+output_file = "data/cleaned_merged_games_data.csv"
+
+dedup_columns = ['게임 이름', '플랫폼 이름', '사이트 URL']
+
+
+def drop_incomplete(df):
+    # 원가, 할인가 비어있으면 제거
+    df = df[~(df['원가'].isnull() | df['할인가'].isnull())]
+    df = df[~((df['원가'].astype(str).str.strip() == '') | (df['할인가'].astype(str).str.strip() == ''))]
+
+    # 장르 비어있으면 제거
+    df = df[~df['장르'].isnull()]
+    return df[df['장르'].astype(str).str.strip() != '']
+
+
+def normalize_age_rating(value):
+    if pd.isna(value):
+        return '전체 이용가'
+
+    value = str(value)
+    number = re.search(r'\d+', value)
+    if number:
+        return number.group() + '세 이용가'
+    else:
+        return '전체 이용가'
+
+
+def filter_chunk(df, rate_date=None):
+    df = strip_html(drop_incomplete(df))
+
+    df['연령 등급'] = df['연령 등급'].apply(normalize_age_rating)
+
+    # 통화 판별 후 원화로 일괄 환산 (환율: data/exchange_rates.csv)
+    df = normalize_prices(df, date=rate_date)
+
+    df['플랫폼 이름'] = df['플랫폼 이름'].replace({'Epic': 'Epic Games'})
+
+    # 청크 안의 중복을 먼저 줄여 최종 병합 시 비교량을 줄입니다.
+    df = df.drop_duplicates(subset=dedup_columns)
+
+    df['할인율'] = df['할인율'].astype(str).str.replace('-', '', regex=False)
+    return df
+
+
+def filter_data(df, workers=1, chunk_size=2000, rate_date=None):
+    """병합된 데이터를 청크별로 정리하고, 청크 간 중복을 최종 제거합니다."""
+    func = partial(filter_chunk, rate_date=rate_date)
+    filtered = run_chunked([df], func, workers=workers, chunk_size=chunk_size)
+    if filtered.empty:
+        return filtered
+    # 청크 순서가 고정되어 있으므로 keep='first'는 순차 처리와 같은 행을 남깁니다.
+    return filtered.drop_duplicates(subset=dedup_columns).reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="병합 데이터 필터링")
+    parser.add_argument("--input", default=input_file)
+    parser.add_argument("--output", default=output_file)
+    parser.add_argument("--encoding", default="utf-8-sig", help="입력 CSV 인코딩 (엑셀 저장본은 cp949)")
+    parser.add_argument("--workers", type=int, default=1, help="병렬 처리 프로세스 수 (0이면 CPU 코어 수)")
+    parser.add_argument("--chunk-size", type=int, default=2000, help="프로세스 하나가 처리할 행 수")
+    parser.add_argument("--rate-date", default=None, help="환율 기준일 (YYYY-MM-DD, 기본값: 환율표의 최신일)")
+    args = parser.parse_args()
+
+    with stage("filter.load") as m:
+        df = pd.read_csv(args.input, encoding=args.encoding)
+        m["rows_out"] = len(df)
+
+    with stage("filter.clean", rows_in=len(df)) as m:
+        df = filter_data(df, workers=args.workers or None, chunk_size=args.chunk_size, rate_date=args.rate_date)
+        m["rows_out"] = len(df)
+
+    # 품질 검증: 규칙 위반 행은 격리 파일로 분리
+    with stage("filter.validate", rows_in=len(df)) as m:
+        df, quarantined, counts = validate(df)
+        quarantined.to_csv(quarantine_file, index=False, encoding='utf-8-sig')
+        m["rows_out"] = len(df)
+    write_report(counts, len(df) + len(quarantined), len(quarantined))
+
+    # 장르 비트셋/연령 등급 인코딩 (앱은 '장르 코드'와 장르 사전을 그대로 사용)
+    with stage("filter.encode", rows_in=len(df)) as m:
+        df, dictionary = encode_frame(df)
+        save_genre_dictionary(dictionary)
+        m["rows_out"] = len(df)
+
+    with stage("filter.save", rows_in=len(df)):
+        df.to_csv(args.output, index=False, encoding='utf-8')
+    print(f"[완료] 정리된 {len(df)}개 게임 데이터를 저장했습니다 → {args.output}")
+    write_profile("filter")
+
+
+if __name__ == "__main__":
+    main()
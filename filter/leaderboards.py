@@ -0,0 +1,278 @@
+"""
+대시보드 순위표 (배치, 증분 갱신)
+정리된 게임 목록이 새로 만들어질 때마다 판매처 URL별 상태(data/leaderboard_state.csv)와 비교해
+바뀐 행만 다시 점수를 매기고, 순위표마다 저장해 둔 상위 후보(data/leaderboards.json)에 합칩니다.
+
+- deepest_discount: 현재 할인율이 높은 순
+- biggest_drop: 직전 실행 대비 가격 하락 폭이 큰 순 (이번에 가격이 바뀐 행만 대상)
+- all_time_low: 가격 이력과 지난 실행들을 통틀어 최저가인 게임 중 할인율 순
+- most_reviewed_on_sale: 할인 중인 게임 중 리뷰 수 순
+
+순위표마다 상위 RESERVE개와 기준 점수(threshold)를 저장합니다. 후보 밖의 바뀌지 않은 행은 모두 기준 점수 이하이므로
+새 순위는 '바뀌지 않은 후보 + 기준 점수 이상인 바뀐 행'의 top-k(np.argpartition)로 구할 수 있고, 이번에 후보에서 밀려난
+행이 있으면 기준 점수를 밀려난 점수 중 최고로 올립니다. 남은 후보가 TOP_K개보다 적거나, 후보가 RESERVE개보다 줄었는데
+후보 밖에 행이 남아 있을 때만 전체 행에서 다시 고릅니다. (전체 정렬 없음)
+
+    python -m filter.leaderboards            # filter_data 다음에 실행, 앱은 저장된 순위표를 그대로 표시
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from filter.recommend import clean_game_names, price_history_stats
+from profiling import stage, write_report
+
+catalog_file = "data/cleaned_merged_games_data.csv"
+sales_file = "data/combined_sales_data.csv"
+state_file = "data/leaderboard_state.csv"
+leaderboards_file = "data/leaderboards.json"
+
+TOP_K = 10      # 대시보드에 표시하는 순위 수
+RESERVE = 50    # 순위표마다 저장하는 후보 수
+
+# 순위표 → (표시 이름, 이전 후보를 이어 쓰는지) : biggest_drop은 실행마다 하락 폭이 새로 정해지므로 이어 쓰지 않음
+BOARDS = {
+    'deepest_discount': ('할인율 TOP', True),
+    'biggest_drop': ('가격 하락', False),
+    'all_time_low': ('역대 최저가', True),
+    'most_reviewed_on_sale': ('리뷰 많은 할인 게임', True),
+}
+STATE_COLUMNS = ['사이트 URL', '게임 이름', '플랫폼 이름', 'price', 'original', 'discount', 'reviews',
+                 'drop', 'low', 'at_low']
+ENTRY_COLUMNS = ['게임 이름', '플랫폼 이름', 'price', 'original', 'discount', 'reviews', 'drop']
+
+
+def _to_number(series):
+    text = series.astype(str).str.replace('무료', '0', regex=False)
+    return pd.to_numeric(text.str.replace(r'[^\d.]', '', regex=True), errors='coerce')
+
+
+def listings(catalog):
+    """정리된 게임 목록을 판매처 URL을 인덱스로 하는 숫자 컬럼 표로 바꿉니다."""
+    table = pd.DataFrame({
+        '사이트 URL': catalog['사이트 URL'].fillna('').astype(str),
+        '게임 이름': catalog['게임 이름'].astype(str),
+        '플랫폼 이름': catalog['플랫폼 이름'].astype(str),
+        'price': _to_number(catalog['할인가']),
+        'original': _to_number(catalog['원가']),
+        'discount': _to_number(catalog['할인율']).fillna(0),
+        'reviews': _to_number(catalog['유저리뷰수']).fillna(0) if '유저리뷰수' in catalog.columns else 0.0,
+    })
+    table = table[table['사이트 URL'] != ''].drop_duplicates('사이트 URL', keep='last')
+    return table.set_index('사이트 URL')
+
+
+def history_lows(sales, names):
+    """게임 이름 시리즈에 맞춘 가격 이력상 최저가 (이력이 없으면 NaN)"""
+    if sales is None or sales.empty:
+        return pd.Series(np.nan, index=names.index)
+    low = price_history_stats(sales)['historical_low']
+    return clean_game_names(names).map(low)
+
+
+def score(board, table):
+    """순위표 점수 배열. 대상이 아닌 행은 -inf."""
+    discount = table['discount'].to_numpy(dtype=float)
+    if board == 'deepest_discount':
+        return np.where(discount > 0, discount, -np.inf)
+    if board == 'biggest_drop':
+        drop = table['drop'].to_numpy(dtype=float)
+        return np.where(drop > 0, drop, -np.inf)
+    if board == 'all_time_low':
+        return np.where(table['at_low'].to_numpy(dtype=bool), discount, -np.inf)
+    if board == 'most_reviewed_on_sale':
+        return np.where(discount > 0, table['reviews'].to_numpy(dtype=float), -np.inf)
+    raise KeyError(board)
+
+
+def top_k(scores, k):
+    """점수가 유한한 위치 중 상위 k개 (점수 내림차순). 전체 정렬 대신 argpartition으로 고른 뒤 k개만 정렬합니다."""
+    valid = np.flatnonzero(np.isfinite(scores))
+    if len(valid) > k:
+        valid = valid[np.argpartition(-scores[valid], k - 1)[:k]]
+    return valid[np.argsort(-scores[valid], kind='stable')]
+
+
+def load_state(path=state_file):
+    if path is None or not os.path.exists(path):
+        return pd.DataFrame(columns=STATE_COLUMNS).set_index('사이트 URL')
+    state = pd.read_csv(path, index_col='사이트 URL')
+    state['at_low'] = state['at_low'].astype(bool)
+    return state
+
+
+def load_boards(path=leaderboards_file):
+    if path is None or not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)['boards']
+
+
+def advance_state(state, current, history_low):
+    """
+    현재 목록으로 상태를 갱신합니다. 반환: (새 상태, 바뀐 URL 인덱스, 사라진 URL 인덱스)
+    바뀐 행 = 새로 생긴 행 + 가격/할인율/리뷰 수가 달라진 행
+    """
+    old = state.reindex(current.index)
+    seen = old['price'].notna() | old['discount'].notna()
+    differs = pd.Series(False, index=current.index)
+    for col in ['price', 'discount', 'reviews']:
+        a, b = current[col], old[col].astype(float)
+        differs |= ~((a == b) | (a.isna() & b.isna()))
+    changed = ~seen | differs
+
+    new = current.copy()
+    # 직전 실행 대비 하락 폭 (바뀌지 않은 행은 0)
+    new['drop'] = (old['price'].astype(float) - current['price']).where(changed & seen, 0).fillna(0)
+    # 이번 가격 이전까지의 최저가와 비교해 역대 최저가인지 판단 (같은 가격이면 최저가 유지)
+    prior_low = np.fmin(old['low'].astype(float), history_low.reindex(current.index).astype(float))
+    # 바뀌지 않은 행은 직전 판단을 유지 (점수가 바뀌는 행은 모두 changed에 들어 있어야 증분 갱신이 맞음)
+    at_low = (current['price'] <= prior_low).fillna(False)
+    new['at_low'] = at_low.where(changed, old['at_low'].eq(True)).astype(bool)
+    new['low'] = np.fmin(prior_low, current['price'])
+
+    removed = state.index.difference(current.index)
+    return new[STATE_COLUMNS[1:]], current.index[changed.to_numpy()], removed
+
+
+def update_board(board, previous, table, changed, removed):
+    """
+    순위표 하나를 갱신합니다. previous는 저장된 {'threshold', 'entries': [{'url', 'score'}, ...]} (없으면 None).
+    반환: (새 순위표, 전체 행에서 다시 골랐는지)
+    """
+    _, carry = BOARDS[board]
+    if not carry:
+        # 바뀌지 않은 행은 점수가 없으므로 바뀐 행에서만 고름
+        return _select(table.loc[changed], board), False
+    if previous is not None:
+        stale = set(changed) | set(removed)
+        kept = [e for e in previous['entries'] if e['url'] not in stale]
+        if len(kept) >= TOP_K:
+            threshold = -np.inf if previous['threshold'] is None else previous['threshold']
+            rows = table.loc[changed]
+            scores = score(board, rows)
+            admitted = scores >= threshold
+            urls = np.r_[np.array([e['url'] for e in kept], dtype=object), rows.index.to_numpy()[admitted]]
+            merged = np.r_[np.array([e['score'] for e in kept], dtype=float), scores[admitted]]
+            picked = top_k(merged, RESERVE)
+            if len(picked) == RESERVE:
+                # 이번에 후보에서 밀려난 행도 후보 밖에 남으므로, 기준 점수는 밀려난 점수 중 최고 이상이어야 함
+                cut = np.ones(len(merged), dtype=bool)
+                cut[picked] = False
+                cut &= np.isfinite(merged)
+                if cut.any():
+                    threshold = max(threshold, float(merged[cut].max()))
+                entries = [{'url': urls[i], 'score': float(merged[i])} for i in picked]
+                return {'threshold': threshold, 'entries': entries}, False
+            if not np.isfinite(threshold):
+                # 대상 전체가 후보에 들어 있음
+                entries = [{'url': urls[i], 'score': float(merged[i])} for i in picked]
+                return {'threshold': threshold, 'entries': entries}, False
+            # 후보가 줄었고 후보 밖에 기준 점수 이하 행이 남아 있으면 전체 행에서 다시 채움
+
+    return _select(table, board), True
+
+
+def _select(rows, board):
+    scores = score(board, rows)
+    picked = top_k(scores, RESERVE)
+    # 후보를 꽉 채웠으면 마지막 후보 점수가 기준, 아니면 대상 전체가 후보에 들어 있음
+    threshold = float(scores[picked[-1]]) if len(picked) == RESERVE else -np.inf
+    return {'threshold': threshold, 'entries': [{'url': rows.index[i], 'score': float(scores[i])} for i in picked]}
+
+
+def update(catalog, sales, state, boards):
+    """반환: (새 상태, 새 순위표 dict, 통계 dict)"""
+    current = listings(catalog)
+    history_low = history_lows(sales, current['게임 이름'])
+    new_state, changed, removed = advance_state(state, current, history_low)
+    if state.empty:
+        boards = {}
+
+    result, rebuilt = {}, []
+    for board in BOARDS:
+        result[board], full = update_board(board, boards.get(board), new_state, changed, removed)
+        if full:
+            rebuilt.append(board)
+    return new_state, result, {'listings': len(new_state), 'changed': len(changed), 'removed': len(removed),
+                               'rebuilt': rebuilt}
+
+
+def save(state, boards, state_path=state_file, boards_path=leaderboards_file):
+    """상태와 순위표를 저장합니다. 순위표 항목에는 대시보드 표시에 필요한 값(이름/가격/하락 폭 등)도 함께 넣습니다."""
+    output = {}
+    for board, data in boards.items():
+        rows = state.loc[[e['url'] for e in data['entries']], ENTRY_COLUMNS]
+        entries = [{**entry, **{k: _plain(v) for k, v in row.items()}}
+                   for entry, (_, row) in zip(data['entries'], rows.iterrows())]
+        threshold = data['threshold']
+        output[board] = {'threshold': threshold if np.isfinite(threshold) else None, 'entries': entries}
+
+    os.makedirs(os.path.dirname(state_path) or ".", exist_ok=True)
+    state.rename_axis('사이트 URL').reset_index().to_csv(state_path, index=False, encoding='utf-8-sig')
+    with open(boards_path, 'w', encoding='utf-8') as f:
+        json.dump({'top_k': TOP_K, 'boards': output}, f, ensure_ascii=False, indent=1)
+
+
+def _plain(value):
+    if isinstance(value, (np.integer, np.floating)):
+        value = value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    return value
+
+
+def read_leaderboards(df, sales, path=leaderboards_file):
+    """
+    앱용 순위표: 순위표 이름 → 상위 TOP_K개 항목 표 (pos: df 행 위치, 현재 목록에 없는 URL은 제외).
+    저장된 순위표가 없으면 현재 목록으로 계산합니다. (직전 실행이 없으므로 가격 하락은 비어 있음)
+    """
+    stored = load_boards(path)
+    if not stored:
+        state, boards, _ = update(df, sales, load_state(None), {})
+        stored = {board: {'entries': [{'url': e['url'], **state.loc[e['url'], ENTRY_COLUMNS].to_dict()}
+                                      for e in data['entries']]}
+                  for board, data in boards.items()}
+
+    position = pd.Series(np.arange(len(df)), index=df['사이트 URL'].astype(str)).groupby(level=0).last()
+    result = {}
+    for board in BOARDS:
+        entries = pd.DataFrame(stored.get(board, {}).get('entries', []), columns=['url', *ENTRY_COLUMNS])
+        entries['pos'] = entries['url'].map(position)
+        result[board] = entries.dropna(subset=['pos']).astype({'pos': int}).head(TOP_K).reset_index(drop=True)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대시보드 순위표 증분 갱신")
+    parser.add_argument("--catalog", default=catalog_file)
+    parser.add_argument("--sales", default=sales_file)
+    parser.add_argument("--state", default=state_file)
+    parser.add_argument("--output", default=leaderboards_file)
+    parser.add_argument("--full", action="store_true", help="저장된 상태를 무시하고 처음부터 다시 계산")
+    args = parser.parse_args()
+
+    with stage("leaderboards.load") as m:
+        catalog = pd.read_csv(args.catalog)
+        sales = pd.read_csv(args.sales) if os.path.exists(args.sales) else None
+        state = load_state(None if args.full else args.state)
+        boards = {} if args.full else load_boards(args.output)
+        m["rows_out"] = len(catalog)
+
+    with stage("leaderboards.update", rows_in=len(catalog)) as m:
+        state, boards, info = update(catalog, sales, state, boards)
+        m["rows_out"] = info['changed']
+        m["rebuilt"] = info['rebuilt']
+
+    save(state, boards, args.state, args.output)
+    rebuilt = ', '.join(info['rebuilt']) or '없음'
+    print(f"[완료] {info['listings']}개 중 {info['changed']}개 변경, {info['removed']}개 삭제 "
+          f"(전체 재계산: {rebuilt}) → {args.output}")
+    write_report("leaderboards")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,55 @@
+import argparse
+
 import pandas as pd
 import numpy as np
 
+from filter.parallel import run_chunked
+from profiling import stage, write_report
+
 # 파일 경로 설정
 raw_input_file = "data/steam_detailed_data.csv"
 steam_file = "data/steam_games_data.csv"
 directg_file = "data/directg_games_data.csv"
 output_file = "data/merged_games_data.csv"
 
+common_columns = [
+    "게임 이름", "원가", "할인가", "사이트 URL", "할인율",
+    "유저리뷰수", "플랫폼 이름", "이미지 URL", "장르", "연령 등급"
+]
+
+
 ### 1. Steam 데이터 전처리
-# 원본 Steam CSV 파일 불러오기
-raw_df = pd.read_csv(raw_input_file)
+def load_steam(raw_path=raw_input_file, filtered_path=steam_file):
+    # 원본 Steam CSV 파일 불러오기
+    raw_df = pd.read_csv(raw_path)
+
+    # '정보 없음' 또는 'Free'인 게임 제거
+    filtered_df = raw_df[~raw_df["원가"].isin(["정보 없음", "Free"])].copy()
 
-# '정보 없음' 또는 'Free'인 게임 제거
-filtered_df = raw_df[~raw_df["원가"].isin(["정보 없음", "Free"])].copy()
+    # 저장
+    filtered_df.to_csv(filtered_path, index=False, encoding="utf-8-sig")
+    print(f"[완료] 필터링된 {len(filtered_df)}개 게임 데이터를 저장했습니다 → {filtered_path}")
 
-# 저장
-filtered_df.to_csv(steam_file, index=False, encoding="utf-8-sig")
-print(f"[완료] 필터링된 {len(filtered_df)}개 게임 데이터를 저장했습니다 → {steam_file}")
+    # Steam 필터링된 데이터 불러오기
+    return pd.read_csv(filtered_path)
 
-# Steam 필터링된 데이터 불러오기
-steam_df = pd.read_csv(steam_file)
 
 ### 2. DirectG 데이터 로딩 및 정리
-directg_df = pd.read_csv(directg_file)
+def load_directg(path=directg_file):
+    directg_df = pd.read_csv(path)
 
-# 유저리뷰 처리
-if "유저 리뷰" in directg_df.columns:
-    directg_df["유저리뷰수"] = directg_df["유저 리뷰"].fillna(0)
-elif "유저리뷰수" not in directg_df.columns:
-    directg_df["유저리뷰수"] = 0
+    # 유저리뷰 처리
+    if "유저 리뷰" in directg_df.columns:
+        directg_df["유저리뷰수"] = directg_df["유저 리뷰"].fillna(0)
+    elif "유저리뷰수" not in directg_df.columns:
+        directg_df["유저리뷰수"] = 0
+
+    # 이미지 컬럼명 통일
+    if "이미지" in directg_df.columns:
+        directg_df.rename(columns={"이미지": "이미지 URL"}, inplace=True)
+
+    return directg_df
 
-# 이미지 컬럼명 통일
-if "이미지" in directg_df.columns:
-    directg_df.rename(columns={"이미지": "이미지 URL"}, inplace=True)
 
 ### 3. 전처리 함수 정의
 def clean_price(val):
@@ -63,8 +80,10 @@ def translate_genre(genre_str):
     translated = [genre_translation.get(g, g) for g in genres]
     return ", ".join(translated)
 
-### 4. 전처리 적용
-for df in [steam_df, directg_df]:
+
+### 4. 전처리 적용 (청크 단위로 호출됨)
+def normalize_chunk(df):
+    df = df.copy()
     df["원가"] = df["원가"].apply(clean_price).astype("Int64")
     df["할인가"] = df["할인가"].apply(clean_price).astype("Int64")
     df["할인율"] = df["할인율"].apply(clean_discount).astype("Int64")
@@ -72,23 +91,40 @@ for df in [steam_df, directg_df]:
     df["연령 등급"] = df["연령 등급"].replace("정보 없음", np.nan)
     df["장르"] = df["장르"].apply(translate_genre)
 
-### 5. 컬럼 통일 및 병합
-common_columns = [
-    "게임 이름", "원가", "할인가", "사이트 URL", "할인율",
-    "유저리뷰수", "플랫폼 이름", "이미지 URL", "장르", "연령 등급"
-]
-
-for df in [steam_df, directg_df]:
+    # 5. 컬럼 통일
     for col in common_columns:
         if col not in df.columns:
             df[col] = np.nan
+    return df[common_columns]
+
+
+def merge_games(frames, workers=1, chunk_size=2000):
+    """스토어별 원본 데이터프레임을 정규화한 뒤 하나로 병합합니다."""
+    return run_chunked(frames, normalize_chunk, workers=workers, chunk_size=chunk_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스토어별 크롤링 데이터 병합")
+    parser.add_argument("--workers", type=int, default=1, help="병렬 처리 프로세스 수 (0이면 CPU 코어 수)")
+    parser.add_argument("--chunk-size", type=int, default=2000, help="프로세스 하나가 처리할 행 수")
+    parser.add_argument("--extra", nargs="*", default=[], help="추가로 병합할 크롤링 CSV (스토어/지역별)")
+    args = parser.parse_args()
+
+    with stage("merge.load") as m:
+        frames = [load_steam(), load_directg()] + [pd.read_csv(path) for path in args.extra]
+        m["rows_out"] = sum(len(df) for df in frames)
+
+    # 병합
+    with stage("merge.normalize", rows_in=m["rows_out"]) as m:
+        merged_df = merge_games(frames, workers=args.workers or None, chunk_size=args.chunk_size)
+        m["rows_out"] = len(merged_df)
 
-steam_df = steam_df[common_columns]
-directg_df = directg_df[common_columns]
+    # 저장
+    with stage("merge.save", rows_in=len(merged_df)):
+        merged_df.to_csv(output_file, index=False, encoding="utf-8-sig")
+    print(f"[완료] 병합된 데이터가 '{output_file}'에 저장되었습니다.")
+    write_report("merge")
 
-# 병합
-merged_df = pd.concat([steam_df, directg_df], ignore_index=True)
 
-# 저장
-merged_df.to_csv(output_file, index=False, encoding="utf-8-sig")
-print(f"[완료] 병합된 데이터가 '{output_file}'에 저장되었습니다.")
+if __name__ == "__main__":
+    main()
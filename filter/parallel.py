@@ -0,0 +1,41 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+
+def default_workers():
+    """사용 가능한 CPU 코어 수를 반환합니다."""
+    return os.cpu_count() or 1
+
+
+def split_chunks(df, chunk_size):
+    """데이터프레임을 chunk_size 행 단위의 조각 리스트로 나눕니다."""
+    if chunk_size <= 0 or len(df) <= chunk_size:
+        return [df]
+    return [df.iloc[start:start + chunk_size] for start in range(0, len(df), chunk_size)]
+
+
+def run_chunked(frames, func, workers=None, chunk_size=2000):
+    """
+    여러 원본 데이터프레임을 청크로 나눠 프로세스 풀에서 func를 적용합니다.
+    - frames: 원본 데이터프레임 리스트 (스토어/지역별 크롤링 파일)
+    - func: 청크 하나를 받아 처리된 데이터프레임을 반환하는 최상위 함수 (pickle 가능해야 함)
+    - workers: 프로세스 수 (None이면 CPU 코어 수, 1 이하면 현재 프로세스에서 순차 처리)
+    결과는 (원본 순서, 청크 순서) 그대로 이어 붙이므로 실행마다 동일한 순서가 보장됩니다.
+    """
+    chunks = [chunk for df in frames for chunk in split_chunks(df, chunk_size)]
+    if not chunks:
+        return pd.DataFrame()
+
+    workers = default_workers() if workers is None else workers
+    workers = min(workers, len(chunks))
+
+    if workers <= 1:
+        results = [func(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # map은 제출 순서대로 결과를 돌려주므로 최종 병합이 결정적입니다.
+            results = list(executor.map(func, chunks))
+
+    return pd.concat(results, ignore_index=True)
@@ -0,0 +1,127 @@
+"""
+구매 적정 가격 추천 (배치)
+가격 이력(data/combined_sales_data.csv)과 현재 게임 목록으로 모든 게임의 추천 지표를 한 번에 계산해
+data/price_recommendations.csv에 저장합니다. 앱 상세 페이지는 이 결과를 게임 키로 조회만 합니다.
+
+- 역대 최저가, 정가(이력상 최고가)
+- 평균 할인 폭: 할인 중이던 기록의 할인 폭 중앙값
+- 연간 할인 횟수: 할인 시작일 기준 할인 기록 수 / 관측 기간(년)
+- 예상 할인가: 정가 × (1 - 평균 할인 폭)
+- 판단: 현재가가 예상 할인가 이하이거나 역대 최저가 근처면 '지금 구매', 아니면 '기다리기'
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from profiling import stage, write_report
+
+sales_file = "data/combined_sales_data.csv"
+catalog_file = "data/cleaned_merged_games_data.csv"
+output_file = "data/price_recommendations.csv"
+
+KEY_COLUMN = '게임 키'
+LOW_TOLERANCE = 0.05   # 역대 최저가 대비 이 비율 이내면 최저가 수준으로 판단
+BUY_NOW, WAIT = '지금 구매', '기다리기'
+
+
+def clean_game_names(names):
+    """app.clean_game_name_final과 같은 규칙을 시리즈 전체에 한 번에 적용합니다."""
+    return (
+        names.fillna('').astype(str).str.lower()
+        .str.replace('&', 'and', regex=False)
+        .str.replace(' ', '-', regex=False)
+        .str.replace(r'[^a-z0-9-]', '', regex=True)
+        .str.replace(r'-+', '-', regex=True)
+        .str.strip('-')
+        .str.strip()
+    )
+
+
+def _to_number(series):
+    return pd.to_numeric(series.astype(str).str.replace(r'[^\d.]', '', regex=True), errors='coerce')
+
+
+def price_history_stats(sales):
+    """게임 키별 가격 이력 통계를 계산합니다."""
+    history = pd.DataFrame({
+        KEY_COLUMN: sales['게임 이름'].astype(str),
+        'date': pd.to_datetime(sales['할인 시작일'], errors='coerce'),
+        'price': _to_number(sales['할인가']),
+    }).dropna()
+
+    grouped = history.groupby(KEY_COLUMN)
+    stats = grouped.agg(
+        historical_low=('price', 'min'),
+        regular_price=('price', 'max'),
+        first_seen=('date', 'min'),
+        last_seen=('date', 'max'),
+        observations=('price', 'size'),
+    )
+
+    # 할인 폭은 이력상 정가 대비 비율 (정가 그대로인 기록은 할인 아님)
+    regular = history[KEY_COLUMN].map(stats['regular_price']).to_numpy()
+    depth = np.where(regular > 0, 1 - history['price'].to_numpy() / np.where(regular > 0, regular, 1), 0.0)
+    on_sale = depth > 0
+    sale_rows = history.loc[on_sale, [KEY_COLUMN]].assign(depth=depth[on_sale])
+    stats['typical_depth'] = sale_rows.groupby(KEY_COLUMN)['depth'].median()
+    stats['sale_count'] = sale_rows.groupby(KEY_COLUMN).size()
+    stats[['typical_depth', 'sale_count']] = stats[['typical_depth', 'sale_count']].fillna(0)
+
+    years = ((stats['last_seen'] - stats['first_seen']).dt.days / 365.25).clip(lower=1 / 12)
+    stats['sales_per_year'] = stats['sale_count'] / years
+    return stats
+
+
+def current_prices(catalog):
+    """게임 키별 현재 최저 할인가를 계산합니다."""
+    current = pd.DataFrame({
+        KEY_COLUMN: clean_game_names(catalog['게임 이름']),
+        'current_price': _to_number(catalog['할인가'].astype(str).str.replace('무료', '0')),
+    })
+    return current.groupby(KEY_COLUMN)['current_price'].min()
+
+
+def recommend(sales, catalog):
+    """모든 게임의 추천 결과 데이터프레임을 반환합니다. (인덱스: 게임 키)"""
+    stats = price_history_stats(sales)
+    stats['current_price'] = current_prices(catalog).reindex(stats.index)  # 가격 이력이 있는 게임만
+
+    expected = (stats['regular_price'] * (1 - stats['typical_depth'])).round()
+    stats['expected_price'] = expected
+    near_low = stats['current_price'] <= stats['historical_low'] * (1 + LOW_TOLERANCE)
+    buy_now = near_low | (stats['current_price'] <= expected)
+    stats['verdict'] = np.where(stats['current_price'].isna(), '', np.where(buy_now, BUY_NOW, WAIT))
+
+    # 평균 할인 주기로 다음 할인까지 남은 일수를 어림
+    interval = 365.25 / stats['sales_per_year'].where(stats['sales_per_year'] > 0)
+    stats['expected_wait_days'] = np.where(buy_now, 0, interval.round())
+
+    columns = ['current_price', 'historical_low', 'regular_price', 'typical_depth',
+               'sales_per_year', 'expected_price', 'verdict', 'expected_wait_days', 'observations']
+    return stats[columns]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="구매 적정 가격 추천 배치")
+    parser.add_argument("--sales", default=sales_file)
+    parser.add_argument("--catalog", default=catalog_file)
+    parser.add_argument("--output", default=output_file)
+    args = parser.parse_args()
+
+    with stage("recommend.load") as m:
+        sales = pd.read_csv(args.sales)
+        catalog = pd.read_csv(args.catalog)
+        m["rows_out"] = len(sales)
+
+    with stage("recommend.compute", rows_in=len(sales)) as m:
+        result = recommend(sales, catalog)
+        m["rows_out"] = len(result)
+
+    result.to_csv(args.output, encoding="utf-8-sig")
+    print(f"[완료] {len(result)}개 게임의 추천 결과를 저장했습니다 → {args.output}")
+    write_report("recommend")
+
+
+if __name__ == "__main__":
+    main()
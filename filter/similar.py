@@ -0,0 +1,81 @@
+"""
+비슷한 게임 인덱스 (상세 페이지 '비슷한 할인 게임')
+게임마다 장르 비트셋('장르 코드')을 희소 이진 벡터로 보고 코사인 유사도가 높은 할인 중인 게임 상위 k개를
+데이터를 불러올 때 한 번에 계산해 int32 배열로 저장합니다. 상세 페이지는 배열 한 행만 읽습니다.
+
+- 게임 단위: 같은 게임 키(판매 사이트만 다른 행)는 하나로 묶고, 장르는 행들의 합집합, 대표 행은 최저가 행
+- 유사도: |A ∧ B| / √(|A|·|B|) (비트 AND 후 popcount). 유사도는 장르 코드에만 의존하므로
+  게임 수 × 게임 수가 아니라 서로 다른 장르 코드끼리만 블록 단위로 계산합니다.
+- 후보: 대표 행이 할인 중인 게임. 유사도가 같으면 리뷰 수, 할인율 순
+"""
+import numpy as np
+import pandas as pd
+
+SIMILAR_K = 8
+BLOCK = 512  # 한 번에 유사도를 계산할 장르 코드 수
+
+
+def _groups(keys, names):
+    """행별 게임 묶음 번호. 키가 빈 문자열(영문/숫자 없는 이름)이면 원래 이름으로 묶습니다."""
+    keys = pd.Series(np.asarray(keys, dtype=object))
+    labels = keys.where(keys != '', '\0' + pd.Series(np.asarray(names, dtype=object)).fillna('').astype(str))
+    return pd.factorize(labels)[0].astype(np.int32)
+
+
+def _nearest_codes(query_codes, cand_codes, group_start, group_size, members, limit):
+    """장르 코드마다 유사도 순으로 후보(members 순서)를 최대 limit개 고른 (코드 수 × limit) 배열 (-1: 없음)"""
+    result = np.full((len(query_codes), limit), -1, dtype=np.int32)
+    q_bits = np.bitwise_count(query_codes).astype(np.float32)
+    c_bits = np.bitwise_count(cand_codes).astype(np.float32)
+    for lo in range(0, len(query_codes), BLOCK):
+        block = query_codes[lo:lo + BLOCK]
+        common = np.bitwise_count(block[:, None] & cand_codes[None, :]).astype(np.float32)
+        norm = np.sqrt(q_bits[lo:lo + BLOCK, None] * c_bits[None, :])
+        sim = np.divide(common, norm, out=np.zeros_like(common), where=norm > 0)
+        ranked = np.argsort(-sim, axis=1, kind='stable')
+        # 유사도 순 코드의 후보 수 누적합이 limit에 닿는 곳까지만 펼침
+        reach = np.cumsum(group_size[ranked], axis=1)
+        for i, order in enumerate(ranked):
+            used = min(np.searchsorted(reach[i], limit) + 1, len(order))
+            order = order[:used][sim[i, order[:used]] > 0]
+            picked = np.concatenate([members[group_start[c]:group_start[c] + group_size[c]] for c in order]) \
+                if len(order) else members[:0]
+            result[lo + i, :min(limit, len(picked))] = picked[:limit]
+    return result
+
+
+def build_similar_index(keys, names, codes, sale_price, discount, reviews, k=SIMILAR_K):
+    """
+    반환: (행별 게임 묶음 번호 int32 (행 수,), 묶음별 비슷한 할인 게임의 대표 행 위치 int32 (묶음 수 × k), 없으면 -1)
+    """
+    group = _groups(keys, names)
+    codes = np.asarray(codes, dtype=np.int64)
+    price = np.nan_to_num(np.asarray(sale_price, dtype=float), nan=np.inf)
+    reviews = np.nan_to_num(np.asarray(reviews, dtype=float), nan=0.0)
+
+    # 묶음별 대표 행(최저가), 장르 합집합, 최대 리뷰 수
+    order = np.lexsort((price, group))
+    starts = np.flatnonzero(np.r_[True, np.diff(group[order]) != 0])
+    rep = order[starts]
+    n_groups = len(starts)
+    if n_groups == 0:
+        return group, np.full((0, k), -1, dtype=np.int32)
+    group_code = np.bitwise_or.reduceat(codes[order], starts)
+    group_reviews = np.maximum.reduceat(reviews[order], starts)
+    rep_discount = np.nan_to_num(np.asarray(discount, dtype=float)[rep], nan=0.0)
+
+    # 후보(할인 중인 묶음)를 장르 코드별로 모아 리뷰 수, 할인율 순으로 정렬
+    candidates = np.flatnonzero(rep_discount > 0)
+    cand_codes, cand_inv = np.unique(group_code[candidates], return_inverse=True)
+    members = candidates[np.lexsort((-rep_discount[candidates], -group_reviews[candidates], cand_inv))]
+    group_size = np.bincount(cand_inv, minlength=len(cand_codes))
+    group_start = np.r_[0, np.cumsum(group_size)[:-1]]
+
+    # 장르 코드별 상위 k+1개 (자기 자신이 섞여 있으면 빼고 k개)
+    query_codes, query_inv = np.unique(group_code, return_inverse=True)
+    nearest = _nearest_codes(query_codes, cand_codes, group_start, group_size, members, k + 1)
+    neighbours = nearest[query_inv]
+    is_self = neighbours == np.arange(n_groups)[:, None]
+    neighbours = np.take_along_axis(neighbours, np.argsort(is_self, axis=1, kind='stable'), axis=1)[:, :k]
+    neighbours = np.where(neighbours >= 0, rep[np.maximum(neighbours, 0)], -1).astype(np.int32)
+    return group, neighbours
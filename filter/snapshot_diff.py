@@ -0,0 +1,237 @@
+"""
+게임 목록 스냅샷 비교 / 변경 피드
+정리된 게임 목록(data/cleaned_merged_games_data.csv)이 새로 만들어질 때마다 직전 버전과 비교해
+새 게임, 사라진 판매처, 가격/할인 변경, 그 밖의 정보 변경만 담은 변경 피드(JSON Lines)를 만듭니다.
+
+- 키: 판매처 URL의 sha1 앞 16자리 (URL이 없으면 게임 이름 + 플랫폼)
+- 스냅샷: 키 순서로 정렬해 data/snapshots/<버전>.csv로 보관 (버전 = 정렬된 내용의 sha1, 같은 내용이면 같은 버전)
+  CSV를 CHUNK_ROWS행씩 읽어 정렬한 조각 파일을 만든 뒤 heapq.merge로 합치므로 메모리는 조각 하나 크기로 제한됩니다.
+- 비교: 정렬된 두 스냅샷을 한 행씩 동시에 읽는 병합 조인 (두 파일을 메모리에 올리지 않음)
+
+변경 피드 레코드 (data/changes/<시각>_<이전 버전>_<새 버전>.jsonl, 한 줄에 하나):
+    {"op": "added",    "key", "url", "row": {새 행 전체}}
+    {"op": "removed",  "key", "url", "row": {게임 이름, 플랫폼 이름}}
+    {"op": "price",    "key", "url", "row": {게임 이름, 플랫폼 이름, 원가, 할인가, 할인율}, "fields": {컬럼: [이전, 이후]}}
+    {"op": "metadata", "key", "url", "row": (price와 같음), "fields": {컬럼: [이전, 이후]}}
+
+    python -m filter.snapshot_diff                       # filter_data 다음에 실행
+    python -m filter.alerts --changes <피드 파일>         # 바뀐 게임의 규칙만 알림 평가
+"""
+import argparse
+import csv
+import glob
+import hashlib
+import heapq
+import json
+import os
+import shutil
+import tempfile
+from collections import Counter
+from datetime import datetime
+
+import pandas as pd
+
+from profiling import stage, write_report
+
+catalog_file = "data/cleaned_merged_games_data.csv"
+snapshot_dir = "data/snapshots"
+changes_dir = "data/changes"
+
+CHUNK_ROWS = 50000  # 정렬 조각 하나의 행 수 (메모리 상한)
+KEEP_SNAPSHOTS = 2  # 보관할 스냅샷 수 (최신 + 직전)
+
+KEY = '_key'
+URL_FIELD = '사이트 URL'
+PRICE_FIELDS = ['원가', '할인가', '할인율']
+ROW_FIELDS = ['게임 이름', '플랫폼 이름', *PRICE_FIELDS]
+OPS = ['added', 'removed', 'price', 'metadata']
+
+
+def row_key(url, name='', platform=''):
+    """판매처 URL(없으면 게임 이름 + 플랫폼)의 sha1 앞 16자리"""
+    text = url if url else f"{name}\0{platform}"
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+
+def _sorted_runs(catalog_path, directory, chunk_rows):
+    """CSV를 조각 단위로 읽어 키 순서로 정렬한 조각 파일들을 만듭니다. 반환: (컬럼 목록, 조각 파일 경로 목록)"""
+    columns, runs = None, []
+    for chunk in pd.read_csv(catalog_path, dtype=str, keep_default_na=False, chunksize=chunk_rows):
+        columns = list(chunk.columns)
+        names = chunk['게임 이름'] if '게임 이름' in chunk.columns else pd.Series('', index=chunk.index)
+        platforms = chunk['플랫폼 이름'] if '플랫폼 이름' in chunk.columns else pd.Series('', index=chunk.index)
+        urls = chunk[URL_FIELD] if URL_FIELD in chunk.columns else pd.Series('', index=chunk.index)
+        chunk.insert(0, KEY, [row_key(u, n, p) for u, n, p in zip(urls, names, platforms)])
+        run = os.path.join(directory, f"run-{len(runs):05d}.csv")
+        chunk.sort_values(KEY, kind='stable').to_csv(run, index=False, header=False)
+        runs.append(run)
+    return columns or [], runs
+
+
+def write_snapshot(catalog_path=catalog_file, directory=snapshot_dir, chunk_rows=CHUNK_ROWS):
+    """
+    게임 목록을 키 순서로 정렬한 스냅샷을 만들고 (버전, 경로, 행 수)를 반환합니다.
+    같은 키의 행이 여러 개면 파일에서 마지막 행만 남깁니다.
+    """
+    os.makedirs(directory, exist_ok=True)
+    work = tempfile.mkdtemp(prefix="sort-", dir=directory)
+    try:
+        columns, runs = _sorted_runs(catalog_path, work, chunk_rows)
+        files = [open(run, newline='', encoding='utf-8') for run in runs]
+        merged_path = os.path.join(work, "merged.csv")
+        digest, rows = hashlib.sha1(), 0
+        try:
+            # heapq.merge는 키가 같으면 앞 조각부터 내보내므로, 연속된 같은 키 중 마지막이 파일상 마지막 행
+            merged = heapq.merge(*(csv.reader(f) for f in files), key=lambda r: r[0])
+            with open(merged_path, 'w', newline='', encoding='utf-8') as out:
+                writer = csv.writer(out)
+                writer.writerow([KEY, *columns])
+                previous = None
+                for row in merged:
+                    if previous is not None and previous[0] != row[0]:
+                        writer.writerow(previous)
+                        digest.update(json.dumps(previous, ensure_ascii=False).encode('utf-8'))
+                        rows += 1
+                    previous = row
+                if previous is not None:
+                    writer.writerow(previous)
+                    digest.update(json.dumps(previous, ensure_ascii=False).encode('utf-8'))
+                    rows += 1
+        finally:
+            for f in files:
+                f.close()
+        digest.update(json.dumps(columns, ensure_ascii=False).encode('utf-8'))
+        version = digest.hexdigest()[:12]
+        path = os.path.join(directory, f"{version}.csv")
+        os.replace(merged_path, path)
+        return version, path, rows
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def _records(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        yield from csv.DictReader(f)
+
+
+def diff_snapshots(old_path, new_path):
+    """정렬된 두 스냅샷을 한 행씩 병합 조인하며 변경 레코드(dict)를 차례로 내보냅니다."""
+    old_rows, new_rows = _records(old_path), _records(new_path)
+    old, new = next(old_rows, None), next(new_rows, None)
+    while old is not None or new is not None:
+        if new is None or (old is not None and old[KEY] < new[KEY]):
+            yield _record('removed', old, ['게임 이름', '플랫폼 이름'])
+            old = next(old_rows, None)
+        elif old is None or new[KEY] < old[KEY]:
+            yield _record('added', new, [c for c in new if c != KEY])
+            new = next(new_rows, None)
+        else:
+            # 새 스냅샷의 컬럼 순서, 그 뒤에 이전 스냅샷에만 있던 컬럼 순서 (실행마다 같은 피드)
+            columns = [*new, *(c for c in old if c not in new)]
+            changed = {c: [old.get(c, ''), new.get(c, '')] for c in columns
+                       if c != KEY and old.get(c, '') != new.get(c, '')}
+            price = {c: v for c, v in changed.items() if c in PRICE_FIELDS}
+            metadata = {c: v for c, v in changed.items() if c not in PRICE_FIELDS}
+            if price:
+                yield {**_record('price', new, ROW_FIELDS), 'fields': price}
+            if metadata:
+                yield {**_record('metadata', new, ROW_FIELDS), 'fields': metadata}
+            old, new = next(old_rows, None), next(new_rows, None)
+
+
+def _record(op, row, fields):
+    return {'op': op, 'key': row[KEY], 'url': row.get(URL_FIELD, ''), 'row': {c: row.get(c, '') for c in fields}}
+
+
+def write_feed(changes, path):
+    """변경 레코드를 JSON Lines로 쓰고 종류별 개수를 반환합니다."""
+    counts = Counter()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        for change in changes:
+            f.write(json.dumps(change, ensure_ascii=False) + "\n")
+            counts[change['op']] += 1
+    return {op: counts[op] for op in OPS}
+
+
+def read_changes(path, ops=None):
+    """변경 피드를 한 줄씩 읽습니다. ops를 주면 해당 종류만."""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            change = json.loads(line)
+            if ops is None or change['op'] in ops:
+                yield change
+
+
+def changed_rows(path, ops=('added', 'price')):
+    """변경 피드에서 새로 생기거나 가격이 바뀐 판매처의 현재 행을 게임 목록 형식 데이터프레임으로 반환합니다."""
+    rows = [{**change['row'], URL_FIELD: change['url']} for change in read_changes(path, ops)]
+    return pd.DataFrame(rows, columns=[*ROW_FIELDS, URL_FIELD])
+
+
+def latest_feed(directory=changes_dir):
+    """가장 최근 변경 피드 경로 (없으면 None)"""
+    feeds = sorted(glob.glob(os.path.join(directory, "*.jsonl")))
+    return feeds[-1] if feeds else None
+
+
+def _latest_pointer(directory):
+    return os.path.join(directory, "LATEST")
+
+
+def previous_snapshot(directory=snapshot_dir):
+    """직전 실행에서 만든 스냅샷의 (버전, 경로). 없으면 (None, None)"""
+    try:
+        with open(_latest_pointer(directory), encoding='utf-8') as f:
+            version = f.read().strip()
+    except FileNotFoundError:
+        return None, None
+    path = os.path.join(directory, f"{version}.csv")
+    return (version, path) if os.path.exists(path) else (None, None)
+
+
+def promote(version, directory=snapshot_dir, keep=KEEP_SNAPSHOTS):
+    """새 스냅샷을 최신으로 기록하고 오래된 스냅샷을 keep개만 남기고 지웁니다."""
+    tmp = _latest_pointer(directory) + ".tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(version)
+    os.replace(tmp, _latest_pointer(directory))
+    snapshots = sorted(glob.glob(os.path.join(directory, "*.csv")), key=os.path.getmtime, reverse=True)
+    current = os.path.join(directory, f"{version}.csv")
+    for path in [p for p in snapshots if p != current][keep - 1:]:
+        os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="게임 목록 스냅샷 비교 / 변경 피드 생성")
+    parser.add_argument("--catalog", default=catalog_file)
+    parser.add_argument("--snapshots", default=snapshot_dir)
+    parser.add_argument("--changes", default=changes_dir)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="정렬 조각 하나의 행 수 (메모리 상한)")
+    args = parser.parse_args()
+
+    old_version, old_path = previous_snapshot(args.snapshots)
+    with stage("snapshot.sort") as m:
+        version, path, rows = write_snapshot(args.catalog, args.snapshots, args.chunk_rows)
+        m["rows_out"] = rows
+
+    if old_version == version:
+        print(f"[완료] 변경 없음 (버전 {version}, {rows}행)")
+    elif old_path is None:
+        promote(version, args.snapshots)
+        print(f"[완료] 첫 스냅샷 {version} ({rows}행) → {path} (다음 실행부터 변경 피드 생성)")
+    else:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        feed = os.path.join(args.changes, f"{stamp}_{old_version}_{version}.jsonl")
+        with stage("snapshot.diff", rows_in=rows) as m:
+            counts = write_feed(diff_snapshots(old_path, path), feed)
+            m["rows_out"] = sum(counts.values())
+            m["changes"] = counts
+        promote(version, args.snapshots)
+        summary = ", ".join(f"{op} {n}" for op, n in counts.items())
+        print(f"[완료] {old_version} → {version}: {summary} → {feed}")
+    write_report("snapshot_diff")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import pandas as pd
+
+# 판매 사이트 키 → (URL에 포함되는 도메인, 화면 표시 이름)
+STORES = {
+    'steam': ('store.steampowered.com', 'Steam'),
+    'directg': ('directg.net', 'Direct Games'),
+    'epicgames': ('epicgames.com', 'Epic Games'),
+    'greenmangaming': ('greenmangaming.com', 'Green Man Gaming'),
+}
+
+# 판매 사이트 로고 (filter/thumbnails.py가 로컬 썸네일로 캐시)
+STORE_LOGOS = {
+    'steam': 'https://upload.wikimedia.org/wikipedia/commons/thumb/8/83/Steam_icon_logo.svg/1024px-Steam_icon_logo.svg.png',
+    'directg': 'https://avatars.fastly.steamstatic.com/9e83477d3d1484489b83970cfd7a1051f886f688_full.jpg',
+    'epicgames': 'https://upload.wikimedia.org/wikipedia/commons/thumb/3/31/Epic_Games_logo.svg/512px-Epic_Games_logo.svg.png',
+    'greenmangaming': 'https://mcvuk.com/wp-content/uploads/green-man-gaming-logo_rgb_light-bg_copypng.png',
+}
+
+# 판매 사이트별로 허용되는 '플랫폼 이름' (다이렉트 게임즈는 DRM 플랫폼을 기록함)
+STORE_PLATFORMS = {
+    'steam': {'Steam'},
+    'directg': {'Steam', 'Epic Games', 'Rockstar'},
+    'epicgames': {'Epic Games'},
+    'greenmangaming': {'Green Man Gaming'},
+}
+
+
+def classify_store(urls):
+    """
+    사이트 URL 시리즈를 판매 사이트 키(categorical)로 분류합니다.
+    어느 사이트에도 해당하지 않으면 NaN입니다.
+    """
+    urls = urls.fillna('').astype(str).str.lower()
+    store = pd.Series(pd.NA, index=urls.index, dtype=object)
+    for key, (domain, _) in STORES.items():
+        store = store.mask(store.isna() & urls.str.contains(domain, regex=False), key)
+    return store.astype(pd.CategoricalDtype(list(STORES)))
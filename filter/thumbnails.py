@@ -0,0 +1,134 @@
+"""
+게임 이미지/스토어 로고 썸네일 캐시
+파이프라인 단계에서 '이미지 URL'과 스토어 로고를 한 번 내려받아 작은 WebP 썸네일로 줄이고,
+내용 해시(sha1)를 파일 이름으로 static/thumbs/ 아래에 저장합니다.
+원본 URL → 썸네일 파일 매핑은 data/thumbnail_manifest.csv에 기록되며, 이미 받은 URL은 다시 받지 않습니다.
+
+파일 이름이 내용 해시이므로 내용이 바뀌면 주소도 바뀝니다. 그래서 앱(Streamlit 정적 파일, ?v=<해시>)과
+API(/thumbs/)는 썸네일을 만료 기간을 길게 잡아 제공할 수 있습니다.
+
+    python -m filter.thumbnails --workers 8
+"""
+import argparse
+import hashlib
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import requests
+from PIL import Image
+
+from filter.stores import STORE_LOGOS
+from profiling import stage, track, write_report
+
+catalog_file = "data/cleaned_merged_games_data.csv"
+thumbnail_dir = "static/thumbs"
+manifest_file = "data/thumbnail_manifest.csv"
+
+STATIC_URL = "app/static/thumbs"   # Streamlit 정적 파일 경로 (.streamlit/config.toml의 enableStaticServing)
+GAME_WIDTH = 460                   # 게임 카드/상세 이미지 최대 너비(px)
+LOGO_WIDTH = 200                   # 스토어 로고 최대 너비(px)
+QUALITY = 80
+
+HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+
+def make_thumbnail(content, width):
+    """이미지 바이트를 최대 너비 width의 WebP 바이트로 줄입니다."""
+    with Image.open(io.BytesIO(content)) as img:
+        img = img.convert("RGBA" if img.mode in ("RGBA", "LA", "P") else "RGB")
+        if img.width > width:
+            img = img.resize((width, round(img.height * width / img.width)), Image.LANCZOS)
+        out = io.BytesIO()
+        img.save(out, "WEBP", quality=QUALITY, method=4)
+        return out.getvalue()
+
+
+def store_thumbnail(data, directory=thumbnail_dir):
+    """썸네일을 내용 해시 이름으로 저장하고 상대 경로('ab/abcd....webp')를 반환합니다."""
+    digest = hashlib.sha1(data).hexdigest()
+    name = f"{digest[:2]}/{digest}.webp"
+    path = os.path.join(directory, name)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp-{os.getpid()}"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    return name
+
+
+def fetch_thumbnail(session, url, width, directory=thumbnail_dir):
+    """URL 하나를 받아 썸네일로 저장합니다. 실패하면 None (앱은 원본 URL을 그대로 사용)."""
+    try:
+        with track("thumbnails.fetch"):
+            response = session.get(url, headers=HEADERS, timeout=15)
+            response.raise_for_status()
+        with track("thumbnails.resize"):
+            return store_thumbnail(make_thumbnail(response.content, width), directory)
+    except Exception as e:
+        print(f"[실패] {url} → {e}")
+        return None
+
+
+def load_manifest(path=manifest_file):
+    """원본 URL → 썸네일 상대 경로 dict. 매니페스트가 없으면 빈 dict."""
+    try:
+        manifest = pd.read_csv(path, dtype=str)
+    except FileNotFoundError:
+        return {}
+    return dict(zip(manifest["url"], manifest["thumbnail"]))
+
+
+def save_manifest(manifest, path=manifest_file):
+    frame = pd.DataFrame(sorted(manifest.items()), columns=["url", "thumbnail"])
+    frame.to_csv(path, index=False, encoding="utf-8-sig")
+
+
+def thumbnail_file(name, directory=thumbnail_dir):
+    """썸네일의 로컬 파일 경로 (st.image용)."""
+    return os.path.join(directory, name)
+
+
+def thumbnail_url(name):
+    """Streamlit 정적 파일 주소. ?v=가 있으면 Tornado가 장기 캐시 헤더를 붙입니다."""
+    digest = os.path.splitext(os.path.basename(name))[0]
+    return f"{STATIC_URL}/{name}?v={digest[:10]}"
+
+
+def prefetch(urls, width, manifest, workers=8, directory=thumbnail_dir):
+    """매니페스트에 없는 URL만 병렬로 받아 manifest를 갱신합니다. 새로 저장한 수를 반환합니다."""
+    pending = [u for u in dict.fromkeys(urls) if isinstance(u, str) and u.startswith("http") and u not in manifest]
+    with requests.Session() as session, ThreadPoolExecutor(max_workers=workers) as executor:
+        names = executor.map(lambda u: fetch_thumbnail(session, u, width, directory), pending)
+        added = 0
+        for url, name in zip(pending, names):
+            if name:
+                manifest[url] = name
+                added += 1
+    return added
+
+
+def main():
+    parser = argparse.ArgumentParser(description="게임 이미지/스토어 로고 썸네일 캐시 생성")
+    parser.add_argument("--catalog", default=catalog_file)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--refresh", action="store_true", help="기존 매니페스트를 무시하고 전부 다시 받기")
+    args = parser.parse_args()
+
+    manifest = {} if args.refresh else load_manifest()
+    urls = pd.read_csv(args.catalog)["이미지 URL"].dropna().tolist()
+
+    with stage("thumbnails.logos", rows_in=len(STORE_LOGOS)) as m:
+        m["rows_out"] = m["requests"] = prefetch(STORE_LOGOS.values(), LOGO_WIDTH, manifest, args.workers)
+    with stage("thumbnails.games", rows_in=len(urls)) as m:
+        m["rows_out"] = m["requests"] = prefetch(urls, GAME_WIDTH, manifest, args.workers)
+
+    save_manifest(manifest)
+    print(f"[완료] 썸네일 {len(manifest)}개 → {thumbnail_dir} (매니페스트: {manifest_file})")
+    write_report("thumbnails")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+병합 데이터 품질 검증
+규칙은 (이름, 설명, 검사 함수) 목록으로 선언하며, 각 검사 함수는 위반한 행에 True인
+불리언 시리즈를 반환합니다. 모든 규칙을 한 번에 계산한 뒤 하나라도 위반한 행은 격리 파일로 분리합니다.
+"""
+import json
+
+import pandas as pd
+
+from filter.stores import STORE_PLATFORMS, classify_store
+
+quarantine_file = "data/quarantine_games_data.csv"
+report_file = "data/validation_report.json"
+
+MAX_PRICE = 1_000_000         # 원화 기준 가격 상한
+DISCOUNT_TOLERANCE = 2        # 계산된 할인율과의 허용 오차 (%p, 스토어별 반올림 차이)
+
+PRICE_COLUMNS = ['원가', '할인가', '할인율']
+HTML_PATTERN = r'<[^>]+>'
+
+
+def strip_html(df, columns=PRICE_COLUMNS):
+    """가격 컬럼에 남은 HTML 태그와 중복 공백을 한 번에 제거합니다."""
+    df = df.copy()
+    for col in columns:
+        if col in df.columns and df[col].dtype == object:
+            df[col] = (
+                df[col].str.replace(HTML_PATTERN, '', regex=True)
+                .str.replace(r'\s+', ' ', regex=True)
+                .str.strip()
+            )
+    return df
+
+
+def _numeric(series):
+    return pd.to_numeric(series.astype(str).str.replace('%', '').str.replace(',', ''), errors='coerce')
+
+
+def _prepare(df):
+    """규칙들이 공유하는 숫자형 컬럼을 한 번만 계산합니다."""
+    return pd.DataFrame({
+        'original': _numeric(df['원가']),
+        'sale': _numeric(df['할인가']),
+        'discount': _numeric(df['할인율']),
+        'store': classify_store(df['사이트 URL']),
+        'platform': df['플랫폼 이름'],
+    }, index=df.index)
+
+
+def _price_missing(df, num):
+    return num['original'].isna() | num['sale'].isna()
+
+def _price_range(df, num):
+    out_of_range = lambda s: (s < 0) | (s > MAX_PRICE)
+    return out_of_range(num['original']) | out_of_range(num['sale'])
+
+def _discount_range(df, num):
+    return (num['discount'] < 0) | (num['discount'] > 100)
+
+def _sale_above_original(df, num):
+    return num['sale'] > num['original']
+
+def _discount_mismatch(df, num):
+    expected = (1 - num['sale'] / num['original'].where(num['original'] > 0)) * 100
+    return (expected - num['discount']).abs() > DISCOUNT_TOLERANCE
+
+def _url_platform_mismatch(df, num):
+    allowed = pd.Series(False, index=df.index)
+    for store, platforms in STORE_PLATFORMS.items():
+        allowed |= (num['store'] == store) & num['platform'].isin(platforms)
+    return ~allowed
+
+def _html_residue(df, num):
+    columns = [col for col in ['게임 이름', '장르', *PRICE_COLUMNS] if col in df.columns]
+    residue = pd.Series(False, index=df.index)
+    for col in columns:
+        residue |= df[col].astype(str).str.contains(HTML_PATTERN, regex=True, na=False)
+    return residue
+
+
+RULES = [
+    ('price_missing', '원가 또는 할인가를 숫자로 읽을 수 없음', _price_missing),
+    ('price_range', f'가격이 0 ~ {MAX_PRICE:,}원 범위를 벗어남', _price_range),
+    ('discount_range', '할인율이 0 ~ 100% 범위를 벗어남', _discount_range),
+    ('sale_above_original', '할인가가 원가보다 큼', _sale_above_original),
+    ('discount_mismatch', f'원가/할인가로 계산한 할인율이 할인율과 {DISCOUNT_TOLERANCE}%p 넘게 다름', _discount_mismatch),
+    ('url_platform_mismatch', '사이트 URL의 판매처와 플랫폼 이름이 맞지 않음', _url_platform_mismatch),
+    ('html_residue', 'HTML 태그가 남아 있음', _html_residue),
+]
+
+
+def validate(df, rules=RULES):
+    """
+    모든 규칙을 적용해 (통과 데이터, 격리 데이터, 규칙별 위반 수)를 반환합니다.
+    격리 데이터에는 위반한 규칙 이름을 모은 '위반 규칙' 컬럼이 추가됩니다.
+    """
+    num = _prepare(df)
+    violations = pd.DataFrame(
+        {name: check(df, num).fillna(False).astype(bool) for name, _, check in rules},
+        index=df.index,
+    )
+    bad = violations.any(axis=1)
+
+    quarantined = df[bad].copy()
+    failed = violations[bad]
+    quarantined['위반 규칙'] = failed.apply(lambda row: ', '.join(failed.columns[row.to_numpy()]), axis=1) if bad.any() else ''
+
+    counts = {name: int(violations[name].sum()) for name, _, _ in rules}
+    return df[~bad], quarantined, counts
+
+
+def write_report(counts, total, quarantined, path=report_file, rules=RULES):
+    """규칙별 위반 수를 JSON으로 저장하고 요약을 출력합니다."""
+    report = {
+        'total_rows': int(total),
+        'quarantined_rows': int(quarantined),
+        'rules': {name: {'description': desc, 'violations': counts[name]} for name, desc, _ in rules},
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"[검증] 전체 {total}개 중 {quarantined}개 격리")
+    for name, desc, _ in rules:
+        print(f"  - {name}: {counts[name]}개 ({desc})")
+    return report
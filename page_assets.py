@@ -0,0 +1,184 @@
+"""
+페이지 스타일(CSS) 등록
+화면 요소마다 <style> 블록을 반복해서 보내지 않도록, 스타일시트를 이름으로 등록해 두고
+한 번의 화면 실행(rerun)에서 처음 필요할 때 한 번만 보냅니다. 카드/행 마크업은 클래스 이름만 참조합니다.
+
+    page_assets.begin()            # main() 시작 시 (실행마다)
+    page_assets.use("price")       # 해당 스타일이 필요한 요소를 그리기 전에
+"""
+import streamlit as st
+
+_SENT_KEY = "_page_assets_sent"
+
+STYLES = {
+    # 대시보드 TOP 10 상세 버튼
+    "detail-button": """
+        .stButton > button {
+            background-color: #007bff;
+            color: white;
+            border: none;
+        }
+        .stButton > button:hover {
+            background-color: #0056b3;
+            color: white;
+        }
+    """,
+    # 대시보드/상세 페이지 가격 표시
+    "price": """
+        .price-row {
+            display: flex;
+            justify-content: flex-start;
+            align-items: center;
+            gap: 15px;
+            height: 100%;
+        }
+        .price-row.right { justify-content: flex-end; }
+        .price-row.right .price-block { text-align: right; }
+        .price-badge {
+            background-color: #d43f3a;
+            color: white;
+            border-radius: 5px;
+            padding: 3px 8px;
+            font-weight: bold;
+            font-size: 0.9em;
+        }
+        .price-was { font-size: 0.8em; color: grey; }
+        .price-now { font-size: 1.2em; font-weight: bold; }
+        .price-row.large .price-was { font-size: 1.1em; }
+        .price-row.large .price-now { font-size: 1.8em; }
+        .price-row.large strong.price-now { color: #d32f2f; }
+    """,
+    # 전체 데이터 보기 게임 카드
+    "game-card": """
+        .game-card {
+            border: 1px solid #e0e0e0;
+            border-radius: 10px;
+            padding: 15px;
+            margin-bottom: 20px;
+            transition: all 0.3s ease;
+            display: flex;
+            flex-direction: column;
+            height: 420px;
+            position: relative;
+        }
+        .game-card:hover {
+            box-shadow: 0 4px 8px rgba(0,0,0,0.15);
+            transform: translateY(-2px);
+            background-color: #f8f9fa;
+            border-color: #5B7C99;
+        }
+        .game-card img {
+            width: 100%;
+            height: 150px;
+            object-fit: cover;
+            border-radius: 8px;
+        }
+        .game-title {
+            font-weight: bold;
+            font-size: 16px;
+            margin-top: 10px;
+            height: 40px;
+            overflow: hidden;
+            display: -webkit-box;
+            -webkit-line-clamp: 2;
+            -webkit-box-orient: vertical;
+        }
+        .game-genre {
+            color: #666;
+            font-size: 14px;
+            margin-bottom: 8px;
+            height: 20px;
+            overflow: hidden;
+            text-overflow: ellipsis;
+            white-space: nowrap;
+        }
+        .price-container {
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            margin-top: auto;
+            padding-top: 10px;
+            height: 60px;
+        }
+        .price-info {
+            display: flex;
+            align-items: center;
+            gap: 10px;
+        }
+        .original-price {
+            color: #999;
+            text-decoration: line-through;
+            font-size: 14px;
+        }
+        .sale-price {
+            font-weight: bold;
+            font-size: 18px;
+            color: #d32f2f;
+        }
+        .discount-badge {
+            background-color: #d43f3a;
+            color: white;
+            border-radius: 4px;
+            padding: 2px 6px;
+            font-size: 12px;
+            font-weight: bold;
+        }
+        /* 상세보기 버튼 스타일 */
+        .stButton > button {
+            background-color: #007bff !important;
+            color: white !important;
+            border: none !important;
+        }
+        .stButton > button:hover {
+            background-color: #0056b3 !important;
+            color: white !important;
+        }
+    """,
+    # 상세 페이지 사이트별 가격 비교 행
+    "store-row": """
+        .store-badge {
+            background-color: #dc3545;
+            color: white;
+            border-radius: 4px;
+            padding: 2px 6px;
+            font-size: 12px;
+            font-weight: bold;
+        }
+        .store-was { color: #888; text-decoration: line-through; font-size: 13px; margin-left: 6px; }
+        .store-sale { font-size: 15px; font-weight: bold; color: #d32f2f; margin-left: 10px; }
+        .store-price { font-size: 15px; font-weight: bold; }
+        .store-none { color: #999; }
+        .custom-link-button {
+            display: inline-block;
+            background-color: #007bff;
+            color: white !important;
+            padding: 6px 10px;
+            border-radius: 6px;
+            text-decoration: none !important;
+            font-size: 13px;
+            font-weight: bold;
+            text-align: center;
+            transition: background-color 0.2s;
+            width: 100%;
+        }
+        .custom-link-button:hover {
+            background-color: #0056b3;
+        }
+    """,
+}
+
+
+def begin():
+    """새 화면 실행을 시작합니다. 이전 실행에서 보낸 스타일은 화면과 함께 사라지므로 기록을 비웁니다."""
+    st.session_state[_SENT_KEY] = set()
+
+
+def use(*names):
+    """아직 이번 실행에서 보내지 않은 스타일만 하나의 <style> 블록으로 보냅니다."""
+    sent = st.session_state.setdefault(_SENT_KEY, set())
+    pending = [name for name in names if name not in sent]
+    if not pending:
+        return
+    css = "".join(STYLES[name] for name in pending)
+    st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
+    sent.update(pending)
@@ -0,0 +1,165 @@
+"""
+파이프라인 단계별 성능 측정
+크롤링 → 병합 → 필터 → 앱 로딩의 각 단계를 감싸 벽시계 시간, CPU 시간, 최대 메모리(RSS),
+입력/출력 행 수, 초당 요청 수를 기록하고 실행 리포트(JSON + 요약 텍스트)로 저장합니다.
+
+    with stage("merge.normalize", rows_in=len(df)) as m:
+        merged = ...
+        m["rows_out"] = len(merged)
+    write_report("merge")
+
+리포트는 파이프라인 진입점(main)에서만 씁니다. 라이브러리 코드(catalog 등)는 stage()로 기록만 남기고,
+앱처럼 리포트를 쓰지 않는 장기 실행 프로세스에서는 최근 MAX_STAGES개만 유지합니다.
+"""
+import glob
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource  # Windows에는 없음
+except ImportError:
+    resource = None
+
+report_dir = "data/reports"
+MAX_STAGES = 10000
+
+_lock = threading.Lock()
+_stages = deque(maxlen=MAX_STAGES)
+_counters = {}
+_collecting = 0
+
+
+def _cpu_seconds():
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def peak_rss_mb():
+    """현재 프로세스(와 종료된 자식 프로세스)의 최대 RSS를 MB 단위로 반환합니다."""
+    if resource is None:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return round(peak / 1024, 1)  # 리눅스 기준 KB 단위
+
+
+@contextmanager
+def stage(name, rows_in=None):
+    """
+    블록 하나를 한 단계로 측정합니다.
+    yield되는 dict에 rows_out, requests 값을 채우면 리포트에 함께 기록됩니다.
+    예외로 끝난 단계는 기록하지 않습니다. (다음 리포트에 섞이지 않도록)
+    """
+    record = {"stage": name, "rows_in": rows_in, "rows_out": None, "requests": None}
+    wall_start, cpu_start = time.perf_counter(), _cpu_seconds()
+    yield record
+    wall = time.perf_counter() - wall_start
+    record["wall_s"] = round(wall, 4)
+    record["cpu_s"] = round(_cpu_seconds() - cpu_start, 4)
+    record["peak_rss_mb"] = peak_rss_mb()
+    record["requests_per_s"] = round(record["requests"] / wall, 2) if record["requests"] and wall > 0 else None
+    with _lock:
+        _stages.append(record)
+
+
+@contextmanager
+def track(name):
+    """
+    스레드 안에서 반복되는 짧은 구간(페이지 요청, 파싱 등)의 시간을 누적합니다.
+    리포트에는 호출 횟수와 합계/평균 시간으로 기록됩니다.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        with _lock:
+            calls, total = _counters.get(name, (0, 0.0))
+            _counters[name] = (calls + 1, total + elapsed)
+
+
+@contextmanager
+def collect():
+    """
+    블록 안에서 호출되는 write_report는 저장/초기화하지 않고 기록을 계속 모읍니다.
+    여러 스크립트의 단계를 한 실행 리포트로 묶을 때(벤치마크 등) 사용합니다.
+    """
+    global _collecting
+    _collecting += 1
+    try:
+        yield
+    finally:
+        _collecting -= 1
+
+
+def reset():
+    with _lock:
+        _stages.clear()
+        _counters.clear()
+
+
+def _previous_report(run_name, directory):
+    paths = sorted(glob.glob(os.path.join(directory, f"{run_name}_*.json")))
+    if not paths:
+        return None
+    with open(paths[-1], encoding="utf-8") as f:
+        return json.load(f)
+
+
+def summarize(report, previous=None):
+    """사람이 읽을 요약 표를 만듭니다. 이전 실행이 있으면 단계별 시간 변화율을 함께 표시합니다."""
+    prev_wall = {s["stage"]: s["wall_s"] for s in previous["stages"]} if previous else {}
+    lines = [f"[{report['run']}] {report['started_at']} (총 {report['total_wall_s']}s)"]
+    lines.append(f"{'단계':<40}{'wall(s)':>10}{'cpu(s)':>10}{'RSS(MB)':>10}{'in':>9}{'out':>9}{'req/s':>9}{'변화':>9}")
+    for s in report["stages"]:
+        delta = ""
+        if prev_wall.get(s["stage"]):
+            delta = f"{(s['wall_s'] / prev_wall[s['stage']] - 1) * 100:+.0f}%"
+        fmt = lambda v: "-" if v is None else v
+        lines.append(
+            f"{s['stage']:<40}{s['wall_s']:>10}{s['cpu_s']:>10}{fmt(s['peak_rss_mb']):>10}"
+            f"{fmt(s['rows_in']):>9}{fmt(s['rows_out']):>9}{fmt(s['requests_per_s']):>9}{delta:>9}"
+        )
+    for name, c in report["counters"].items():
+        lines.append(f"  · {name}: {c['calls']}회, 합계 {c['total_s']}s, 평균 {c['mean_s']}s")
+    return "\n".join(lines)
+
+
+def write_report(run_name, directory=report_dir):
+    """
+    지금까지 기록된 단계를 '<run_name>_<시각>.json'과 '.txt' 요약으로 저장하고 요약을 출력합니다.
+    기록은 저장 후 초기화됩니다. collect() 블록 안에서는 아무것도 하지 않습니다.
+    """
+    if _collecting:
+        return None
+    with _lock:
+        stages, counters = list(_stages), dict(_counters)
+    report = {
+        "run": run_name,
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "total_wall_s": round(sum(s["wall_s"] for s in stages), 4),
+        "stages": stages,
+        "counters": {
+            name: {"calls": calls, "total_s": round(total, 4), "mean_s": round(total / calls, 4)}
+            for name, (calls, total) in counters.items()
+        },
+    }
+
+    os.makedirs(directory, exist_ok=True)
+    previous = _previous_report(run_name, directory)
+    summary = summarize(report, previous)
+
+    base = os.path.join(directory, f"{run_name}_{datetime.now():%Y%m%d_%H%M%S}")
+    with open(base + ".json", "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    with open(base + ".txt", "w", encoding="utf-8") as f:
+        f.write(summary + "\n")
+
+    print(summary)
+    reset()
+    return report
@@ -0,0 +1,179 @@
+"""
+Streamlit 앱 요청(rerun) 단위 지연 시간 측정
+main() 한 번의 실행을 하나의 요청으로 보고, 그 안의 데이터 로딩/페이지 렌더링/Plotly 직렬화 구간을
+페이지별로 모아 p50/p95를 계산합니다. 실행마다 한 줄씩 'app.latency' 로거로 기록하고,
+숨겨진 관리 페이지(?admin=1)에서 집계와 최근 cProfile 결과를 볼 수 있습니다.
+
+    @request_metrics.timed_rerun
+    def main():
+        with request_metrics.timed("load_data"):
+            ...
+        request_metrics.set_page("대시보드")
+
+    @request_metrics.timed("render_dashboard")
+    def render_dashboard(df, genres):
+        ...
+
+앱 프로세스 안의 모든 세션이 같은 집계를 공유하며, 페이지·구간별 최근 WINDOW개 측정값만 보관합니다.
+cProfile 기록은 관리 페이지에서 켜거나 APP_PROFILE=1 환경 변수로 켭니다. (켜져 있는 동안 모든 실행에 적용)
+"""
+import cProfile
+import functools
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import ContextDecorator
+
+import numpy as np
+import pandas as pd
+
+WINDOW = 1000          # 페이지·구간별로 보관하는 최근 측정 수
+PROFILE_LINES = 40     # cProfile 결과에서 보여줄 함수 수
+TOTAL = "(전체)"
+
+logger = logging.getLogger("app.latency")
+if not logger.handlers:
+    _handler = logging.StreamHandler(sys.stderr)
+    _handler.setFormatter(logging.Formatter("%(asctime)s [latency] %(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+_lock = threading.Lock()
+_samples = defaultdict(lambda: deque(maxlen=WINDOW))   # (page, phase) → 초 단위 측정값
+_recent = deque(maxlen=200)                             # 최근 로그 줄
+_profiles = {}                                          # page → 마지막 cProfile 요약
+_local = threading.local()                              # 세션 스크립트 스레드별 현재 실행
+_profiling = os.environ.get("APP_PROFILE") == "1"
+
+
+class _Rerun:
+    def __init__(self):
+        self.page = None
+        self.phases = {}   # 구간 이름 → 이번 실행에서의 합계(초)
+        self.start = time.perf_counter()
+        self.profiler = None
+        if _profiling:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+                self.profiler = profiler
+            except ValueError:
+                pass  # 다른 세션이 프로파일링 중 (파이썬 3.12+는 동시에 하나만 가능)
+
+
+def _current():
+    return getattr(_local, "rerun", None)
+
+
+def enable_profiling(enabled):
+    global _profiling
+    _profiling = bool(enabled)
+
+
+def profiling_enabled():
+    return _profiling
+
+
+def set_page(page):
+    """현재 실행을 어느 페이지로 집계할지 지정합니다."""
+    rerun = _current()
+    if rerun is not None:
+        rerun.page = page
+
+
+class timed(ContextDecorator):
+    """
+    구간 하나의 시간을 현재 실행에 기록합니다. with 문과 데코레이터 둘 다 가능합니다.
+    실행 밖(백그라운드 스레드 등)에서 호출되면 아무것도 기록하지 않습니다.
+    """
+
+    def __init__(self, phase):
+        self.phase = phase
+
+    def _recreate_cm(self):
+        # 데코레이터로 쓰면 세션 스레드들이 한 인스턴스를 공유하므로 호출마다 새 인스턴스로 시작 시각을 따로 보관
+        return type(self)(self.phase)
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        rerun = _current()
+        if rerun is not None:
+            rerun.phases[self.phase] = rerun.phases.get(self.phase, 0.0) + time.perf_counter() - self._start
+        return False
+
+
+def timed_rerun(func):
+    """
+    main()을 감싸 실행 한 번의 전체 시간과 구간별 시간을 집계합니다.
+    프로파일링이 켜져 있으면 그 실행을 cProfile로 감싸고 결과를 페이지별로 보관합니다.
+    st.rerun()/st.stop() 예외로 끝난 실행도 기록됩니다.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        rerun = _local.rerun = _Rerun()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if rerun.profiler:
+                rerun.profiler.disable()
+            _local.rerun = None
+            _finish(rerun, time.perf_counter() - rerun.start)
+
+    return wrapper
+
+
+def _finish(rerun, total):
+    page = rerun.page or "-"
+    line = " ".join([f"page={page}", f"total={total * 1000:.1f}ms"] + [
+        f"{phase}={seconds * 1000:.1f}ms" for phase, seconds in rerun.phases.items()
+    ])
+    with _lock:
+        _samples[(page, TOTAL)].append(total)
+        for phase, seconds in rerun.phases.items():
+            _samples[(page, phase)].append(seconds)
+        _recent.append(line)
+        if rerun.profiler:
+            out = io.StringIO()
+            pstats.Stats(rerun.profiler, stream=out).sort_stats("cumulative").print_stats(PROFILE_LINES)
+            _profiles[page] = out.getvalue()
+    logger.info(line)
+
+
+def summary():
+    """페이지·구간별 측정 수와 p50/p95/최대(ms) 표를 반환합니다."""
+    with _lock:
+        items = [(key, np.fromiter(values, dtype=float)) for key, values in _samples.items()]
+    rows = [
+        {'페이지': page, '구간': phase, '횟수': len(values),
+         'p50(ms)': np.percentile(values, 50) * 1000, 'p95(ms)': np.percentile(values, 95) * 1000,
+         '최대(ms)': values.max() * 1000}
+        for (page, phase), values in items if len(values)
+    ]
+    table = pd.DataFrame(rows, columns=['페이지', '구간', '횟수', 'p50(ms)', 'p95(ms)', '최대(ms)'])
+    return table.sort_values(['페이지', '구간'], ignore_index=True).round(1)
+
+
+def recent_lines():
+    with _lock:
+        return list(_recent)
+
+
+def profiles():
+    with _lock:
+        return dict(_profiles)
+
+
+def reset():
+    with _lock:
+        _samples.clear()
+        _recent.clear()
+        _profiles.clear()
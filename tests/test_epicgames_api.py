@@ -0,0 +1,70 @@
+"""
+Epic Games 검색 응답 파서 확인 (네트워크 없음)
+fixtures/epic_page_000000.json은 searchStore 응답 형식의 페이지 하나입니다.
+
+    python -m pytest tests
+"""
+import json
+import os
+
+import pytest
+
+from crawling.epicgames_api import _search_store, parse_element, parse_page, to_frame
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "epic_page_000000.json")
+
+
+def load_rows():
+    with open(FIXTURE, encoding="utf-8") as f:
+        rows, total = parse_page(json.load(f))
+    return {row["게임 이름"]: row for row in rows}, total
+
+
+def test_page_total_and_pageless_items():
+    rows, total = load_rows()
+    assert total == 4
+    assert "Delta Bundle Without Page" not in rows  # 상품 페이지가 없는 항목은 제외
+    assert len(rows) == 3
+
+
+def test_prices_scaled_by_decimals():
+    rows, _ = load_rows()
+    alpha, beta = rows["Alpha Quest"], rows["Beta Racer"]
+    assert (alpha["원가"], alpha["할인가"], alpha["할인율"]) == (32000, 16000, "50%")
+    assert (beta["원가"], beta["할인가"], beta["할인율"]) == (30000, 15000, "50%")  # decimals=2 → 29999.9 반올림
+    assert rows["Gamma Tactics"]["원가"] == "정보 없음"
+
+
+def test_sale_scaled_without_original_price():
+    element = {"title": "Solo", "productSlug": "solo", "price": {"totalPrice": {
+        "originalPrice": None, "discountPrice": 1500000, "currencyCode": "KRW", "currencyInfo": {"decimals": 2}}}}
+    row = parse_element(element)
+    assert (row["원가"], row["할인가"], row["할인율"]) == ("정보 없음", 15000, "0%")
+
+
+def test_non_krw_page_rejected():
+    with open(FIXTURE, encoding="utf-8") as f:
+        payload = json.load(f)
+    _search_store(payload)["elements"][0]["price"]["totalPrice"]["currencyCode"] = "USD"
+    with pytest.raises(ValueError):
+        parse_page(payload)
+
+
+def test_genres_translated():
+    rows, _ = load_rows()
+    assert rows["Alpha Quest"]["장르"] == "Action, Adventure"  # groupName이 genre인 태그만
+    assert rows["Beta Racer"]["장르"] == "Racing"
+    assert rows["Gamma Tactics"]["장르"] == "정보 없음"
+
+
+def test_slug_fallback_and_image():
+    rows, _ = load_rows()
+    assert rows["Alpha Quest"]["사이트 URL"] == "https://store.epicgames.com/ko/p/alpha-quest"
+    assert rows["Beta Racer"]["사이트 URL"] == "https://store.epicgames.com/ko/p/beta-racer"  # offerMappings
+    assert rows["Gamma Tactics"]["사이트 URL"] == "https://store.epicgames.com/ko/p/gamma-tactics"  # productSlug
+    assert rows["Alpha Quest"]["이미지 URL"] == "https://cdn/alpha-tall.jpg"  # IMAGE_TYPES 우선순위
+
+
+def test_empty_crawl_frame():
+    df = to_frame([])
+    assert df.empty and "사이트 URL" in df.columns
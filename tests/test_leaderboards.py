@@ -0,0 +1,53 @@
+"""
+순위표 증분 갱신 확인: 여러 번 실행해도 증분 결과가 전체 재계산과 같아야 합니다.
+
+    python -m pytest tests
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from filter import leaderboards
+
+
+def make_catalog(rng, urls):
+    n = len(urls)
+    return pd.DataFrame({
+        '사이트 URL': urls,
+        '게임 이름': [f"Game {u}" for u in urls],
+        '플랫폼 이름': 'Steam',
+        '원가': 10000,
+        '할인가': rng.integers(1000, 10000, n),
+        '할인율': [f"{d:.3f}%" for d in rng.uniform(0, 90, n)],
+        '유저리뷰수': rng.integers(0, 100000, n),
+    })
+
+
+def step(rng, catalog, next_id):
+    """몇 행의 가격/할인율/리뷰 수를 바꾸고, 몇 행을 지우고 새 행을 더합니다."""
+    catalog = catalog.copy()
+    picked = rng.choice(len(catalog), size=8, replace=False)
+    catalog.loc[picked, '할인율'] = [f"{d:.3f}%" for d in rng.uniform(0, 90, len(picked))]
+    catalog.loc[picked, '할인가'] = rng.integers(1000, 10000, len(picked))
+    catalog.loc[picked, '유저리뷰수'] = rng.integers(0, 100000, len(picked))
+    catalog = catalog.drop(index=rng.choice(len(catalog), size=2, replace=False)).reset_index(drop=True)
+    added = make_catalog(rng, [f"u{next_id + i}" for i in range(2)])
+    return pd.concat([catalog, added], ignore_index=True), next_id + 2
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_incremental_matches_full_recompute(monkeypatch, seed):
+    monkeypatch.setattr(leaderboards, 'TOP_K', 2)
+    monkeypatch.setattr(leaderboards, 'RESERVE', 5)
+    rng = np.random.default_rng(seed)
+    catalog = make_catalog(rng, [f"u{i}" for i in range(40)])
+    state, boards, _ = leaderboards.update(catalog, None, leaderboards.load_state(None), {})
+
+    next_id = 40
+    for _ in range(12):
+        catalog, next_id = step(rng, catalog, next_id)
+        state, boards, _ = leaderboards.update(catalog, None, state, boards)
+        for board, (_, carry) in leaderboards.BOARDS.items():
+            full = leaderboards._select(state, board) if carry else boards[board]
+            incremental = [e['url'] for e in boards[board]['entries'][:2]]
+            assert incremental == [e['url'] for e in full['entries'][:2]], board
@@ -0,0 +1,16 @@
+"""
+방문 계획에 따른 검색 결과 링크 선택 확인
+"""
+from crawling.scheduler import admit_links
+
+LINKS = [("A", "u1", "i1"), ("New", "n1", "i2"), ("B", "u2", "i3"), ("A", "u1", "i1"), ("C", "u3", "i4")]
+
+
+def test_new_links_come_first_within_budget():
+    picked = admit_links(LINKS, ["u3", "u2"], known={"u1", "u2", "u3"})
+    assert [link for _, link, _ in picked] == ["n1", "u3"]
+
+
+def test_planned_links_fill_remaining_budget_in_plan_order():
+    picked = admit_links(LINKS, ["u3", "u2", "u1", "u9"], known={"u1", "u2", "u3", "u9"})
+    assert [link for _, link, _ in picked] == ["n1", "u3", "u2", "u1"]